@@ -0,0 +1,9 @@
+"""
+Benchmarks Package
+==================
+Standalone performance benchmarks for the queue system
+
+Run from the project root, e.g.:
+    python -m benchmarks.bench_memory
+    python -m benchmarks.bench_hot_paths --quick
+"""
@@ -0,0 +1,76 @@
+"""
+Campus Scaling Benchmark
+========================
+Adds and serves the same campus-wide workload with 1 worker process and
+with N worker processes, and reports the speedup
+
+Speedup is bounded by the number of CPU cores on the machine.
+
+Run: python -m benchmarks.bench_campus [canteens] [orders_each] [processes]
+"""
+
+import json
+import multiprocessing
+import sys
+import time
+
+from campus import CampusCoordinator
+
+
+MENU_ORDERS = [["Burger"], ["Pizza Slice", "Soft Drink"], ["Combo Meal"],
+               ["Biryani", "Dessert"], ["Sandwich", "Beverage"]]
+
+
+def run_workload(canteens, orders_each, processes, batch=2000):
+    """
+    Time adding and serving orders_each orders in every canteen
+    Parameters: canteens (int), orders_each (int), processes (int),
+                batch (int) - orders per canteen per message
+    Returns: dictionary with timings and throughput
+    """
+    names = [f"Canteen {i}" for i in range(1, canteens + 1)]
+    with CampusCoordinator(names, processes) as campus:
+        campus.total_free_seats()  # Wait until every worker is up
+        start = time.perf_counter()
+        for first in range(0, orders_each, batch):
+            count = min(batch, orders_each - first)
+            campus.add_orders({
+                name: [(f"Student {first + i}", MENU_ORDERS[(first + i) % len(MENU_ORDERS)])
+                       for i in range(count)]
+                for name in names})
+        added = time.perf_counter() - start
+        finished = sum(campus.serve_until_empty().values())
+        seconds = time.perf_counter() - start
+    total = canteens * orders_each
+    assert finished == total
+    return {
+        'processes': processes,
+        'orders': total,
+        'add_seconds': round(added, 3),
+        'seconds': round(seconds, 3),
+        # Every order is added, started and finished
+        'ops_per_second': round(3 * total / seconds, 1),
+    }
+
+
+def compare(canteens=8, orders_each=20000, processes=None):
+    """
+    Run the workload with 1 and with N processes
+    Returns: dictionary with both runs and the speedup
+    """
+    if processes is None:
+        processes = min(canteens, multiprocessing.cpu_count())
+    single = run_workload(canteens, orders_each, 1)
+    multi = run_workload(canteens, orders_each, processes)
+    return {
+        'cpu_count': multiprocessing.cpu_count(),
+        'canteens': canteens,
+        'single': single,
+        'multi': multi,
+        'speedup': round(single['seconds'] / multi['seconds'], 2),
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    print(json.dumps(compare(*args), indent=2))
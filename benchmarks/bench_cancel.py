@@ -0,0 +1,79 @@
+"""
+Cancellation Benchmark
+======================
+Times cancelling random waiting customers, and looking up their place in
+line and personal wait, as the queues grow; with the id registry and the
+linked list queue the cost should stay flat. A deque searched by id is
+timed alongside for comparison.
+
+Run: python -m benchmarks.bench_cancel [operations]
+"""
+
+import json
+import random
+import sys
+import time
+from collections import deque
+
+from benchmarks.bench_hot_paths import make_orders
+from queue_system import QueueSystem
+
+
+def build_system(customers):
+    """
+    Build a system with customers waiting across its counters
+    Returns: tuple (QueueSystem, list of customer ids)
+    """
+    system = QueueSystem()
+    system.auto_rebalance = False
+    ids = [system.add_order("Student", items)[0].customer_id
+           for items in make_orders(customers)]
+    return system, ids
+
+
+def time_deque(customers, picks):
+    """Time removing customers from a deque by id (the old approach), ops/sec"""
+    queue = deque(range(customers))
+    start = time.perf_counter()
+    for customer_id in picks:
+        for customer in queue:
+            if customer == customer_id:
+                queue.remove(customer)
+                break
+    return len(picks) / (time.perf_counter() - start)
+
+
+def run(operations=1000, seed=1):
+    """
+    Parameters: operations (int), seed (int)
+    Returns: dictionary of results
+    """
+    rng = random.Random(seed)
+    results = []
+    for customers in (1000, 10000, 100000):
+        system, ids = build_system(customers)
+        picks = rng.sample(ids, min(operations, customers))
+        
+        start = time.perf_counter()
+        for customer_id in picks:
+            system.lane_position_of(customer_id)
+            system.personal_wait(customer_id)
+        lookups = 2 * len(picks) / (time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        for customer_id in picks:
+            system.cancel(customer_id)
+        cancels = len(picks) / (time.perf_counter() - start)
+        
+        results.append({
+            'customers': customers,
+            'lookups_per_second': round(lookups, 1),
+            'cancels_per_second': round(cancels, 1),
+            'deque_cancels_per_second': round(time_deque(customers, picks[:100]), 1),
+        })
+    return {'operations': operations, 'results': results}
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    print(json.dumps(run(*args), indent=2))
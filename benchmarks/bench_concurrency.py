@@ -0,0 +1,89 @@
+"""
+Concurrency Stress Benchmark
+============================
+Several kiosk threads add orders while several serving-station threads
+serve them, all against one QueueSystem. Checks that no customer is lost
+or served twice and reports throughput.
+
+Run: python -m benchmarks.bench_concurrency [producers] [consumers] [orders_each]
+"""
+
+import json
+import sys
+import threading
+import time
+
+from queue_system import Counter, QueueSystem
+
+
+def run_stress(producers=4, consumers=4, orders_each=5000, counter_count=20):
+    """
+    Run the multi-threaded stress test
+    Parameters: producers (int) - kiosk threads,
+                consumers (int) - serving station threads,
+                orders_each (int) - orders added by each kiosk,
+                counter_count (int)
+    Returns: dictionary with counts, integrity results and throughput
+    """
+    counters = [Counter(i, f"Counter {i}") for i in range(1, counter_count + 1)]
+    system = QueueSystem(counters)
+    total = producers * orders_each
+    added = [[] for _ in range(producers)]
+    served = [[] for _ in range(consumers)]
+    served_count = [0]
+    served_lock = threading.Lock()
+    producers_done = threading.Event()
+    
+    def kiosk(index):
+        ids = added[index]
+        for i in range(orders_each):
+            customer, _ = system.add_order(f"Kiosk {index}-{i}", ["Burger"])
+            ids.append(customer.customer_id)
+    
+    def station(index):
+        ids = served[index]
+        position = index
+        while True:
+            counter = counters[position % counter_count]
+            position += 1
+            result = system.serve_at_counter(counter)
+            if result['action'] == 'finished':
+                ids.append(result['customer'].customer_id)
+                with served_lock:
+                    served_count[0] += 1
+            with served_lock:
+                if served_count[0] >= total and producers_done.is_set():
+                    return
+    
+    kiosks = [threading.Thread(target=kiosk, args=(i,)) for i in range(producers)]
+    stations = [threading.Thread(target=station, args=(i,)) for i in range(consumers)]
+    start = time.perf_counter()
+    for thread in kiosks + stations:
+        thread.start()
+    for thread in kiosks:
+        thread.join()
+    producers_done.set()
+    for thread in stations:
+        thread.join()
+    seconds = time.perf_counter() - start
+    
+    added_ids = [cid for ids in added for cid in ids]
+    served_ids = [cid for ids in served for cid in ids]
+    return {
+        'producers': producers,
+        'consumers': consumers,
+        'counters': counter_count,
+        'added': len(added_ids),
+        'served': len(served_ids),
+        'unique_ids': len(set(added_ids)) == len(added_ids),
+        'duplicates': len(served_ids) - len(set(served_ids)),
+        'lost': len(set(added_ids) - set(served_ids)),
+        'seconds': round(seconds, 4),
+        # Every order is added once, started once and finished once
+        'ops_per_second': round(3 * total / seconds, 1),
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    print(json.dumps(run_stress(*args), indent=2))
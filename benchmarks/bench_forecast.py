@@ -0,0 +1,59 @@
+"""
+Queue Forecast Benchmark
+========================
+Times a 30-minute forecast (120 steps of 15 s) for many counters, with
+NumPy (when installed) and with the pure-Python fallback
+
+Run: python -m benchmarks.bench_forecast [counters] [steps] [repeats]
+"""
+
+import json
+import math
+import random
+import sys
+import time
+
+from forecast import forecast_queues, np
+
+
+def make_case(counters, steps, seed=1):
+    """
+    Random backlogs and service times, and a lunch-rush arrival curve
+    Returns: tuple (backlog, service_times, arrival_rates)
+    """
+    rng = random.Random(seed)
+    backlog = [rng.uniform(0, 600) for _ in range(counters)]
+    service_times = [rng.uniform(40, 90) for _ in range(counters)]
+    capacity = sum(60.0 / time for time in service_times)  # Orders per minute
+    arrival_rates = [capacity * (0.7 + 0.5 * math.sin(math.pi * t / steps))
+                     for t in range(steps)]
+    return backlog, service_times, arrival_rates
+
+
+def time_forecast(case, use_numpy, repeats):
+    """Best time (ms) of several forecasts"""
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        forecast_queues(*case, use_numpy=use_numpy)
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 3)
+
+
+def run(counters=500, steps=120, repeats=5):
+    """
+    Parameters: counters (int), steps (int), repeats (int)
+    Returns: dictionary of results
+    """
+    case = make_case(counters, steps)
+    return {
+        'counters': counters,
+        'steps': steps,
+        'python_ms': time_forecast(case, False, repeats),
+        'numpy_ms': time_forecast(case, True, repeats) if np is not None else None,
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    print(json.dumps(run(*args), indent=2))
@@ -0,0 +1,64 @@
+"""
+Group Assignment Benchmark
+==========================
+Compares the predicted makespan of a class arriving together when its
+orders are placed one by one (greedy, like add_order), with LPT, and
+with the exact solver on groups small enough for it
+
+Run: python -m benchmarks.bench_group_assign [trials] [group_size]
+"""
+
+import json
+import random
+import sys
+import time
+
+from group_assign import EXACT_MAX_ORDERS, plan_group
+from menu import DEFAULT_MENU_ITEMS
+from queue_system import Customer
+
+
+def random_case(rng, group_size, counter_count=5):
+    """
+    One scenario: counters with some queue already, and a group of orders
+    Returns: tuple (loads, speeds, times)
+    """
+    loads = [rng.choice([0, 0, 40, 80, 150]) for _ in range(counter_count)]
+    speeds = [1.0] * counter_count
+    times = [Customer(0, "Student", rng.sample(DEFAULT_MENU_ITEMS, rng.randint(1, 4)))
+             .get_estimated_serving_time() for _ in range(group_size)]
+    return loads, speeds, times
+
+
+def run(trials=200, group_size=30, seed=1):
+    """
+    Average makespan and planning time per strategy
+    Parameters: trials (int), group_size (int), seed (int)
+    Returns: dictionary of results
+    """
+    rng = random.Random(seed)
+    cases = [random_case(rng, group_size) for _ in range(trials)]
+    small = [random_case(rng, min(group_size, EXACT_MAX_ORDERS - 2))
+             for _ in range(trials)]
+    results = {'trials': trials, 'group_size': group_size}
+    for label, scenario, strategies in (('group', cases, ('greedy', 'lpt')),
+                                        ('small_group', small, ('greedy', 'lpt', 'exact'))):
+        summary = {}
+        for strategy in strategies:
+            start = time.perf_counter()
+            spans = [plan_group(*case, strategy=strategy)[1] for case in scenario]
+            seconds = time.perf_counter() - start
+            summary[strategy] = {
+                'mean_makespan': round(sum(spans) / len(spans), 1),
+                'worst_makespan': round(max(spans), 1),
+                'plan_ms': round(seconds / len(scenario) * 1000, 3),
+            }
+        summary['lpt_vs_greedy'] = round(summary['lpt']['mean_makespan']
+                                         / summary['greedy']['mean_makespan'], 3)
+        results[label] = summary
+    return results
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    print(json.dumps(run(*args), indent=2))
@@ -0,0 +1,221 @@
+"""
+Hot Path Benchmark Suite
+========================
+Times the queue system's hot paths at several scales and prints the
+results as JSON, so runs from different releases can be compared
+
+Operations timed:
+- Customer construction
+- Counter.add_customer
+- Counter.serve_next + Counter.finish_serving
+- Counter.get_estimated_wait_time
+- QueueSystem._find_best_counter
+- QueueSystem.get_all_queue_status
+
+Each operation is run twice: once untraced for ops/sec, and once under
+tracemalloc for the peak memory allocated by the operation itself.
+
+Run: python -m benchmarks.bench_hot_paths [--quick] [--output FILE]
+(the full run builds a 1M-customer system several times and takes minutes)
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from queue_system import Counter, Customer, QueueSystem
+from menu import DEFAULT_MENU_ITEMS
+
+
+# (number of counters, customers queued before timing)
+FULL_SCALES = [(3, 1000), (3, 100000), (100, 100000), (1000, 1000000)]
+QUICK_SCALES = [(3, 1000), (100, 10000), (1000, 10000)]
+
+# Upper bound on timed operations per benchmark
+MAX_OPS = 100000
+
+
+def make_orders(count, seed=1):
+    """
+    Generate random item lists
+    Parameters: count (int), seed (int)
+    Returns: list of item lists
+    """
+    rng = random.Random(seed)
+    return [rng.sample(DEFAULT_MENU_ITEMS, rng.randint(1, 3)) for _ in range(count)]
+
+
+def build_system(counter_count, queued):
+    """
+    Build a QueueSystem with customers already queued round-robin
+    Parameters: counter_count (int), queued (int)
+    Returns: QueueSystem
+    """
+    counters = [Counter(i, f"Counter {i}") for i in range(1, counter_count + 1)]
+    system = QueueSystem(counters)
+    for i, items in enumerate(make_orders(queued)):
+        counter = counters[i % counter_count]
+        counter.add_customer(Customer(i, f"Student {i}", items), verbose=False)
+    system.next_customer_id = queued + 1
+    return system
+
+
+def bench_customer_construction(system, ops):
+    """Prepare Customer construction; returns the timed function"""
+    orders = make_orders(ops, seed=2)
+    
+    def run():
+        for i, items in enumerate(orders):
+            Customer(i, "Student", items)
+    return run
+
+
+def bench_add_customer(system, ops):
+    """Prepare Counter.add_customer; returns the timed function"""
+    customers = [Customer(i, "Student", items)
+                 for i, items in enumerate(make_orders(ops, seed=3))]
+    counters = system.counters
+    
+    def run():
+        count = len(counters)
+        for i, customer in enumerate(customers):
+            counters[i % count].add_customer(customer, verbose=False)
+    return run
+
+
+def bench_serve_finish(system, ops):
+    """Prepare Counter.serve_next + finish_serving; returns the timed function"""
+    counters = system.counters
+    
+    def run():
+        count = len(counters)
+        for i in range(ops):
+            counter = counters[i % count]
+            counter.serve_next()
+            counter.finish_serving()
+    return run
+
+
+def bench_wait_time(system, ops):
+    """Prepare Counter.get_estimated_wait_time; returns the timed function"""
+    counters = system.counters
+    for counter in counters:
+        counter.serve_next()  # Include the in-service remainder
+    
+    def run():
+        count = len(counters)
+        for i in range(ops):
+            counters[i % count].get_estimated_wait_time()
+    return run
+
+
+def bench_find_best_counter(system, ops):
+    """Prepare QueueSystem._find_best_counter; returns the timed function"""
+    def run():
+        for _ in range(ops):
+            system._find_best_counter()
+    return run
+
+
+def bench_queue_status(system, ops):
+    """Prepare QueueSystem.get_all_queue_status; returns the timed function"""
+    def run():
+        for _ in range(ops):
+            system.get_all_queue_status()
+    return run
+
+
+# name -> (prepare function, whether ops scale down with counter count)
+BENCHMARKS = [
+    ('customer_construction', bench_customer_construction, False),
+    ('counter_add_customer', bench_add_customer, False),
+    ('counter_serve_finish', bench_serve_finish, False),
+    ('counter_wait_time', bench_wait_time, False),
+    ('find_best_counter', bench_find_best_counter, False),
+    ('get_all_queue_status', bench_queue_status, True),
+]
+
+
+def measure(prepare, counter_count, queued, ops):
+    """
+    Time one benchmark and measure its peak memory
+    Parameters: prepare (callable), counter_count (int), queued (int),
+                ops (int)
+    Returns: tuple (seconds, peak_bytes)
+    """
+    # Timing run (untraced)
+    system = build_system(counter_count, queued)
+    run = prepare(system, ops)
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    
+    # Memory run (traced), counting only what the operation allocates
+    system = build_system(counter_count, queued)
+    run = prepare(system, ops)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    run()
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def run_suite(scales):
+    """
+    Run every benchmark at every scale
+    Parameter: scales (list of (counters, queued) tuples)
+    Returns: dictionary ready to be written as JSON
+    """
+    results = []
+    for counter_count, queued in scales:
+        for name, prepare, per_counter in BENCHMARKS:
+            ops = min(MAX_OPS, max(queued, 1000))
+            if per_counter:
+                ops = max(10, ops // counter_count)
+            if name == 'counter_serve_finish':
+                ops = min(ops, queued)  # Never serve more than are queued
+            seconds, peak = measure(prepare, counter_count, queued, ops)
+            results.append({
+                'operation': name,
+                'counters': counter_count,
+                'queued': queued,
+                'ops': ops,
+                'seconds': round(seconds, 6),
+                'ops_per_sec': round(ops / seconds, 1) if seconds > 0 else None,
+                'peak_memory_bytes': peak,
+            })
+            print(f"{name:24} counters={counter_count:<5} queued={queued:<8} "
+                  f"{results[-1]['ops_per_sec']} ops/s", file=sys.stderr)
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def main():
+    """Parse arguments, run the suite and write JSON"""
+    parser = argparse.ArgumentParser(description="Queue system hot path benchmarks")
+    parser.add_argument('--quick', action='store_true',
+                        help="use small scales for a fast smoke run")
+    parser.add_argument('--output', help="write JSON here instead of stdout")
+    args = parser.parse_args()
+    
+    report = run_suite(QUICK_SCALES if args.quick else FULL_SCALES)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Memory Benchmark
+================
+Compares the memory cost per queued customer of plain Customer objects
+in a Counter against rows in a CustomerStore queued on a StoreCounter
+
+Run: python -m benchmarks.bench_memory [number_of_customers]
+"""
+
+import contextlib
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+from queue_system import Counter, Customer
+from customer_store import CustomerStore, StoreCounter
+from menu import DEFAULT_MENU_ITEMS
+
+
+def make_orders(count, seed=1):
+    """
+    Generate random (name, items) orders
+    Parameters: count (int), seed (int)
+    Returns: list of (str, list) tuples
+    """
+    rng = random.Random(seed)
+    return [(f"Student {i}", rng.sample(DEFAULT_MENU_ITEMS, rng.randint(1, 3)))
+            for i in range(count)]
+
+
+def measure(build):
+    """
+    Measure the memory allocated by a build function
+    Parameter: build (callable) - returns the object(s) to keep alive
+    Returns: int - bytes still allocated after build
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def run(count=100000):
+    """
+    Run the memory comparison
+    Parameter: count (int) - number of queued customers
+    Returns: dict with bytes per customer for both layouts
+    """
+    orders = make_orders(count)
+    
+    def build_objects():
+        counter = Counter(1, "Objects")
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for i, (name, items) in enumerate(orders):
+                # Copy strings so names are not shared with the order list
+                counter.add_customer(Customer(i, "".join(name), list(items)))
+        return counter
+    
+    def build_store():
+        store = CustomerStore()
+        counter = StoreCounter(1, "Store", store)
+        for i, (name, items) in enumerate(orders):
+            counter.add_customer(store.append(i, name, items))
+        return store, counter
+    
+    object_bytes = measure(build_objects) / count
+    store_bytes = measure(build_store) / count
+    return {
+        'customers': count,
+        'object_bytes_per_customer': round(object_bytes, 1),
+        'store_bytes_per_customer': round(store_bytes, 1),
+        'reduction_factor': round(object_bytes / store_bytes, 2),
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(json.dumps(run(n), indent=2))
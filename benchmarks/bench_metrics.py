@@ -0,0 +1,76 @@
+"""
+Metrics Overhead Benchmark
+==========================
+Times add_order, serve_at_counter and get_best_line_recommendation with
+metrics enabled and disabled, and the cost of one Histogram.observe
+
+Run: python -m benchmarks.bench_metrics [operations]
+"""
+
+import json
+import sys
+import time
+
+from benchmarks.bench_hot_paths import make_orders
+from metrics import Histogram, LATENCY_HIGHEST, LATENCY_LOWEST
+from queue_system import QueueSystem
+
+
+def time_system(ops, enabled):
+    """
+    Run a add / serve / recommend cycle ops times
+    Parameters: ops (int), enabled (bool) - metrics on or off
+    Returns: dictionary of ops/sec per operation
+    """
+    system = QueueSystem()
+    system.auto_rebalance = False
+    if enabled:
+        system.enable_metrics()
+    orders = make_orders(ops)
+    results = {}
+    
+    start = time.perf_counter()
+    for items in orders:
+        system.add_order("Student", items)
+    results['add_order'] = ops / (time.perf_counter() - start)
+    
+    counters = system.counters
+    start = time.perf_counter()
+    for i in range(2 * ops):
+        system.serve_at_counter(counters[i % len(counters)])
+    results['serve_at_counter'] = 2 * ops / (time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    for _ in range(ops):
+        system.get_best_line_recommendation()
+    results['recommendation'] = ops / (time.perf_counter() - start)
+    return {name: round(rate, 1) for name, rate in results.items()}
+
+
+def run(ops=50000):
+    """
+    Parameter: ops (int)
+    Returns: dictionary of results
+    """
+    histogram = Histogram(LATENCY_LOWEST, LATENCY_HIGHEST)
+    values = [(i % 1000 + 1) * 1e-6 for i in range(ops)]
+    start = time.perf_counter()
+    for value in values:
+        histogram.observe(value)
+    observe_ns = (time.perf_counter() - start) / ops * 1e9
+    
+    disabled = time_system(ops, enabled=False)
+    enabled = time_system(ops, enabled=True)
+    return {
+        'operations': ops,
+        'histogram_observe_ns': round(observe_ns, 1),
+        'metrics_disabled': disabled,
+        'metrics_enabled': enabled,
+        'enabled_vs_disabled': {name: round(enabled[name] / disabled[name], 3)
+                                for name in disabled},
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    print(json.dumps(run(*args), indent=2))
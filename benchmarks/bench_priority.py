@@ -0,0 +1,64 @@
+"""
+Priority Lanes Benchmark
+========================
+Times serve_next + finish_serving and class-aware wait estimates on a
+counter with only walk-ins and with all three priority classes mixed;
+choosing the next customer looks at one head per lane, so the cost
+should not grow with the queue
+
+Run: python -m benchmarks.bench_priority [customers]
+"""
+
+import json
+import random
+import sys
+import time
+
+from benchmarks.bench_hot_paths import make_orders
+from priority_lanes import PRIORITY_CLASSES, WALK_IN
+from queue_system import Counter, Customer
+
+
+def fill_counter(customers, mixed, seed=1):
+    """
+    Build a counter with customers waiting
+    Parameters: customers (int), mixed (bool) - random classes, or walk-ins only
+    Returns: Counter
+    """
+    rng = random.Random(seed)
+    counter = Counter(1, "Bench Counter")
+    for i, items in enumerate(make_orders(customers, seed=seed)):
+        priority = rng.choice(PRIORITY_CLASSES) if mixed else WALK_IN
+        counter.add_customer(Customer(i, "Student", items, priority=priority), verbose=False)
+    return counter
+
+
+def run(customers=100000):
+    """
+    Parameter: customers (int)
+    Returns: dictionary of results
+    """
+    results = []
+    for mixed in (False, True):
+        counter = fill_counter(customers, mixed)
+        start = time.perf_counter()
+        for priority in PRIORITY_CLASSES * (customers // 3):
+            counter.get_estimated_wait_time(priority=priority)
+        estimates = 3 * (customers // 3) / (time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        for _ in range(customers):
+            counter.serve_next()
+            counter.finish_serving()
+        serves = customers / (time.perf_counter() - start)
+        results.append({
+            'classes': 'mixed' if mixed else 'walk-ins only',
+            'serve_finish_per_second': round(serves, 1),
+            'class_wait_estimates_per_second': round(estimates, 1),
+        })
+    return {'customers': customers, 'results': results}
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    print(json.dumps(run(*args), indent=2))
@@ -0,0 +1,67 @@
+"""
+Rebalancing Benchmark
+=====================
+Simulates a busy lunch hour where actual serving times vary around the
+estimate, and compares customer waits with and without rebalancing
+(work stealing by idle counters plus periodic skew checks)
+
+Run: python -m benchmarks.bench_rebalance [customers] [counters]
+"""
+
+import json
+import random
+import sys
+
+from clock import VirtualClock
+from queue_system import BASE_SERVING_TIME, TIME_PER_COMPLEXITY, Counter, QueueSystem
+from simulation import Simulator, poisson_arrivals
+
+
+def noisy_service_time(customer, counter):
+    """
+    Actual serving time: exponentially distributed around the complexity
+    formula, repeatable per customer so both runs see the same service
+    times (not the learned estimate, which would feed back into itself)
+    """
+    rng = random.Random(customer.customer_id)
+    mean = BASE_SERVING_TIME + TIME_PER_COMPLEXITY * customer.complexity_score
+    return rng.expovariate(1.0) * mean
+
+
+def simulate(customers, counter_count, rebalance, load=0.9, seed=1):
+    """
+    One simulated run
+    Returns: dictionary with the overall wait summary and moves made
+    """
+    counters = [Counter(i, f"Counter {i}") for i in range(1, counter_count + 1)]
+    system = QueueSystem(counters, clock=VirtualClock())
+    simulator = Simulator(system, service_time=noisy_service_time,
+                          rebalance=rebalance)
+    # Mean estimate is about a minute, so this keeps counters ~load busy
+    rate = load * counter_count
+    report = simulator.run(poisson_arrivals(rate, customers, seed=seed))
+    overall = {key: round(value, 1) for key, value in report['overall'].items()}
+    return {'waits': overall, 'moves': system.rebalancer.moves,
+            'wall_seconds': round(report['wall_seconds'], 3)}
+
+
+def run(customers=20000, counter_count=10):
+    """
+    Parameters: customers (int), counter_count (int)
+    Returns: dictionary of results
+    """
+    without = simulate(customers, counter_count, rebalance=False)
+    with_rebalance = simulate(customers, counter_count, rebalance=True)
+    return {
+        'customers': customers,
+        'counters': counter_count,
+        'without_rebalance': without,
+        'with_rebalance': with_rebalance,
+        'p95_ratio': round(with_rebalance['waits']['p95']
+                           / max(without['waits']['p95'], 1e-9), 3),
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    print(json.dumps(run(*args), indent=2))
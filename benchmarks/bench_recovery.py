@@ -0,0 +1,66 @@
+"""
+Recovery Benchmark
+==================
+Journals a long day of events with periodic checkpoints, then measures
+how long a restart takes (load snapshot + replay the journal tail)
+
+Run: python -m benchmarks.bench_recovery [events] [checkpoint_every]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from persistence import Persistence, recover
+from queue_system import Counter, QueueSystem
+
+
+def run(events=200000, checkpoint_every=2000, counter_count=20):
+    """
+    Generate events, checkpoint every checkpoint_every of them, and time
+    recovery without a clean shutdown
+    Parameters: events (int), checkpoint_every (int), counter_count (int)
+    Returns: dictionary with timings
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        counters = [Counter(i, f"Counter {i}") for i in range(1, counter_count + 1)]
+        system, persistence = Persistence.open(directory,
+                                               default_system=QueueSystem(counters),
+                                               checkpoint_interval=None)
+        start = time.perf_counter()
+        recorded = 0
+        while recorded < events:
+            for i in range(10):
+                system.add_order(f"Student {i}", ["Burger", "Soft Drink"])
+            # Serve about as fast as orders arrive, like a steady lunch rush
+            for counter in system.counters:
+                if counter.queue:
+                    system.serve_at_counter(counter)
+                    system.serve_at_counter(counter)
+            recorded = persistence.journal.last_seq
+            if recorded - persistence._checkpoint_seq >= checkpoint_every:
+                persistence.checkpoint()
+        journal_seconds = time.perf_counter() - start
+        persistence.journal.sync()  # Simulated crash: no close/checkpoint
+        
+        start = time.perf_counter()
+        recovered, last_seq = recover(directory)
+        recovery_seconds = time.perf_counter() - start
+        persistence.journal.close()
+        
+        queued = sum(c.get_queue_length() for c in recovered.counters)
+        return {
+            'events': last_seq,
+            'events_per_second': round(last_seq / journal_seconds, 1),
+            'recovery_ms': round(recovery_seconds * 1000, 2),
+            'recovered_queued_customers': queued,
+            'journal_files': len([n for n in os.listdir(directory)
+                                  if n.startswith('journal-')]),
+        }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    print(json.dumps(run(*args), indent=2))
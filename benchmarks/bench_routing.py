@@ -0,0 +1,58 @@
+"""
+Capability Routing Benchmark
+============================
+Times routing pizza orders while the number of pizza stations stays
+fixed and the number of other stations grows; with the capability index
+the cost should stay flat instead of growing with the total count
+
+Run: python -m benchmarks.bench_routing [orders]
+"""
+
+import json
+import sys
+import time
+
+from menu import MENU_CATEGORIES
+from queue_system import Counter, QueueSystem
+
+
+def build_system(pizza_stations, other_stations):
+    """
+    Build a system of pizza stations plus stations for the other categories
+    Returns: QueueSystem
+    """
+    others = [name for name in MENU_CATEGORIES if name != "Pizza & Pasta"]
+    counters = [Counter(i, f"Pizza {i}", serves=["Pizza & Pasta"])
+                for i in range(1, pizza_stations + 1)]
+    for i in range(other_stations):
+        category = others[i % len(others)]
+        counter_id = pizza_stations + i + 1
+        counters.append(Counter(counter_id, f"{category} {counter_id}", serves=[category]))
+    system = QueueSystem(counters)
+    system.auto_rebalance = False
+    return system
+
+
+def run(orders=20000, pizza_stations=5):
+    """
+    Parameters: orders (int), pizza_stations (int)
+    Returns: dictionary of results
+    """
+    results = []
+    for other_stations in (5, 50, 500, 5000):
+        system = build_system(pizza_stations, other_stations)
+        start = time.perf_counter()
+        for _ in range(orders):
+            system._find_best_counter(items=["Pizza Slice"])
+        seconds = time.perf_counter() - start
+        results.append({
+            'pizza_stations': pizza_stations,
+            'other_stations': other_stations,
+            'routes_per_second': round(orders / seconds, 1),
+        })
+    return {'orders': orders, 'results': results}
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    print(json.dumps(run(*args), indent=2))
@@ -0,0 +1,56 @@
+"""
+Seat Release Benchmark
+======================
+Schedules 100k automatic seat releases on the timing wheel, cancels half
+of them, then ticks through a simulated afternoon
+
+Run: python -m benchmarks.bench_seat_release [releases]
+"""
+
+import json
+import random
+import sys
+import time
+
+from timing_wheel import TimingWheel
+
+
+def run(releases=100000, seed=1):
+    """
+    Time schedule, cancel and tick on a wheel with many pending timers
+    Parameters: releases (int), seed (int)
+    Returns: dictionary with per-operation timings in microseconds
+    """
+    rng = random.Random(seed)
+    delays = [rng.uniform(15 * 60, 90 * 60) for _ in range(releases)]
+    wheel = TimingWheel(tick=1.0)
+    
+    start = time.perf_counter()
+    timers = [wheel.schedule(delay, index) for index, delay in enumerate(delays)]
+    schedule_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for timer in timers[::2]:
+        wheel.cancel(timer)
+    cancel_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    expired = 0
+    ticks = 0
+    for now in range(0, 90 * 60 + 1):
+        expired += len(wheel.advance(now))
+        ticks += 1
+    tick_seconds = time.perf_counter() - start
+    assert expired == releases - len(timers[::2])
+    return {
+        'releases': releases,
+        'schedule_us': round(schedule_seconds / releases * 1e6, 3),
+        'cancel_us': round(cancel_seconds / len(timers[::2]) * 1e6, 3),
+        'tick_us': round(tick_seconds / ticks * 1e6, 3),
+        'expired': expired,
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    print(json.dumps(run(*args), indent=2))
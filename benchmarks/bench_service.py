@@ -0,0 +1,135 @@
+"""
+Service Load Test
+=================
+Opens many concurrent keep-alive connections to the asyncio queue service
+on localhost and measures request throughput. A few connections subscribe
+to the event stream to check that pushes keep flowing under load.
+
+The service and the clients share one event loop (one core), so the
+numbers are a lower bound for the service alone.
+
+Run: python -m benchmarks.bench_service [connections] [requests_each]
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+from service import QueueService
+
+
+REQUESTS = [
+    b"GET /recommendation HTTP/1.1\r\nHost: localhost\r\n\r\n",
+    b"GET /status HTTP/1.1\r\nHost: localhost\r\n\r\n",
+    b"GET /seats HTTP/1.1\r\nHost: localhost\r\n\r\n",
+]
+
+
+def order_request(index):
+    """Build a POST /orders request"""
+    body = json.dumps({'name': f"App {index}", 'items': ["Burger"]}).encode()
+    return (b"POST /orders HTTP/1.1\r\nHost: localhost\r\n"
+            b"Content-Type: application/json\r\n"
+            b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+
+
+async def read_response(reader):
+    """
+    Read one HTTP response
+    Returns: tuple (status code, body bytes)
+    """
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        if line.lower().startswith(b'content-length:'):
+            length = int(line.split(b':')[1])
+    body = await reader.readexactly(length)
+    return int(status_line.split()[1]), body
+
+
+async def client(port, index, requests_each, ready, go):
+    """
+    One keep-alive client connection
+    Returns: int - number of successful responses
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    ready.append(index)
+    await go.wait()
+    ok = 0
+    for i in range(requests_each):
+        if i % 4 == 3:
+            writer.write(order_request(index))
+        else:
+            writer.write(REQUESTS[(index + i) % len(REQUESTS)])
+        code, _ = await read_response(reader)
+        ok += code < 400
+    writer.close()
+    return ok
+
+
+async def subscriber(port, stop):
+    """
+    Count pushed status messages until told to stop
+    Returns: int - number of messages received
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b"GET /subscribe HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    messages = 0
+    while not stop.is_set():
+        try:
+            line = await asyncio.wait_for(reader.readline(), 0.2)
+        except asyncio.TimeoutError:
+            continue
+        if not line:
+            break
+        messages += line.startswith(b'data:')
+    writer.close()
+    return messages
+
+
+async def run_load(connections=2000, requests_each=20, subscribers=10):
+    """
+    Run the load test against a fresh service
+    Parameters: connections (int), requests_each (int), subscribers (int)
+    Returns: dictionary with throughput and push counts
+    """
+    service = QueueService()
+    port = await service.start('127.0.0.1', 0)
+    stop = asyncio.Event()
+    subscriber_tasks = [asyncio.ensure_future(subscriber(port, stop))
+                        for _ in range(subscribers)]
+    
+    ready, go = [], asyncio.Event()
+    tasks = [asyncio.ensure_future(client(port, i, requests_each, ready, go))
+             for i in range(connections)]
+    while len(ready) < connections:
+        await asyncio.sleep(0.01)
+    
+    start = time.perf_counter()
+    go.set()
+    ok = sum(await asyncio.gather(*tasks))
+    seconds = time.perf_counter() - start
+    
+    await asyncio.sleep(0.3)  # Let the last push go out
+    stop.set()
+    pushed = await asyncio.gather(*subscriber_tasks)
+    await service.stop()
+    total = connections * requests_each
+    return {
+        'connections': connections,
+        'requests': total,
+        'successful': ok,
+        'seconds': round(seconds, 3),
+        'requests_per_second': round(total / seconds, 1),
+        'subscribers': subscribers,
+        'min_messages_per_subscriber': min(pushed) if pushed else 0,
+    }
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    print(json.dumps(asyncio.run(run_load(*args)), indent=2))
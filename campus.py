@@ -0,0 +1,338 @@
+"""
+Campus Module
+=============
+Several canteens, each a QueueSystem shard in its own worker process
+
+One Python process can only run one thread of Python code at a time
+(the GIL), so a campus with many canteens is split across a pool of
+worker processes. Every canteen lives in exactly one worker; the
+coordinator routes each call to the worker owning the canteen and answers
+campus-wide questions by scatter-gather: the request goes to every worker
+first, then the answers are collected, so the workers compute in parallel.
+
+Calls that carry many orders are batched into one message per worker,
+which keeps the pipe overhead small next to the queue work itself.
+
+Concepts Applied:
+- Multiprocessing (processes, pipes)
+- Sharding and scatter-gather
+- Message passing
+"""
+
+import builtins
+import multiprocessing
+import threading
+
+from queue_system import Counter, QueueSystem
+
+
+def _customer_summary(result):
+    """JSON-friendly form of a serve_at_counter result"""
+    customer = result['customer']
+    return {
+        'action': result['action'],
+        'customer_id': customer.customer_id if customer else None,
+        'seated': result['seated'],
+        'seat': result['seat'],
+    }
+
+
+def _serve_until_empty(system):
+    """
+    Serve every counter of a canteen until all queues are empty
+    Returns: int - number of customers finished
+    """
+    finished = 0
+    for counter in system.counters:
+        while counter.queue or counter.serving_customer:
+            finished += system.serve_at_counter(counter)['action'] == 'finished'
+    return finished
+
+
+def _best_counter(system):
+    """Shortest wait in one canteen as (wait, counter_id, counter name)"""
+    best = system.get_status_snapshot().best
+    counter = best['counter']
+    return best['wait_time'], counter.counter_id, counter.name
+
+
+def _handle(systems, op, canteen, args):
+    """
+    Run one request inside a worker
+    Parameters: systems (dict name -> QueueSystem), op (str),
+                canteen (str, or None for every canteen of the worker),
+                args (tuple)
+    Returns: the result of the operation
+    """
+    if op == 'add':
+        customer, counter = systems[canteen].add_order(*args)
+        return customer.customer_id, counter.counter_id
+    if op == 'add_batch':
+        # args[0]: dict canteen -> list of (name, items)
+        return {name: list(systems[name].iter_ingest(orders))
+                for name, orders in args[0].items()}
+    if op == 'serve':
+        system = systems[canteen]
+        for counter in system.counters:
+            if counter.counter_id == args[0]:
+                return _customer_summary(system.serve_at_counter(counter))
+        raise ValueError(f"no counter {args[0]} in {canteen}")
+    if op == 'drain':
+        return {name: _serve_until_empty(system) for name, system in systems.items()}
+    if op == 'best':
+        return {name: _best_counter(system) for name, system in systems.items()}
+    if op == 'seats':
+        return {name: system.seat_manager.get_vacant_seats()
+                for name, system in systems.items()}
+    if op == 'status':
+        return {name: [{'counter_id': s['counter'].counter_id,
+                        'queue_length': s['queue_length'],
+                        'wait_time': s['wait_time'],
+                        'serving': s['serving']}
+                       for s in system.get_all_queue_status()]
+                for name, system in systems.items()}
+    raise ValueError(f"unknown operation {op}")
+
+
+def _worker_main(connection, canteens, counters_per_canteen):
+    """
+    Worker process loop: own a few canteens and answer requests
+    Parameters: connection (multiprocessing Connection),
+                canteens (list of str), counters_per_canteen (int or None)
+    """
+    systems = {}
+    for name in canteens:
+        counters = None
+        if counters_per_canteen is not None:
+            counters = [Counter(i, f"Counter {i}")
+                        for i in range(1, counters_per_canteen + 1)]
+        systems[name] = QueueSystem(counters)
+    
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            return  # Coordinator went away
+        if message is None:
+            connection.close()
+            return
+        op, canteen, args = message
+        try:
+            connection.send(('ok', _handle(systems, op, canteen, args)))
+        except Exception as error:
+            # The exception object itself may not pickle; its name and
+            # message always do, so the worker survives and still replies
+            connection.send(('error', (type(error).__name__, str(error))))
+
+
+class CampusCoordinator:
+    """
+    Campus Coordinator Class
+    Routes orders to canteen shards and gathers campus-wide answers
+    
+    Demonstrates: Process pools, message passing, scatter-gather
+    """
+    
+    def __init__(self, canteens, processes=None, counters_per_canteen=None):
+        """
+        Start the worker processes
+        Parameters: canteens (list of str) - canteen names,
+                    processes (int, optional) - defaults to one per CPU,
+                    never more than the number of canteens,
+                    counters_per_canteen (int, optional) - defaults to the
+                    standard three counters of a QueueSystem
+        """
+        if not canteens:
+            raise ValueError("at least one canteen is required")
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        processes = max(1, min(processes, len(canteens)))
+        
+        self.canteens = list(canteens)
+        # Canteens are dealt round-robin to the workers
+        self.owner = {name: i % processes for i, name in enumerate(self.canteens)}
+        self._connections = []
+        self._locks = []
+        self._processes = []
+        for worker in range(processes):
+            owned = [name for name in self.canteens if self.owner[name] == worker]
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker_main, args=(child, owned, counters_per_canteen),
+                name=f"canteen-worker-{worker}", daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._locks.append(threading.Lock())
+            self._processes.append(process)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    # ---------- Messaging ----------
+    
+    def _worker_of(self, canteen):
+        """Index of the worker owning a canteen"""
+        try:
+            return self.owner[canteen]
+        except KeyError:
+            raise ValueError(f"unknown canteen {canteen}") from None
+    
+    @staticmethod
+    def _unwrap(reply):
+        """
+        Return a worker result, re-raising a worker error here
+        Built-in exception types (ValueError, KeyError, ...) are raised as
+        themselves; anything else becomes a RuntimeError naming the type
+        """
+        status, value = reply
+        if status == 'error':
+            name, message = value
+            error_type = getattr(builtins, name, None)
+            if isinstance(error_type, type) and issubclass(error_type, Exception):
+                raise error_type(message)
+            raise RuntimeError(f"{name}: {message}")
+        return value
+    
+    def _call(self, worker, op, canteen=None, args=()):
+        """
+        Send one request to one worker and wait for the answer
+        Returns: the worker's result
+        """
+        with self._locks[worker]:
+            self._connections[worker].send((op, canteen, args))
+            return self._unwrap(self._connections[worker].recv())
+    
+    def _scatter(self, requests):
+        """
+        Send requests to several workers, then gather all answers
+        Every worker that was sent a request has its reply read before any
+        error is raised, so no stale answer is left in a pipe for the next
+        caller to pick up
+        
+        Parameter: requests (dict worker -> (op, canteen, args))
+        Returns: dict worker -> result
+        """
+        workers = sorted(requests)
+        for worker in workers:
+            self._locks[worker].acquire()
+        failure = None
+        replies = {}
+        try:
+            sent = []
+            try:
+                for worker in workers:
+                    self._connections[worker].send(requests[worker])
+                    sent.append(worker)
+            except Exception as error:
+                failure = error
+            for worker in sent:
+                try:
+                    replies[worker] = self._connections[worker].recv()
+                except Exception as error:
+                    failure = failure or error
+        finally:
+            for worker in workers:
+                self._locks[worker].release()
+        if failure is not None:
+            raise failure
+        return {worker: self._unwrap(reply) for worker, reply in replies.items()}
+    
+    def _gather_all(self, op):
+        """
+        Run a per-canteen query on every worker
+        Returns: dict canteen -> result
+        """
+        merged = {}
+        for result in self._scatter({w: (op, None, ())
+                                     for w in range(len(self._connections))}).values():
+            merged.update(result)
+        return merged
+    
+    # ---------- Per-canteen calls ----------
+    
+    def add_order(self, canteen, name, items):
+        """
+        Add one order to a canteen
+        Parameters: canteen (str), name (str), items (list of str)
+        Returns: tuple (customer_id, counter_id) - ids are per canteen
+        """
+        return self._call(self._worker_of(canteen), 'add', canteen, (name, items))
+    
+    def add_orders(self, orders_by_canteen):
+        """
+        Add many orders, one message per worker, all workers in parallel
+        Parameter: orders_by_canteen (dict canteen -> list of (name, items))
+        Returns: dict canteen -> list of (customer_id, counter_id)
+        """
+        batches = {}
+        for canteen, orders in orders_by_canteen.items():
+            batches.setdefault(self._worker_of(canteen), {})[canteen] = orders
+        merged = {}
+        for result in self._scatter({w: ('add_batch', None, (batch,))
+                                     for w, batch in batches.items()}).values():
+            merged.update(result)
+        return merged
+    
+    def serve(self, canteen, counter_id):
+        """
+        Press the serve button of a counter in a canteen
+        Parameters: canteen (str), counter_id (int)
+        Returns: dictionary with 'action', 'customer_id', 'seated' and 'seat'
+        """
+        return self._call(self._worker_of(canteen), 'serve', canteen, (counter_id,))
+    
+    # ---------- Campus-wide queries ----------
+    
+    def serve_until_empty(self):
+        """
+        Serve every queue on campus until it is empty (end of service)
+        Returns: dict canteen -> number of customers finished
+        """
+        return self._gather_all('drain')
+    
+    def shortest_wait(self):
+        """
+        Find the shortest wait anywhere on campus
+        Returns: dictionary with 'canteen', 'counter_id', 'counter'
+                 and 'wait_time'
+        """
+        best = self._gather_all('best')
+        # Ties go to the canteen listed first
+        canteen = min(self.canteens, key=lambda name: best[name][0])
+        wait, counter_id, counter_name = best[canteen]
+        return {'canteen': canteen, 'counter_id': counter_id,
+                'counter': counter_name, 'wait_time': wait}
+    
+    def total_free_seats(self):
+        """
+        Count vacant seats in every canteen
+        Returns: int
+        """
+        return sum(self._gather_all('seats').values())
+    
+    def status(self):
+        """
+        Queue status of every counter on campus
+        Returns: dict canteen -> list of counter status dictionaries
+        """
+        return self._gather_all('status')
+    
+    def close(self):
+        """Stop all workers"""
+        for connection, lock in zip(self._connections, self._locks):
+            with lock:
+                try:
+                    connection.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+                connection.close()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._connections = []
+        self._processes = []
@@ -0,0 +1,76 @@
+"""
+Clock Module
+============
+Time sources for the queue system
+
+The queue system asks a clock object for the current time instead of
+calling datetime.now() directly. SystemClock gives real wall-clock time;
+VirtualClock is moved forward by hand, which lets a simulation replay a
+whole lunch rush much faster than real time.
+
+Concepts Applied:
+- Dependency injection
+- Classes with a shared interface
+"""
+
+from datetime import datetime, timedelta
+
+
+class SystemClock:
+    """
+    System Clock Class
+    Reports the real current time
+    
+    Demonstrates: Simple interface class
+    """
+    
+    def now(self):
+        """
+        Get the current time
+        Returns: datetime
+        """
+        return datetime.now()
+
+
+class VirtualClock:
+    """
+    Virtual Clock Class
+    A clock that only moves when told to
+    
+    Demonstrates: State management, simulation support
+    """
+    
+    def __init__(self, start=None):
+        """
+        Initialize the clock
+        Parameter: start (datetime, optional) - starting time, defaults to now
+        """
+        self.current = start if start is not None else datetime.now()
+    
+    def now(self):
+        """
+        Get the current virtual time
+        Returns: datetime
+        """
+        return self.current
+    
+    def set(self, when):
+        """
+        Move the clock to a given time
+        Parameter: when (datetime) - must not be earlier than the current time
+        Raises: ValueError if asked to move backwards
+        """
+        if when < self.current:
+            raise ValueError("VirtualClock cannot move backwards")
+        self.current = when
+    
+    def advance(self, seconds):
+        """
+        Move the clock forward
+        Parameter: seconds (float) - how far to move
+        """
+        self.set(self.current + timedelta(seconds=seconds))
+
+
+# Shared default clock used when none is injected
+system_clock = SystemClock()
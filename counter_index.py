@@ -0,0 +1,208 @@
+"""
+Counter Index Module
+====================
+Priority index over counters keyed by projected wait time
+
+The best counter used to be found with a linear scan over every counter.
+This index keeps the counters in two lazily-invalidated heaps so the best
+counter can be found in O(log n) amortised time:
+
+- busy heap:   counters whose current customer is still inside the
+               estimated serving time. Their wait is
+               queued_time + (finish_deadline - now), so they are ordered by
+               the time-independent key queued_time + finish_deadline.
+- static heap: every other counter. Their wait is just queued_time.
+
+queued_time is the counter's speed-adjusted queue total
+(Counter.get_queued_time), which only changes together with the counter.
+
+A third heap holds the finish deadlines of busy counters. When a deadline
+passes, the counter moves from the busy heap to the static heap, because
+its in-service remainder is clipped to zero from then on.
+
+Counters report changes without taking the index lock: update() only
+marks the counter dirty, and the next best() re-keys the dirty counters
+before it looks at the heaps. Queries still serialize on the index lock,
+so concurrent best() calls wait for each other, and the one that drains
+the dirty counters pays for re-keying them (O(log n) each).
+
+Concepts Applied:
+- Data Structures (heaps, dictionaries)
+- Lazy invalidation with version numbers
+- Deferred (lazy) updates
+- Algorithm Implementation
+"""
+
+import collections
+import heapq
+import threading
+
+
+class CounterIndex:
+    """
+    Counter Index Class
+    Keeps counters ordered by projected wait time
+    
+    Every counter gets a version number. Heap entries carry the version
+    they were pushed with, so entries left behind by a change are simply
+    skipped when they reach the top (lazy invalidation).
+    
+    Time is assumed to move forward between queries.
+    
+    All methods are thread-safe. update() is lock-free, so counters may
+    call it while holding their own lock; the index lock may be held while
+    a counter's lock is taken, never the other way round.
+    
+    Demonstrates: Priority queues, lazy deletion
+    """
+    
+    def __init__(self, counters):
+        """
+        Build the index
+        Parameter: counters (list of Counter objects)
+        """
+        self.counters = list(counters)
+        self._lock = threading.Lock()
+        self._position = {}  # id(counter) -> index in self.counters
+        self._version = []
+        self._busy_heap = []      # (queued + deadline, position, version)
+        self._static_heap = []    # (queued, position, version)
+        self._deadline_heap = []  # (deadline, position, version)
+        # Counters changed since they were last keyed, drained by best();
+        # the flags keep a counter from being queued twice
+        self._dirty = collections.deque()
+        self._dirty_flag = []
+        self.rebuild()
+    
+    def __len__(self):
+        """Number of counters in the index"""
+        return len(self.counters)
+    
+    def rebuild(self):
+        """
+        Rebuild all heaps from scratch
+        """
+        with self._lock:
+            self._rebuild_locked()
+    
+    def _rebuild_locked(self):
+        """
+        Rebuild all heaps; also compacts them once stale entries pile up
+        Must be called with self._lock held
+        """
+        self._position = {id(c): i for i, c in enumerate(self.counters)}
+        self._version = [0] * len(self.counters)
+        # Pending dirty marks are kept: draining them again is harmless
+        self._dirty_flag.extend([False] * (len(self.counters) - len(self._dirty_flag)))
+        self._busy_heap = []
+        self._static_heap = []
+        self._deadline_heap = []
+        for position in range(len(self.counters)):
+            self._push(position)
+    
+    def add_counter(self, counter):
+        """
+        Add a new counter to the index
+        Parameter: counter (Counter object)
+        """
+        with self._lock:
+            self.counters.append(counter)
+            position = len(self.counters) - 1
+            self._position[id(counter)] = position
+            self._version.append(0)
+            self._dirty_flag.append(False)
+            self._push(position)
+    
+    def update(self, counter):
+        """
+        Mark a counter for re-keying after its queue or serving state
+        changed; the next best() does the re-keying
+        Lock-free: the flag check, flag store and deque append are each
+        atomic, and a counter queued twice is only re-keyed twice
+        Parameter: counter (Counter object)
+        """
+        position = self._position.get(id(counter))
+        if position is None or self._dirty_flag[position]:
+            return
+        self._dirty_flag[position] = True
+        self._dirty.append(position)
+    
+    def _drain_locked(self):
+        """
+        Re-key every counter marked dirty since the last query
+        Must be called with self._lock held
+        """
+        dirty = self._dirty
+        while dirty:
+            position = dirty.popleft()
+            # Clear the flag before reading the counter, so a change made
+            # after the read marks it dirty again
+            self._dirty_flag[position] = False
+            self._version[position] += 1
+            self._push(position)
+        if len(self._static_heap) + len(self._busy_heap) > 4 * len(self.counters) + 64:
+            self._rebuild_locked()
+    
+    def _push(self, position):
+        """
+        Push the current key of one counter onto the right heap
+        Must be called with self._lock held
+        Parameter: position (int) - index of the counter
+        """
+        counter = self.counters[position]
+        version = self._version[position]
+        with counter.lock:
+            deadline = counter.get_serving_deadline()
+            queued = counter.get_queued_time()
+        if deadline is None:
+            heapq.heappush(self._static_heap, (queued, position, version))
+        else:
+            heapq.heappush(self._busy_heap, (queued + deadline, position, version))
+            heapq.heappush(self._deadline_heap, (deadline, position, version))
+    
+    def _expire_deadlines(self, now_ts):
+        """
+        Move counters whose serving deadline has passed to the static heap
+        Parameter: now_ts (float) - current time as epoch seconds
+        """
+        while self._deadline_heap and self._deadline_heap[0][0] <= now_ts:
+            _, position, version = heapq.heappop(self._deadline_heap)
+            if version != self._version[position]:
+                continue  # Stale entry
+            self._version[position] += 1
+            counter = self.counters[position]
+            queued = counter.get_queued_time()
+            heapq.heappush(self._static_heap,
+                           (queued, position, self._version[position]))
+    
+    def _clean_top(self, heap):
+        """
+        Drop stale entries from the top of a heap
+        Returns: the valid top entry, or None if the heap is empty
+        """
+        while heap and heap[0][2] != self._version[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+    
+    def best(self, now):
+        """
+        Find the counter with the shortest estimated wait time
+        Ties go to the counter with the lower index, like the linear scan
+        
+        Parameter: now (datetime) - time to evaluate the wait at
+        Returns: Counter object, or None if there are no counters
+        """
+        with self._lock:
+            if not self.counters:
+                return None
+            self._drain_locked()
+            self._expire_deadlines(now.timestamp())
+            
+            candidates = []
+            for heap in (self._static_heap, self._busy_heap):
+                top = self._clean_top(heap)
+                if top is not None:
+                    counter = self.counters[top[1]]
+                    candidates.append((counter.get_estimated_wait_time(now), top[1]))
+            
+            return self.counters[min(candidates)[1]]
@@ -0,0 +1,333 @@
+"""
+Customer Queue Module
+=====================
+The waiting line of a counter, as an intrusive doubly linked list
+
+A deque cannot drop a customer from the middle of the line in less than
+O(n), and cannot say where a customer stands without walking it. Here the
+links live on the Customer objects themselves, so a customer who leaves
+the line is unlinked in O(1), and a registry (customer_id -> Customer)
+shared by every counter finds any waiting customer in O(1).
+
+Positions come from marks taken when a customer joins:
+- ticket: how many customers joined this queue before them
+- mark:   the serving time of everyone who joined before them
+Customers served from the front only bump two running totals; the few who
+leave from the middle are recorded in Fenwick trees indexed by ticket, so
+
+    position   = ticket - served - left before ticket
+    time ahead = mark - served time - time of those who left before ticket
+
+costs O(1) while nobody has left from the middle and O(log n) otherwise.
+Tickets are renumbered (O(n), amortised O(1)) when they run past the
+trees' capacity, or when a customer is inserted anywhere but the back.
+
+Concepts Applied:
+- Intrusive linked lists
+- Order statistics with Fenwick (binary indexed) trees
+- Amortised analysis
+"""
+
+# Smallest ticket capacity; renumbering doubles it past the queue length
+MIN_CAPACITY = 64
+
+
+def _fenwick_add(tree, ticket, value):
+    """Add value at a ticket (O(log n))"""
+    index = ticket + 1
+    size = len(tree)
+    while index < size:
+        tree[index] += value
+        index += index & -index
+
+
+def _fenwick_prefix(tree, ticket):
+    """Sum of the values at tickets below ticket (O(log n))"""
+    total = 0
+    index = ticket
+    while index > 0:
+        total += tree[index]
+        index -= index & -index
+    return total
+
+
+class CustomerQueue:
+    """
+    Customer Queue Class
+    FIFO line of Customer objects with O(1) removal of any customer
+    
+    Supports the deque operations the counters use (append, popleft, pop,
+    remove, insert, indexing, len, iteration), plus position() and
+    time_ahead() for a customer in the line. A customer can be in one
+    queue at a time. Not thread-safe; the owning counter's lock guards it.
+    
+    Demonstrates: Linked lists, order statistics
+    """
+    
+    def __init__(self, customers=(), owner=None, registry=None):
+        """
+        Create a queue
+        Parameters: customers (iterable of Customer, optional) - initial line,
+                    owner (optional) - the counter this queue belongs to,
+                    registry (dict, optional) - customer_id -> Customer of
+                    every waiting customer, shared between queues
+        """
+        self.owner = owner
+        self.registry = registry
+        self._head = None
+        self._tail = None
+        self._length = 0
+        self.total_time = 0.0  # Serving time of everyone waiting
+        self._reset(0)
+        for customer in customers:
+            self.append(customer)
+    
+    def _reset(self, length):
+        """Start counting tickets and times again from the current front"""
+        self._capacity = max(MIN_CAPACITY, 2 * length)
+        self._next_ticket = 0
+        self._joined_time = 0.0   # Serving time of everyone given a ticket
+        self._served = 0          # Customers popped from the front
+        self._served_time = 0.0
+        self._left = None         # Fenwick trees of customers who left from
+        self._left_time = None    # the middle, allocated on first use
+    
+    def _renumber(self):
+        """Give everyone waiting fresh tickets and marks (O(n))"""
+        self._reset(self._length)
+        customer = self._head
+        while customer is not None:
+            self._stamp(customer)
+            customer = customer._next
+    
+    def _stamp(self, customer):
+        """Give a customer joining at the back the next ticket and mark"""
+        customer._ticket = self._next_ticket
+        customer._mark = self._joined_time
+        self._next_ticket += 1
+        self._joined_time += customer.get_estimated_serving_time()
+    
+    def _link_after(self, customer, previous):
+        """Link a customer after previous (None for the front)"""
+        if customer._queue is not None:
+            raise ValueError(f"customer {customer.customer_id} is already queued")
+        following = self._head if previous is None else previous._next
+        customer._prev = previous
+        customer._next = following
+        if previous is None:
+            self._head = customer
+        else:
+            previous._next = customer
+        if following is None:
+            self._tail = customer
+        else:
+            following._prev = customer
+        customer._queue = self
+        self._length += 1
+        self.total_time += customer.get_estimated_serving_time()
+        if self.registry is not None:
+            self.registry[customer.customer_id] = customer
+    
+    def _unlink(self, customer):
+        """Unlink a customer from the line"""
+        previous, following = customer._prev, customer._next
+        if previous is None:
+            self._head = following
+        else:
+            previous._next = following
+        if following is None:
+            self._tail = previous
+        else:
+            following._prev = previous
+        customer._prev = customer._next = customer._queue = None
+        self._length -= 1
+        self.total_time -= customer.get_estimated_serving_time()
+        if self.registry is not None and self.registry.get(customer.customer_id) is customer:
+            del self.registry[customer.customer_id]
+        if not self._length:
+            self.total_time = 0.0  # Reset to avoid drift on empty queue
+            self._reset(0)
+    
+    def _record_left(self, customer):
+        """Record a customer who left from the middle of the line"""
+        if self._left is None:
+            self._left = [0] * (self._capacity + 1)
+            self._left_time = [0.0] * (self._capacity + 1)
+        _fenwick_add(self._left, customer._ticket, 1)
+        _fenwick_add(self._left_time, customer._ticket,
+                     customer.get_estimated_serving_time())
+    
+    def append(self, customer):
+        """
+        Add a customer at the back of the line (amortised O(1))
+        Parameter: customer (Customer object)
+        Raises: ValueError if the customer is already in a queue
+        """
+        if customer._queue is not None:
+            raise ValueError(f"customer {customer.customer_id} is already queued")
+        if self._next_ticket >= self._capacity:
+            self._renumber()
+        self._stamp(customer)
+        self._link_after(customer, self._tail)
+    
+    def popleft(self):
+        """
+        Remove and return the customer at the front (O(1))
+        Raises: IndexError if the queue is empty
+        """
+        customer = self._head
+        if customer is None:
+            raise IndexError("pop from an empty queue")
+        self._served += 1
+        self._served_time += customer.get_estimated_serving_time()
+        self._unlink(customer)
+        return customer
+    
+    def pop(self):
+        """
+        Remove and return the customer at the back (O(1), or O(log n) once
+        someone has left from the middle)
+        Raises: IndexError if the queue is empty
+        """
+        customer = self._tail
+        if customer is None:
+            raise IndexError("pop from an empty queue")
+        if self._left is None:
+            # Nobody after them, so their ticket can simply be handed out again
+            self._next_ticket = customer._ticket
+            self._joined_time = customer._mark
+        else:
+            self._record_left(customer)
+        self._unlink(customer)
+        return customer
+    
+    def remove(self, customer):
+        """
+        Remove a customer from anywhere in the line (O(log n))
+        Parameter: customer (Customer object)
+        Raises: ValueError if the customer is not in this queue
+        """
+        if customer._queue is not self:
+            raise ValueError(f"customer {customer.customer_id} is not in this queue")
+        if customer is self._head:
+            self.popleft()
+        elif customer is self._tail:
+            self.pop()
+        else:
+            self._record_left(customer)
+            self._unlink(customer)
+    
+    def insert(self, index, customer):
+        """
+        Insert a customer before position index, like list.insert (O(n))
+        Parameters: index (int), customer (Customer object)
+        Raises: ValueError if the customer is already in a queue
+        """
+        if index < 0:
+            index = max(0, self._length + index)
+        if index >= self._length:
+            self.append(customer)
+            return
+        previous = None if index == 0 else self._node_at(index - 1)
+        self._link_after(customer, previous)
+        self._renumber()
+    
+    def insert_by_entry(self, customer):
+        """
+        Insert a customer keeping the line in entry time order, walking
+        from the back (O(1) when they belong at the back, O(n) otherwise)
+        Parameter: customer (Customer object)
+        Raises: ValueError if the customer is already in a queue
+        """
+        previous = self._tail
+        while previous is not None and previous.entry_time > customer.entry_time:
+            previous = previous._prev
+        if previous is self._tail:
+            self.append(customer)
+        else:
+            self._link_after(customer, previous)
+            self._renumber()
+    
+    def peek(self):
+        """Customer at the front, or None if the queue is empty"""
+        return self._head
+    
+    def clear(self):
+        """Remove every customer from the line (O(n))"""
+        while self._head is not None:
+            self._unlink(self._head)
+    
+    def _node_at(self, index):
+        """Customer at a position, walking from the nearer end (O(n))"""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("queue index out of range")
+        if index <= self._length // 2:
+            customer = self._head
+            for _ in range(index):
+                customer = customer._next
+        else:
+            customer = self._tail
+            for _ in range(self._length - 1 - index):
+                customer = customer._prev
+        return customer
+    
+    def __getitem__(self, index):
+        """Customer at a position; the front and back are O(1)"""
+        return self._node_at(index)
+    
+    def __contains__(self, customer):
+        """Whether a customer is waiting in this queue (O(1))"""
+        return getattr(customer, '_queue', None) is self
+    
+    def __len__(self):
+        return self._length
+    
+    def __bool__(self):
+        return self._length > 0
+    
+    def __iter__(self):
+        """Customers from front to back"""
+        customer = self._head
+        while customer is not None:
+            following = customer._next
+            yield customer
+            customer = following
+    
+    def __repr__(self):
+        return f"CustomerQueue({[customer.customer_id for customer in self]})"
+    
+    def position(self, customer):
+        """
+        Number of customers ahead of a customer in the line
+        Parameter: customer (Customer object in this queue)
+        Returns: int (0 for the front)
+        
+        Demonstrates: Order statistics
+        """
+        ahead = customer._ticket - self._served
+        if self._left is not None:
+            ahead -= _fenwick_prefix(self._left, customer._ticket)
+        return ahead
+    
+    def time_ahead(self, customer):
+        """
+        Estimated serving time of everyone ahead of a customer
+        Parameter: customer (Customer object in this queue)
+        Returns: float (seconds, before any counter speed adjustment)
+        """
+        ahead = customer._mark - self._served_time
+        if self._left is not None:
+            ahead -= _fenwick_prefix(self._left_time, customer._ticket)
+        return max(ahead, 0.0)  # Rounding can leave a tiny negative at the front
+    
+    @staticmethod
+    def owner_of(customer):
+        """
+        The owner (counter) of the queue a customer is waiting in
+        Parameter: customer (Customer object)
+        Returns: the owner, or None if the customer is not queued
+        """
+        queue = customer._queue
+        return queue.owner if queue is not None else None
@@ -0,0 +1,371 @@
+"""
+Customer Store Module
+=====================
+Compact struct-of-arrays storage for large numbers of customers
+
+Instead of one Customer object per person, the store keeps one row per
+customer spread over typed arrays (ids, entry timestamps, complexity
+scores, item codes and UTF-8 names). A queued customer then costs a few
+dozen bytes instead of a few hundred. StoreCounter is a Counter whose
+queue holds only row indices into a shared store.
+
+StoreCounter keeps a single FIFO line (no priority lanes) and is meant
+for compact storage and memory benchmarks; a QueueSystem only accepts
+counters that queue Customer objects.
+
+Concepts Applied:
+- Data Structures (array module, struct-of-arrays layout)
+- String interning (item codes)
+- Inheritance
+"""
+
+from array import array
+from datetime import datetime
+
+from queue_system import (Counter, Customer, BASE_SERVING_TIME,
+                          TIME_PER_COMPLEXITY)
+from clock import system_clock
+from menu import default_catalogue
+from priority_lanes import check_priority
+
+
+class CustomerStore:
+    """
+    Customer Store Class
+    Holds customers as rows of parallel typed arrays
+    
+    Demonstrates: Columnar storage, interning
+    """
+    
+    def __init__(self, catalogue=None, clock=None):
+        """
+        Initialize an empty store
+        Parameters: catalogue (ComplexityCatalogue, optional) - item scores,
+                    clock (optional) - time source for default entry times
+        """
+        self.catalogue = catalogue if catalogue is not None else default_catalogue
+        self.clock = clock if clock is not None else system_clock
+        self.customer_ids = array('q')
+        self.entry_times = array('d')       # Epoch seconds
+        self.complexity = array('f')        # Scores are multiples of 0.5
+        self.item_offsets = array('I', [0])  # Row r uses item_codes[off[r]:off[r+1]]
+        self.item_codes = array('H')
+        self.name_offsets = array('I', [0])
+        self.names = bytearray()            # UTF-8 names, back to back
+        self.item_names = []                # Code -> item name
+        self._item_code = {}                # Item name -> code
+    
+    def __len__(self):
+        """Number of rows in the store"""
+        return len(self.customer_ids)
+    
+    def _intern_item(self, item):
+        """
+        Get the integer code of an item name, assigning one if new
+        Parameter: item (str)
+        Returns: int
+        """
+        code = self._item_code.get(item)
+        if code is None:
+            code = len(self.item_names)
+            self._item_code[item] = code
+            self.item_names.append(item)
+        return code
+    
+    def append(self, customer_id, name, items, entry_time=None):
+        """
+        Add a customer row
+        Parameters: customer_id (int), name (str), items (list of str),
+                    entry_time (float, optional) - epoch seconds
+        Returns: int - row index
+        """
+        if entry_time is None:
+            entry_time = self.clock.now().timestamp()
+        row = len(self.customer_ids)
+        self.customer_ids.append(customer_id)
+        self.entry_times.append(entry_time)
+        self.complexity.append(self.catalogue.order_complexity(items))
+        for item in items:
+            self.item_codes.append(self._intern_item(item))
+        self.item_offsets.append(len(self.item_codes))
+        self.names.extend(name.encode('utf-8'))
+        self.name_offsets.append(len(self.names))
+        return row
+    
+    def get_name(self, row):
+        """Name of the customer in a row"""
+        start, end = self.name_offsets[row], self.name_offsets[row + 1]
+        return self.names[start:end].decode('utf-8')
+    
+    def get_items(self, row):
+        """List of item names ordered by the customer in a row"""
+        start, end = self.item_offsets[row], self.item_offsets[row + 1]
+        return [self.item_names[code] for code in self.item_codes[start:end]]
+    
+    def get_serving_time(self, row):
+        """
+        Estimated serving time of a row in seconds
+        Same formula as Customer.get_estimated_serving_time
+        """
+        return BASE_SERVING_TIME + self.complexity[row] * TIME_PER_COMPLEXITY
+    
+    def get_customer(self, row):
+        """
+        Materialise a row as a Customer object
+        Parameter: row (int)
+        Returns: Customer object
+        """
+        return Customer.from_record(
+            self.customer_ids[row],
+            self.get_name(row),
+            self.get_items(row),
+            datetime.fromtimestamp(self.entry_times[row]),
+            self.complexity[row],
+        )
+
+
+class RowQueue:
+    """
+    Row Queue Class
+    FIFO queue of row indices backed by a single typed array
+    
+    Demonstrates: Queue with head pointer and compaction
+    """
+    
+    def __init__(self):
+        """Initialize an empty queue"""
+        self._rows = array('I')
+        self._head = 0
+    
+    def __len__(self):
+        """Number of rows waiting"""
+        return len(self._rows) - self._head
+    
+    def __bool__(self):
+        """True if any row is waiting"""
+        return len(self._rows) > self._head
+    
+    def __iter__(self):
+        """Iterate waiting rows from front to back"""
+        for i in range(self._head, len(self._rows)):
+            yield self._rows[i]
+    
+    def append(self, row):
+        """Add a row at the back"""
+        self._rows.append(row)
+    
+    def index(self, row):
+        """
+        Position of a row, counting from the front (O(n))
+        Raises: ValueError if the row is not waiting
+        """
+        for position, queued in enumerate(self):
+            if queued == row:
+                return position
+        raise ValueError(f"row {row} is not in this queue")
+    
+    def insert(self, position, row):
+        """Insert a row before a position, like list.insert (O(n))"""
+        self._rows.insert(self._head + position, row)
+    
+    def remove(self, row):
+        """
+        Remove a row from anywhere in the queue (O(n))
+        Raises: ValueError if the row is not waiting
+        """
+        del self._rows[self._head + self.index(row)]
+        if self._head >= len(self._rows):
+            del self._rows[:]
+            self._head = 0
+    
+    def pop(self):
+        """
+        Remove and return the row at the back
+        Raises: IndexError if the queue is empty
+        """
+        if self._head >= len(self._rows):
+            raise IndexError("pop from an empty RowQueue")
+        row = self._rows.pop()
+        if self._head >= len(self._rows):
+            del self._rows[:]
+            self._head = 0
+        return row
+    
+    def popleft(self):
+        """
+        Remove and return the row at the front
+        Raises: IndexError if the queue is empty
+        """
+        if self._head >= len(self._rows):
+            raise IndexError("pop from an empty RowQueue")
+        row = self._rows[self._head]
+        self._head += 1
+        # Drop the consumed prefix once it is at least half of the array
+        if self._head * 2 >= len(self._rows):
+            del self._rows[:self._head]
+            self._head = 0
+        return row
+
+
+class StoreCounter(Counter):
+    """
+    Store Counter Class
+    A Counter whose queue holds row indices into a CustomerStore
+    
+    Customers are only materialised as Customer objects when they start
+    being served, so serve_next/finish_serving return normal Customers.
+    Every other method taking a waiting customer takes a row instead.
+    The line is one FIFO queue: priority classes are accepted but ignored.
+    
+    Demonstrates: Inheritance, method overriding
+    """
+    
+    def __init__(self, counter_id, name, store, clock=None):
+        """
+        Initialize a store-backed counter
+        Parameters: counter_id (int), name (str), store (CustomerStore),
+                    clock (optional) - time source, defaults to system time
+        """
+        super().__init__(counter_id, name, clock)
+        self.store = store
+        self.queue = RowQueue()
+    
+    def add_customer(self, row, verbose=False):
+        """
+        Add a customer row to this counter's queue (always silently)
+        Parameters: row (int) - row index in the store,
+                    verbose (bool) - accepted for compatibility, ignored
+        """
+        with self.lock:
+            self.queue.append(row)
+            self.queued_serving_time += self.store.get_serving_time(row)
+        self._notify_change()
+    
+    def _release_row_locked(self, row):
+        """
+        Update the queued serving time total after a row leaves the queue
+        Must be called with self.lock held
+        Parameter: row (int)
+        """
+        self.queued_serving_time -= self.store.get_serving_time(row)
+        if not self.queue:
+            self.queued_serving_time = 0  # Reset to avoid drift on empty queue
+    
+    def remove_customer(self, row):
+        """
+        Remove a waiting row that left the line (O(n))
+        Parameter: row (int)
+        Returns: bool - False if the row is not waiting here
+        """
+        with self.lock:
+            try:
+                self.queue.remove(row)
+            except ValueError:
+                return False
+            self._release_row_locked(row)
+        self._notify_change()
+        return True
+    
+    def position_of(self, row):
+        """
+        Number of rows ahead of a waiting row (O(n))
+        Parameter: row (int)
+        Returns: int (0 for the front), or None if not waiting here
+        """
+        with self.lock:
+            try:
+                return self.queue.index(row)
+            except ValueError:
+                return None
+    
+    # The line is a single lane
+    lane_position_of = position_of
+    
+    def personal_wait(self, row, now=None):
+        """
+        Estimated wait of a row already in the line: the rest of the
+        current service plus everyone ahead of them (O(n))
+        Parameters: row (int), now (datetime, optional)
+        Returns: float (seconds), or None if not waiting here
+        """
+        if now is None:
+            now = self.clock.now()
+        with self.lock:
+            ahead = 0.0
+            for queued in self.queue:
+                if queued == row:
+                    return (self._serving_remaining_locked(now)
+                            + self.speed_factor * ahead)
+                ahead += self.store.get_serving_time(queued)
+            return None
+    
+    def get_estimated_wait_time(self, now=None, priority=None):
+        """
+        Calculate estimated waiting time for a new customer
+        Parameters: now (datetime, optional),
+                    priority (str, optional) - checked, but every class
+                    waits behind the whole line here
+        Returns: float (seconds)
+        """
+        if priority is not None:
+            check_priority(priority)
+        return super().get_estimated_wait_time(now)
+    
+    def _take_tail_locked(self):
+        """
+        Remove the row at the back of the queue
+        Must be called with self.lock held and a non-empty queue
+        Returns: int - the row
+        """
+        row = self.queue.pop()
+        self._release_row_locked(row)
+        return row
+    
+    def _insert_by_entry_locked(self, row):
+        """
+        Queue a row keeping the queue in entry time order (O(n))
+        Must be called with self.lock held
+        Parameter: row (int)
+        """
+        entry_times = self.store.entry_times
+        position = len(self.queue)
+        for queued in reversed(list(self.queue)):
+            if entry_times[queued] <= entry_times[row]:
+                break
+            position -= 1
+        self.queue.insert(position, row)
+        self.queued_serving_time += self.store.get_serving_time(row)
+    
+    def _restore_serving(self, customer_id, start_time):
+        """
+        Move the row of a specific customer to the serving position
+        Parameters: customer_id (int), start_time (datetime)
+        Returns: Customer object, or None if the customer is not queued
+        """
+        customer_ids = self.store.customer_ids
+        with self.lock:
+            row = next((queued for queued in self.queue
+                        if customer_ids[queued] == customer_id), None)
+            if row is None:
+                return None
+            self.queue.remove(row)
+            self._release_row_locked(row)
+            customer = self.store.get_customer(row)
+            self.serving_start_time = start_time
+            self.serving_customer = customer
+        self._notify_change()
+        return customer
+    
+    def _start_next_locked(self):
+        """
+        Move the next row from the queue to the serving position
+        Must be called with self.lock held
+        Returns: Customer object if available, None otherwise
+        """
+        if self.queue:
+            customer = self.store.get_customer(self.queue.popleft())
+            self._release_from_queue(customer)
+            self.serving_start_time = self.clock.now()
+            self.serving_customer = customer
+            return customer
+        return None
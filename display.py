@@ -9,9 +9,61 @@ Concepts Applied:
 - User interface design
 """
 
+import sys
+import time
+
 from utils import format_time
 
 
+# ANSI escape sequences used by the live dashboard
+CURSOR_HOME = "\033[H"
+CLEAR_SCREEN = "\033[2J"
+CLEAR_LINE_END = "\033[K"
+HIDE_CURSOR = "\033[?25l"
+SHOW_CURSOR = "\033[?25h"
+
+
+class LiveRenderer:
+    """
+    Live Renderer Class
+    Repaints a text frame in place, rewriting only lines that changed
+    
+    Demonstrates: ANSI cursor addressing, incremental updates
+    """
+    
+    def __init__(self, stream=None):
+        """
+        Initialize the renderer
+        Parameter: stream (file-like, optional) - defaults to sys.stdout
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self.previous = None  # Lines of the last frame drawn
+    
+    def render(self, lines):
+        """
+        Draw a frame, repainting only the lines that changed
+        Parameter: lines (list of str) - the full frame
+        Returns: int - number of lines repainted
+        """
+        out = []
+        if self.previous is None:
+            out.append(CLEAR_SCREEN)
+            self.previous = []
+        repainted = 0
+        for row, line in enumerate(lines):
+            if row >= len(self.previous) or self.previous[row] != line:
+                # Rows and columns are 1-based in ANSI cursor addressing
+                out.append(f"\033[{row + 1};1H{line}{CLEAR_LINE_END}")
+                repainted += 1
+        for row in range(len(lines), len(self.previous)):
+            out.append(f"\033[{row + 1};1H{CLEAR_LINE_END}")  # Frame got shorter
+        self.previous = list(lines)
+        if out:
+            self.stream.write("".join(out))
+            self.stream.flush()
+        return repainted
+
+
 class DisplayManager:
     """
     Display Manager Class
@@ -34,7 +86,8 @@ class DisplayManager:
         print("  3. View Queue Status")
         print("  4. View Seat Availability")
         print("  5. Get Best Line Recommendation")
-        print("  6. Exit")
+        print("  6. Live Dashboard")
+        print("  7. Exit")
         print("─" * 50)
     
     def show_queue_status(self, system):
@@ -83,6 +136,7 @@ class DisplayManager:
         print(" SEAT AVAILABILITY")
         print("=" * 60)
         
+        system.release_due_seats()
         seat_manager = system.seat_manager
         total_seats = seat_manager.total_seats
         occupied = seat_manager.occupied_seats
@@ -123,18 +177,18 @@ class DisplayManager:
         print(" BEST LINE RECOMMENDATION")
         print("=" * 60)
         
-        best_counter = system.get_best_line_recommendation()
-        wait_time = best_counter.get_estimated_wait_time()
-        queue_len = best_counter.get_queue_length()
+        # One snapshot answers the recommendation and the comparison
+        snapshot = system.get_status_snapshot()
+        best = snapshot.best
+        best_counter = best['counter']
         
         print(f"\n✅ Recommended Counter: {best_counter.name}")
-        print(f"   Queue Length: {queue_len} customer(s)")
-        print(f"   Estimated Wait Time: {format_time(wait_time)}")
+        print(f"   Queue Length: {best['queue_length']} customer(s)")
+        print(f"   Estimated Wait Time: {format_time(best['wait_time'])}")
         
         # Show comparison with other counters
         print("\nComparison with other counters:")
-        status_list = system.get_all_queue_status()
-        for status in status_list:
+        for status in snapshot.statuses:
             counter = status['counter']
             if counter.counter_id != best_counter.counter_id:
                 print(f"  {counter.name}: {format_time(status['wait_time'])} "
@@ -142,4 +196,71 @@ class DisplayManager:
         
         print("\n" + "=" * 60)
         input("\nPress Enter to continue...")
-
+    
+    def build_dashboard_lines(self, system):
+        """
+        Build the text lines of one dashboard frame
+        Parameter: system (QueueSystem) - The queue system object
+        Returns: list of str
+        
+        Demonstrates: Data display, string formatting
+        """
+        snapshot = system.get_status_snapshot()
+        status_list = snapshot.statuses
+        best = snapshot.best
+        seat_manager = system.seat_manager
+        
+        lines = [
+            "=" * 60,
+            " LIVE DASHBOARD (Ctrl+C to return to menu)".ljust(60),
+            "=" * 60,
+        ]
+        for status in status_list:
+            counter = status['counter']
+            marker = "*" if status is best else " "
+            serving = "Serving" if status['serving'] else "Idle"
+            lines.append(f"{marker} {counter.name[:26]:26} "
+                         f"Queue: {status['queue_length']:4}  "
+                         f"Wait: {format_time(status['wait_time']):22} {serving}")
+        lines.append("-" * 60)
+        lines.append(f"Seats: {seat_manager.get_vacant_seats()} vacant of "
+                     f"{seat_manager.total_seats} "
+                     f"({seat_manager.get_occupancy_percentage():.1f}% occupied)")
+        if best is not None:
+            lines.append(f"Best line: {best['counter'].name} "
+                         f"({format_time(best['wait_time'])})")
+        return lines
+    
+    def show_live_dashboard(self, system, refresh_rate=10, duration=None, stream=None):
+        """
+        Show queue status, seats and the recommendation, redrawn in place
+        Only lines that changed since the last frame are repainted
+        
+        Parameters: system (QueueSystem) - The queue system object,
+                    refresh_rate (float) - frames per second,
+                    duration (float, optional) - stop after this many seconds,
+                    stream (file-like, optional) - defaults to sys.stdout
+        Returns: int - number of frames drawn
+        
+        Demonstrates: Timed loops, incremental screen updates
+        """
+        renderer = LiveRenderer(stream)
+        interval = 1.0 / refresh_rate
+        start = time.monotonic()
+        frames = 0
+        renderer.stream.write(HIDE_CURSOR)
+        try:
+            while duration is None or time.monotonic() - start < duration:
+                system.release_due_seats()
+                renderer.render(self.build_dashboard_lines(system))
+                frames += 1
+                # Sleep until the next frame is due
+                next_frame = start + frames * interval
+                time.sleep(max(0.0, next_frame - time.monotonic()))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            rows = len(renderer.previous or [])
+            renderer.stream.write(f"\033[{rows + 1};1H{SHOW_CURSOR}\n")
+            renderer.stream.flush()
+        return frames
@@ -0,0 +1,118 @@
+"""
+Serving Time Estimator Module
+=============================
+Online estimate of serving times, learned from completed services
+
+The fixed formula (base time + time per complexity point) is only the
+starting point. Every finished service gives the real duration, which is
+used to update two things:
+
+- a speed factor per counter: an exponentially weighted moving average
+  (EWMA) of actual / predicted duration, so a slow or fast team is
+  reflected in that counter's wait estimates
+- the base time and the seconds for each menu item, nudged towards the
+  counter-normalized duration in proportion to their share of the
+  prediction (a normalized least-mean-squares step)
+
+Each update costs O(items in the order); nothing is retrained offline.
+
+Concepts Applied:
+- Online learning (EWMA, LMS)
+- Dictionaries for constant-time lookup
+- Outlier clipping
+"""
+
+import threading
+
+from menu import default_catalogue
+
+
+class ServingTimeEstimator:
+    """
+    Serving Time Estimator Class
+    Learns per-counter speeds and per-item serving times online
+    
+    Demonstrates: Incremental statistics, shared model state
+    """
+    
+    def __init__(self, base_time, time_per_complexity, catalogue=None,
+                 counter_alpha=0.1, item_rate=0.05, max_ratio=4.0):
+        """
+        Initialize the estimator with the fixed formula as prior
+        Parameters: base_time (float) - initial base seconds per order,
+                    time_per_complexity (float) - seconds per complexity point,
+                    catalogue (ComplexityCatalogue, optional),
+                    counter_alpha (float) - EWMA weight of a new observation,
+                    item_rate (float) - learning rate of the item model,
+                    max_ratio (float) - observations more than this factor
+                    away from the prediction are clipped (forgotten buttons)
+        """
+        self.catalogue = catalogue if catalogue is not None else default_catalogue
+        self.time_per_complexity = time_per_complexity
+        self.counter_alpha = counter_alpha
+        self.item_rate = item_rate
+        self.max_ratio = max_ratio
+        self.base_time = float(base_time)
+        # Learned seconds for menu items; free-text items keep their prior
+        self.item_seconds = {item: score * time_per_complexity
+                             for item, score in self.catalogue.scores.items()}
+        self.counter_speed = {}  # counter_id -> speed factor (1.0 = as predicted)
+        self.observations = 0
+        self._lock = threading.Lock()
+    
+    def item_time(self, item):
+        """
+        Current estimate of the seconds one item adds to an order
+        Parameter: item (str)
+        Returns: float
+        """
+        seconds = self.item_seconds.get(item)
+        if seconds is None:
+            seconds = self.catalogue.score(item) * self.time_per_complexity
+        return seconds
+    
+    def predict(self, items):
+        """
+        Predict the serving time of an order at a counter of speed 1.0
+        Lock-free: a prediction racing an update just sees the old model
+        Parameter: items (list of str)
+        Returns: float - seconds
+        """
+        return self.base_time + sum(self.item_time(item) for item in items)
+    
+    def speed(self, counter_id):
+        """
+        Speed factor of a counter (actual / predicted serving time)
+        Parameter: counter_id (int)
+        Returns: float
+        """
+        return self.counter_speed.get(counter_id, 1.0)
+    
+    def observe(self, counter_id, items, duration):
+        """
+        Learn from one completed service
+        Parameters: counter_id (int), items (list of str),
+                    duration (float) - actual serving time in seconds
+        Returns: float - the counter's updated speed factor
+        """
+        with self._lock:
+            speed = self.counter_speed.get(counter_id, 1.0)
+            if duration <= 0:
+                return speed  # Start and finish pressed together; no information
+            prior = self.predict(items)
+            low, high = prior / self.max_ratio, prior * self.max_ratio
+            duration = min(max(duration, low), high)
+            
+            # Counter speed: EWMA of actual / predicted
+            speed += self.counter_alpha * (duration / prior - speed)
+            self.counter_speed[counter_id] = speed
+            
+            # Order model: share the normalized error across its terms
+            target = min(max(duration / speed, low), high)
+            step = self.item_rate * (target - prior) / prior
+            self.base_time += step * self.base_time
+            for item in set(items):
+                if item in self.item_seconds:
+                    self.item_seconds[item] += step * self.item_seconds[item]
+            self.observations += 1
+            return speed
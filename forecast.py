@@ -0,0 +1,152 @@
+"""
+Forecast Module
+===============
+Short-horizon forecast of every counter's queue (e.g. the next 30 minutes)
+
+The forecast is a fluid model: time is cut into steps, and in each step a
+counter receives its share of the expected arrivals as work (customers x
+mean serving time at that counter) and clears one step's worth of work.
+The work left at a counter is the wait for someone joining it then, and
+the queue length is that work divided by the counter's mean serving time.
+
+Work cannot go below zero, so the backlog follows the Lindley recursion
+    W[t] = max(W[t-1] + X[t], 0)
+which has a closed form using running sums S[t] = X[1] + ... + X[t]:
+    W[t] = S[t] - min(-W[0], min(S[1..t]))
+so every counter and every future step is computed at once with a cumsum
+and a running minimum over a (counters x steps) array. NumPy is used when
+it is installed; otherwise the recursion runs in plain Python.
+
+Concepts Applied:
+- Queueing theory (fluid approximation, Lindley recursion)
+- Vectorization (cumulative sums and minima)
+- Optional dependencies
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+# Default step length (seconds): 120 steps cover 30 minutes
+DEFAULT_STEP = 15.0
+
+# Average number of items per order, for the mean order time
+ITEMS_PER_ORDER = 2.0
+
+
+def mean_order_time(estimator, menu_items, items_per_order=ITEMS_PER_ORDER):
+    """
+    Mean serving time of an order, from the serving time model
+    Parameters: estimator (ServingTimeEstimator), menu_items (list of str),
+                items_per_order (float) - average order size
+    Returns: float - seconds
+    """
+    item_mean = sum(estimator.item_time(item) for item in menu_items) / len(menu_items)
+    return estimator.base_time + items_per_order * item_mean
+
+
+class QueueForecast:
+    """
+    Queue Forecast Class
+    Forecast waits and queue lengths, one row per counter
+    
+    waits[c][t] and queue_lengths[c][t] describe counter c at the end of
+    step t (after (t + 1) * step seconds). They are (counters x steps)
+    NumPy arrays when NumPy computed the forecast, lists of lists otherwise;
+    both index the same way
+    
+    Demonstrates: Result objects
+    """
+    
+    def __init__(self, counter_ids, step, waits, queue_lengths):
+        """
+        Parameters: counter_ids (list of int), step (float) - seconds,
+                    waits, queue_lengths (arrays or lists of lists of float)
+        """
+        self.counter_ids = counter_ids
+        self.step = step
+        self.waits = waits
+        self.queue_lengths = queue_lengths
+    
+    def peak(self):
+        """
+        Longest forecast wait over every counter and step
+        Returns: tuple (counter_id, seconds from now, wait), or None
+        """
+        if np is not None and isinstance(self.waits, np.ndarray):
+            if not self.waits.size:
+                return None
+            row, step = np.unravel_index(np.argmax(self.waits), self.waits.shape)
+            return (self.counter_ids[row], (int(step) + 1) * self.step,
+                    float(self.waits[row, step]))
+        best = None
+        for counter_id, waits in zip(self.counter_ids, self.waits):
+            for step, wait in enumerate(waits):
+                if best is None or wait > best[2]:
+                    best = (counter_id, (step + 1) * self.step, wait)
+        return best
+
+
+def forecast_queues(backlog, service_times, arrival_rates, shares=None,
+                    step=DEFAULT_STEP, use_numpy=True):
+    """
+    Forecast every counter's wait and queue length over the next steps
+    Parameters: backlog (list of float) - current wait per counter (seconds),
+                service_times (list of float) - mean serving time of an
+                order at each counter (seconds, > 0),
+                arrival_rates (list of float) - expected arrivals per minute
+                for the whole canteen in each future step,
+                shares (list of float, optional) - fraction of arrivals
+                joining each counter; defaults to proportional to each
+                counter's service rate, as shortest-wait routing does,
+                step (float) - seconds per step,
+                use_numpy (bool) - use NumPy when it is installed
+    Raises: ValueError if the per-counter lists differ in length
+    Returns: tuple (waits, queue_lengths), (counters x steps) NumPy
+             arrays, or lists of lists without NumPy
+    
+    Demonstrates: Vectorized recurrences
+    """
+    counters = len(backlog)
+    if len(service_times) != counters or (shares is not None and len(shares) != counters):
+        raise ValueError("backlog, service_times and shares need one entry per counter")
+    if any(time <= 0 for time in service_times):
+        raise ValueError("service times must be positive")
+    if shares is None:
+        rates = [1.0 / time for time in service_times]
+        total = sum(rates) or 1.0
+        shares = [rate / total for rate in rates]
+    # Work (seconds) arriving per step for every counter, per unit of
+    # canteen-wide arrivals per minute
+    work_per_arrival = [share * time * step / 60.0
+                        for share, time in zip(shares, service_times)]
+    
+    if use_numpy and np is not None:
+        return _forecast_numpy(backlog, service_times, arrival_rates,
+                               work_per_arrival, step)
+    
+    waits, lengths = [], []
+    for initial, time, work in zip(backlog, service_times, work_per_arrival):
+        wait = initial
+        row = []
+        for rate in arrival_rates:
+            wait += rate * work - step
+            if wait < 0:
+                wait = 0.0
+            row.append(wait)
+        waits.append(row)
+        lengths.append([value / time for value in row])
+    return waits, lengths
+
+
+def _forecast_numpy(backlog, service_times, arrival_rates, work_per_arrival, step):
+    """forecast_queues on (counters x steps) NumPy arrays"""
+    increments = np.outer(work_per_arrival, np.asarray(arrival_rates, dtype=float)) - step
+    sums = np.cumsum(increments, axis=1)
+    floor = np.minimum(np.minimum.accumulate(sums, axis=1),
+                       -np.asarray(backlog, dtype=float)[:, None])
+    waits = sums - floor
+    lengths = waits / np.asarray(service_times, dtype=float)[:, None]
+    return waits, lengths
@@ -0,0 +1,161 @@
+"""
+Group Assignment Module
+=======================
+Spread a group of orders over counters so the whole group is served
+as early as possible (minimum makespan)
+
+Placing the customers of a group one by one on the currently shortest
+line is greedy: a long order that comes last can land on an already busy
+counter and stretch the tail. Scheduling the group as a whole does better:
+
+- LPT (longest processing time first): sort the orders longest first and
+  give each one to the counter that is free earliest (a min-heap of
+  counter loads). Within 4/3 of the optimum on equal, idle counters.
+- exact: depth-first branch and bound, for small groups only.
+
+Each counter has a current load (its wait time right now) and a speed
+factor; an order of estimated time p takes speed * p at that counter.
+With specialised counters, each order may only go to the counters
+listed for it in eligible (every counter when eligible is None).
+
+Concepts Applied:
+- Scheduling heuristics (LPT)
+- Priority queues (heapq)
+- Branch and bound search
+"""
+
+import heapq
+
+
+# Largest group the exact solver accepts (its search is exponential)
+EXACT_MAX_ORDERS = 12
+
+
+def makespan(loads, speeds, times, assignment):
+    """
+    Time until the last order of the group is served
+    Parameters: loads (list of float) - current wait per counter,
+                speeds (list of float) - speed factor per counter,
+                times (list of float) - estimated time per order,
+                assignment (list of int) - counter position per order
+    Returns: float (0.0 for an empty group)
+    """
+    finish = list(loads)
+    for order, position in enumerate(assignment):
+        finish[position] += speeds[position] * times[order]
+    return max((finish[position] for position in set(assignment)), default=0.0)
+
+
+def greedy_assign(loads, speeds, times, eligible=None):
+    """
+    Place orders one at a time, in the given order, on the counter with
+    the shortest wait (what add_order does for single customers)
+    Returns: list of int - counter position per order
+    """
+    finish = list(loads)
+    everyone = range(len(finish))
+    assignment = []
+    for order, p in enumerate(times):
+        positions = everyone if eligible is None else eligible[order]
+        position = min(positions, key=finish.__getitem__)
+        finish[position] += speeds[position] * p
+        assignment.append(position)
+    return assignment
+
+
+def lpt_assign(loads, speeds, times, eligible=None):
+    """
+    Longest processing time first, with a heap of counter loads
+    O(n log n + n log m) for n orders and m counters; counters an order
+    cannot go to are popped and pushed back
+    Returns: list of int - counter position per order
+    """
+    heap = [(load, position) for position, load in enumerate(loads)]
+    heapq.heapify(heap)
+    assignment = [0] * len(times)
+    for order in sorted(range(len(times)), key=lambda i: -times[i]):
+        allowed = None if eligible is None else set(eligible[order])
+        skipped = []
+        load, position = heapq.heappop(heap)
+        while allowed is not None and position not in allowed:
+            skipped.append((load, position))
+            load, position = heapq.heappop(heap)
+        assignment[order] = position
+        heapq.heappush(heap, (load + speeds[position] * times[order], position))
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+    return assignment
+
+
+def exact_assign(loads, speeds, times, eligible=None):
+    """
+    Minimum-makespan assignment by branch and bound, seeded with LPT
+    Raises: ValueError for groups larger than EXACT_MAX_ORDERS
+    Returns: list of int - counter position per order
+    """
+    if len(times) > EXACT_MAX_ORDERS:
+        raise ValueError(f"exact assignment supports at most {EXACT_MAX_ORDERS} orders")
+    order = sorted(range(len(times)), key=lambda i: -times[i])
+    everyone = range(len(loads))
+    best = lpt_assign(loads, speeds, times, eligible)
+    best_span = [makespan(loads, speeds, times, best)]
+    finish = list(loads)
+    current = [0] * len(times)
+    # Orders each counter may take; counters only swap freely when equal
+    if eligible is None:
+        takes = [None] * len(loads)
+    else:
+        takes = [frozenset(job for job, allowed in enumerate(eligible)
+                           if position in allowed)
+                 for position in everyone]
+    
+    def search(depth, span):
+        if span >= best_span[0]:
+            return  # Cannot beat the best plan found so far
+        if depth == len(order):
+            best_span[0] = span
+            best[:] = current
+            return
+        job = order[depth]
+        positions = everyone if eligible is None else eligible[job]
+        tried = set()
+        for position in sorted(positions, key=finish.__getitem__):
+            # Counters with the same load, speed and eligible orders are
+            # interchangeable
+            key = (finish[position], speeds[position], takes[position])
+            if key in tried:
+                continue
+            tried.add(key)
+            start = finish[position]
+            end = start + speeds[position] * times[job]
+            finish[position] = end
+            current[job] = position
+            search(depth + 1, max(span, end))
+            finish[position] = start
+    
+    search(0, 0.0)
+    return best
+
+
+STRATEGIES = {
+    'greedy': greedy_assign,
+    'lpt': lpt_assign,
+    'exact': exact_assign,
+}
+
+
+def plan_group(loads, speeds, times, strategy='lpt', eligible=None):
+    """
+    Plan a group assignment
+    Parameters: loads, speeds, times (lists of float),
+                strategy (str) - 'lpt', 'exact' or 'greedy',
+                eligible (list of lists of int, optional) - counter
+                positions each order may go to
+    Returns: tuple (assignment list, predicted makespan)
+    """
+    try:
+        assign = STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(f"unknown strategy {strategy}") from None
+    assignment = assign(loads, speeds, times, eligible)
+    return assignment, makespan(loads, speeds, times, assignment)
@@ -0,0 +1,291 @@
+"""
+Service History Module
+======================
+Memory-mapped, append-only file of completed services
+
+Each finished service becomes one fixed-width binary record:
+
+    customer id, counter id, entry/start/finish timestamps,
+    complexity score, item count and up to MAX_ITEMS item codes
+
+Records are written straight into a memory-mapped file, and the reader
+scans them with struct.iter_unpack over a memoryview (no text parsing,
+no copies). If NumPy is installed, statistics are computed on a
+structured array view of the same memory instead.
+
+Item codes are 1-based positions in the menu the history was created
+with (0 = unused slot, OTHER_ITEM_CODE = item not on the menu). That menu
+is stored as a JSON list right after the header, so old records keep
+their meaning: reopening the file with a different menu is refused.
+
+Concepts Applied:
+- Binary file formats (struct)
+- Memory-mapped files (mmap)
+- Optional dependencies
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+
+from menu import DEFAULT_MENU_ITEMS
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+MAGIC = b"SCHIST02"
+MAX_ITEMS = 8
+OTHER_ITEM_CODE = 0xFFFF
+
+# magic, record size, record count, item table bytes (padded to 64 bytes)
+HEADER = struct.Struct("<8sIQI40x")
+# customer, counter, entry, start, finish, complexity, item count, items
+RECORD = struct.Struct(f"<qidddfH{MAX_ITEMS}H6x")
+
+# Grow the file by this many records at a time
+GROW_RECORDS = 16384
+
+
+def _encode_item_table(menu_items):
+    """
+    Item code table as JSON, padded with spaces so records stay 8-byte aligned
+    Parameter: menu_items (list of str)
+    Returns: bytes
+    """
+    table = json.dumps(list(menu_items)).encode('utf-8')
+    return table + b" " * (-len(table) % 8)
+
+
+def _read_header(buffer, path):
+    """
+    Check a history header and decode its item table
+    Parameters: buffer (mmap), path (str) - used in error messages
+    Returns: tuple (record count, menu items, table size in bytes)
+    Raises: ValueError if the buffer is not a service history file
+    """
+    if len(buffer) < HEADER.size:
+        raise ValueError(f"{path} is not a service history file")
+    magic, record_size, count, table_size = HEADER.unpack_from(buffer, 0)
+    if (magic != MAGIC or record_size != RECORD.size
+            or HEADER.size + table_size > len(buffer)):
+        raise ValueError(f"{path} is not a service history file")
+    try:
+        menu_items = json.loads(bytes(buffer[HEADER.size:HEADER.size + table_size]))
+    except ValueError as error:  # Includes JSON and UTF-8 decode errors
+        raise ValueError(f"{path} has a corrupt item table") from error
+    return count, menu_items, table_size
+
+
+class ServiceHistory:
+    """
+    Service History Class
+    Appends service records to a memory-mapped file
+    
+    Demonstrates: mmap, binary records, file growth
+    """
+    
+    def __init__(self, path, menu_items=None):
+        """
+        Open (or create) a history file for appending
+        A missing or empty file is initialised with the given menu (the
+        default menu if None); an existing file keeps its stored menu
+        
+        Parameters: path (str), menu_items (list of str, optional) - item
+                    code table
+        Raises: ValueError if the file is not a service history file, or
+                was written with a different menu than menu_items
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            table = _encode_item_table(
+                DEFAULT_MENU_ITEMS if menu_items is None else menu_items)
+            with open(path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, RECORD.size, 0, len(table)) + table)
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        try:
+            self.count, self.menu_items, self._table_size = _read_header(
+                self._map, path)
+            if menu_items is not None and list(menu_items) != self.menu_items:
+                raise ValueError(f"{path} was written with a different menu")
+        except ValueError:
+            self.close()
+            raise
+        self._data_offset = HEADER.size + self._table_size
+        self.item_codes = {item: code
+                           for code, item in enumerate(self.menu_items, 1)}
+    
+    def _ensure_capacity(self, records):
+        """
+        Grow the file and the mapping if needed (lock held)
+        Parameter: records (int) - total records that must fit
+        """
+        needed = self._data_offset + records * RECORD.size
+        if needed <= len(self._map):
+            return
+        size = self._data_offset + (records + GROW_RECORDS) * RECORD.size
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+    
+    def append(self, counter_id, customer, start_time, finish_time):
+        """
+        Record one completed service
+        Parameters: counter_id (int), customer (Customer),
+                    start_time (datetime), finish_time (datetime)
+        Returns: int - index of the record
+        """
+        codes = [self.item_codes.get(item, OTHER_ITEM_CODE)
+                 for item in customer.items[:MAX_ITEMS]]
+        codes += [0] * (MAX_ITEMS - len(codes))
+        with self._lock:
+            index = self.count
+            self._ensure_capacity(index + 1)
+            RECORD.pack_into(self._map, self._data_offset + index * RECORD.size,
+                             customer.customer_id, counter_id,
+                             customer.entry_time.timestamp(),
+                             start_time.timestamp(), finish_time.timestamp(),
+                             customer.complexity_score,
+                             min(len(customer.items), 0xFFFF), *codes)
+            # Publish the record only after it is fully written
+            self.count = index + 1
+            HEADER.pack_into(self._map, 0, MAGIC, RECORD.size, self.count,
+                             self._table_size)
+            return index
+    
+    def flush(self):
+        """Flush written records to disk"""
+        with self._lock:
+            self._map.flush()
+    
+    def close(self):
+        """Flush and close the file"""
+        with self._lock:
+            if not self._map.closed:
+                self._map.flush()
+                self._map.close()
+            if not self._file.closed:
+                self._file.close()
+
+
+class HistoryReader:
+    """
+    History Reader Class
+    Scans a service history file without parsing or copying
+    
+    Demonstrates: memoryview, struct.iter_unpack, optional NumPy
+    """
+    
+    def __init__(self, path):
+        """
+        Map a history file read-only
+        The stored item code table is available as menu_items
+        
+        Parameter: path (str)
+        Raises: ValueError if the file is not a service history file
+        """
+        self._file = open(path, 'rb')
+        if os.fstat(self._file.fileno()).st_size < HEADER.size:
+            self._file.close()  # Too short to map or to hold a header
+            raise ValueError(f"{path} is not a service history file")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.count, self.menu_items, table_size = _read_header(self._map, path)
+        except ValueError:
+            self.close()
+            raise
+        self._data_offset = HEADER.size + table_size
+    
+    def __len__(self):
+        """Number of records"""
+        return self.count
+    
+    def records_view(self):
+        """
+        Memoryview over the raw record bytes
+        Returns: memoryview
+        """
+        start = self._data_offset
+        return memoryview(self._map)[start:start + self.count * RECORD.size]
+    
+    def iter_records(self):
+        """
+        Iterate over records as tuples:
+        (customer_id, counter_id, entry, start, finish, complexity,
+         item_count, item code 1, ..., item code MAX_ITEMS)
+        """
+        return RECORD.iter_unpack(self.records_view())
+    
+    def counter_stats(self, use_numpy=True):
+        """
+        Per-counter statistics over every record
+        Parameter: use_numpy (bool) - use NumPy when it is installed
+        Returns: dictionary counter_id -> {'count', 'mean_service',
+                 'mean_wait', 'max_wait', 'mean_complexity'} (seconds)
+        """
+        if use_numpy and np is not None:
+            return self._counter_stats_numpy()
+        
+        totals = {}  # counter -> [count, service, wait, max wait, complexity]
+        for record in self.iter_records():
+            counter_id, entry, start, finish, complexity = (
+                record[1], record[2], record[3], record[4], record[5])
+            total = totals.get(counter_id)
+            if total is None:
+                total = totals[counter_id] = [0, 0.0, 0.0, 0.0, 0.0]
+            wait = start - entry
+            total[0] += 1
+            total[1] += finish - start
+            total[2] += wait
+            if wait > total[3]:
+                total[3] = wait
+            total[4] += complexity
+        return {counter_id: {'count': t[0],
+                             'mean_service': t[1] / t[0],
+                             'mean_wait': t[2] / t[0],
+                             'max_wait': t[3],
+                             'mean_complexity': t[4] / t[0]}
+                for counter_id, t in sorted(totals.items())}
+    
+    def _counter_stats_numpy(self):
+        """counter_stats computed on a structured NumPy view of the map"""
+        dtype = np.dtype({
+            'names': ['customer', 'counter', 'entry', 'start', 'finish',
+                      'complexity', 'item_count', 'items'],
+            'formats': ['<i8', '<i4', '<f8', '<f8', '<f8', '<f4', '<u2',
+                        ('<u2', (MAX_ITEMS,))],
+            'offsets': [0, 8, 12, 20, 28, 36, 40, 42],
+            'itemsize': RECORD.size,
+        })
+        records = np.frombuffer(self._map, dtype=dtype, count=self.count,
+                                offset=self._data_offset)
+        stats = {}
+        waits = records['start'] - records['entry']
+        services = records['finish'] - records['start']
+        for counter_id in np.unique(records['counter']):
+            mask = records['counter'] == counter_id
+            stats[int(counter_id)] = {
+                'count': int(mask.sum()),
+                'mean_service': float(services[mask].mean()),
+                'mean_wait': float(waits[mask].mean()),
+                'max_wait': float(waits[mask].max()),
+                'mean_complexity': float(records['complexity'][mask].mean()),
+            }
+        return stats
+    
+    def close(self):
+        """Unmap and close the file"""
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
@@ -3,14 +3,24 @@ Logging Module
 ==============
 Handles logging and error tracking for the system
 
+Two modes are available:
+- Direct (default): every entry is appended to the file straight away
+- Buffered: entries are queued in memory and written in batches by a
+  background thread, when the buffer fills up or a time limit passes
+
+Both modes support size-based rotation (system.log -> system.log.1 ...).
+
 Concepts Applied:
 - File I/O operations
 - Error handling
 - Logging patterns
+- Threads and synchronization
 """
 
+import atexit
 import os
-from datetime import datetime
+import threading
+import time
 
 
 class Logger:
@@ -21,16 +31,60 @@ class Logger:
     Demonstrates: File operations, error handling, logging
     """
     
-    def __init__(self, log_file="logs/system.log"):
+    def __init__(self, log_file="logs/system.log", buffered=False,
+                 flush_interval=1.0, max_buffer=256, max_bytes=None,
+                 backup_count=3):
         """
         Initialize logger
-        Parameter: log_file (str) - Path to log file
+        Parameters:
+        - log_file (str): Path to log file
+        - buffered (bool): Queue entries and flush them from a background thread
+        - flush_interval (float): Seconds between background flushes
+        - max_buffer (int): Flush early once this many entries are queued
+        - max_bytes (int or None): Rotate the file when it would exceed this size
+        - backup_count (int): Number of rotated files to keep
         """
         self.log_file = log_file
+        self.buffered = buffered
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        
         # Create logs directory if it doesn't exist
         log_dir = os.path.dirname(log_file)
         if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir)
+        
+        # Timestamp cache: strftime runs at most once per second
+        self._last_second = None
+        self._last_timestamp = ""
+        
+        self._lock = threading.Lock()          # Guards buffer and timestamp cache
+        self._write_lock = threading.Lock()    # Serializes file writes/rotation
+        self._buffer = []
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = None
+        if buffered:
+            self._thread = threading.Thread(target=self._flush_loop,
+                                            name="LoggerFlush", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+    
+    def _timestamp(self):
+        """
+        Get the current timestamp string, reusing it within the same second
+        Must be called with self._lock held
+        Returns: str
+        """
+        now = time.time()
+        second = int(now)
+        if second != self._last_second:
+            self._last_second = second
+            self._last_timestamp = time.strftime("%Y-%m-%d %H:%M:%S",
+                                                 time.localtime(now))
+        return self._last_timestamp
     
     def log(self, level, message):
         """
@@ -43,15 +97,114 @@ class Logger:
         Demonstrates: File writing, string formatting, error handling
         """
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            log_entry = f"[{timestamp}] [{level}] {message}\n"
-            
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
+            with self._lock:
+                log_entry = f"[{self._timestamp()}] [{level}] {message}\n"
+                if self.buffered and not self._closed:
+                    self._buffer.append(log_entry)
+                    if len(self._buffer) >= self.max_buffer:
+                        self._wakeup.set()
+                    return
+            self._write(log_entry)
         except Exception as e:
             # If logging fails, print to console
             print(f"Logging error: {e}")
     
+    def _write(self, text):
+        """
+        Append one entry to the log file, rotating it first if needed
+        Parameter: text (str)
+        """
+        with self._write_lock:
+            self._write_entries([text])
+    
+    def _write_entries(self, entries):
+        """
+        Append entries to the log file in order
+        Each entry is checked against max_bytes on its own, so a batch is
+        split across a rotation instead of overfilling the current file
+        Must be called with self._write_lock held
+        Parameter: entries (list of str)
+        """
+        if self.max_bytes is None:
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write("".join(entries))
+            return
+        try:
+            size = os.path.getsize(self.log_file)
+        except OSError:
+            size = 0  # No file yet
+        chunk = []
+        for entry in entries:
+            incoming = len(entry.encode('utf-8'))
+            if size and size + incoming > self.max_bytes:
+                if chunk:
+                    with open(self.log_file, 'a', encoding='utf-8') as f:
+                        f.write("".join(chunk))
+                    chunk = []
+                self._rotate()
+                size = 0
+            chunk.append(entry)
+            size += incoming
+        if chunk:
+            with open(self.log_file, 'a', encoding='utf-8') as f:
+                f.write("".join(chunk))
+    
+    def _rotate(self):
+        """
+        Rotate log files: system.log.2 -> system.log.3,
+        system.log.1 -> system.log.2, ..., system.log -> system.log.1
+        """
+        if not os.path.exists(self.log_file):
+            return
+        if self.backup_count <= 0:
+            os.remove(self.log_file)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.log_file}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.log_file}.{i + 1}")
+        os.replace(self.log_file, f"{self.log_file}.1")
+    
+    def flush(self):
+        """
+        Write all queued entries to the file now
+        The write lock is taken before the buffer is swapped, so concurrent
+        flushes write their batches in the order they were taken
+        
+        Demonstrates: Batch writing
+        """
+        with self._write_lock:
+            with self._lock:
+                pending, self._buffer = self._buffer, []
+            if pending:
+                try:
+                    self._write_entries(pending)
+                except Exception as e:
+                    print(f"Logging error: {e}")
+    
+    def _flush_loop(self):
+        """
+        Background thread: flush on a timer or when the buffer fills up
+        """
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+    
+    def close(self):
+        """
+        Stop the background thread and flush anything still queued
+        Safe to call more than once
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._wakeup.set()
+            self._thread.join()
+            atexit.unregister(self.close)
+        self.flush()
+    
     def info(self, message):
         """Log info message"""
         self.log("INFO", message)
@@ -63,4 +216,3 @@ class Logger:
     def warning(self, message):
         """Log warning message"""
         self.log("WARNING", message)
-
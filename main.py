@@ -23,7 +23,7 @@ def main():
         display.show_main_menu()
         
         try:
-            choice = input("\nEnter your choice (1-6): ").strip()
+            choice = input("\nEnter your choice (1-7): ").strip()
             
             if choice == '1':
                 # Add customer to queue
@@ -46,12 +46,16 @@ def main():
                 display.show_best_line_recommendation(system)
                 
             elif choice == '6':
+                # Live dashboard, redrawn in place until Ctrl+C
+                display.show_live_dashboard(system)
+                
+            elif choice == '7':
                 # Exit program
                 print("\nThank you for using Smart Canteen Queue Management System!")
                 print("Exiting...")
                 break
             else:
-                print("\n Invalid choice! Please enter a number between 1-6.")
+                print("\n Invalid choice! Please enter a number between 1-7.")
                 input("\nPress Enter to continue...")
                 
         except KeyboardInterrupt:
@@ -0,0 +1,138 @@
+"""
+Menu Module
+===========
+Item complexity catalogue for the canteen menu
+
+Every item costs 1 complexity point, plus a bonus from the first rule in
+COMPLEXITY_RULES whose keywords appear in the item name. Scores for the
+fixed menu are computed once when the catalogue is built; free-text items
+that are not on the menu are scored on demand and kept in a bounded cache.
+
+Concepts Applied:
+- Data-driven design (rule tables)
+- Dictionaries for constant-time lookup
+- Caching
+"""
+
+import threading
+from collections import OrderedDict
+
+
+# Base complexity of any single item
+BASE_ITEM_COMPLEXITY = 1
+
+# (keywords, extra complexity) - first matching rule wins
+COMPLEXITY_RULES = [
+    (('combo', 'special'), 2),      # Combos take more time
+    (('beverage', 'drink'), 0.5),   # Drinks are quick
+    (('dessert',), 1),              # Desserts need packaging
+]
+
+DEFAULT_MENU_ITEMS = [
+    "Rice & Curry", "Biryani", "Pasta", "Pizza Slice",
+    "Burger", "Sandwich", "Combo Meal", "Special Thali",
+    "Beverage", "Soft Drink", "Dessert", "Ice Cream"
+]
+
+# Menu categories, used by specialised counters (stations) to declare
+# what they serve, e.g. Counter(4, "Pizza Station", serves=["Pizza & Pasta"])
+MENU_CATEGORIES = {
+    "Meals": ("Rice & Curry", "Biryani", "Combo Meal", "Special Thali"),
+    "Pizza & Pasta": ("Pizza Slice", "Pasta"),
+    "Snacks": ("Burger", "Sandwich"),
+    "Beverages": ("Beverage", "Soft Drink"),
+    "Desserts": ("Dessert", "Ice Cream"),
+}
+
+
+def expand_categories(names, categories=MENU_CATEGORIES):
+    """
+    Turn a list of item and category names into the set of items it covers
+    Parameters: names (iterable of str) - items and/or categories,
+                categories (dict) - category name -> items
+    Returns: frozenset of item names
+    """
+    items = set()
+    for name in names:
+        items.update(categories.get(name, (name,)))
+    return frozenset(items)
+
+
+def score_item(item, rules=COMPLEXITY_RULES):
+    """
+    Calculate the complexity score of one item from the rule table
+    Parameters: item (str), rules (list of (keywords, bonus) tuples)
+    Returns: float or int - complexity of the item
+    
+    Demonstrates: Data-driven conditional logic
+    """
+    item_lower = item.lower()
+    for keywords, bonus in rules:
+        for keyword in keywords:
+            if keyword in item_lower:
+                return BASE_ITEM_COMPLEXITY + bonus
+    return BASE_ITEM_COMPLEXITY
+
+
+class ComplexityCatalogue:
+    """
+    Complexity Catalogue Class
+    Maps item names to precomputed complexity scores
+    
+    Thread-safe: menu items are read lock-free from a dictionary that
+    never changes; the free-text cache is guarded by a lock
+    
+    Demonstrates: Precomputation, bounded (LRU) cache
+    """
+    
+    def __init__(self, menu_items=DEFAULT_MENU_ITEMS, rules=COMPLEXITY_RULES,
+                 cache_size=1024):
+        """
+        Compile the catalogue
+        Parameters: menu_items (list of str), rules (list of rule tuples),
+                    cache_size (int) - max free-text items remembered
+        """
+        self.rules = list(rules)
+        self.cache_size = cache_size
+        self.scores = {item: score_item(item, self.rules) for item in menu_items}
+        self._cache = OrderedDict()  # Free-text items, least recently used first
+        self._cache_lock = threading.Lock()
+    
+    def score(self, item):
+        """
+        Look up the complexity score of one item
+        Parameter: item (str)
+        Returns: float or int
+        """
+        score = self.scores.get(item)
+        if score is not None:
+            return score
+        
+        with self._cache_lock:
+            score = self._cache.get(item)
+            if score is not None:
+                self._cache.move_to_end(item)
+                return score
+        
+        score = score_item(item, self.rules)
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._cache[item] = score
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return score
+    
+    def order_complexity(self, items):
+        """
+        Total complexity score of an order
+        Parameter: items (list of str)
+        Returns: float or int
+        """
+        complexity = 0
+        for item in items:
+            complexity += self.score(item)
+        return complexity
+
+
+# Shared catalogue for the standard menu
+default_catalogue = ComplexityCatalogue()
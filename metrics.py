@@ -0,0 +1,308 @@
+"""
+Metrics Module
+==============
+Lightweight built-in metrics: operation latencies, realized waits and
+gauges, readable as a snapshot dictionary or in Prometheus text format
+
+Latencies and waits go into log-linear histograms: every power of two
+between the lowest and highest value is split into a few equal-width
+buckets, so the relative error of a percentile is bounded (25% with the
+default 4 sub-buckets) while a histogram stays a short list of ints.
+Buckets are allocated once; observe() is a frexp, an index computation
+and a few updates under the histogram's own lock, with no per-call
+allocation. (A += on a list item or attribute is a load, an add and a
+store, so without the lock concurrent kiosks would lose counts.)
+
+Gauges (queue lengths, seat occupancy, ...) are read from callbacks only
+when a snapshot is taken, so they cost nothing on the hot paths.
+
+Metrics are opt-in: QueueSystem.enable_metrics() hands one Metrics object
+to the system, its counters and the seat manager. While they are off (the
+default, or after disable_metrics()) each hot path only pays for one
+"is not None" check.
+
+Concepts Applied:
+- Histograms and percentiles
+- Floating point representation (frexp)
+- Text serialization (Prometheus exposition format)
+"""
+
+import math
+import threading
+
+
+# Operation latencies: 1 microsecond to about a minute
+LATENCY_LOWEST = 1e-6
+LATENCY_HIGHEST = 60.0
+
+# Realized customer waits: 1 second to about 4.5 hours
+WAIT_LOWEST = 1.0
+WAIT_HIGHEST = 4.5 * 3600
+
+SUB_BUCKETS = 4
+
+# Operations timed by the queue system
+OPERATIONS = ('add', 'serve', 'finish', 'recommend', 'seat_assign')
+
+# Events counted by the queue system
+EVENTS = ('serve_empty', 'seat_unavailable')
+
+
+class Histogram:
+    """
+    Histogram Class
+    Log-linear histogram with preallocated buckets
+    
+    Bucket 0 holds values below lowest, the last bucket values of highest
+    and above; the others cover [lowest * 2**e * (1 + j/sub),
+    lowest * 2**e * (1 + (j+1)/sub)) for each power e and sub-bucket j.
+    
+    Thread-safe: updates and snapshots take a per-histogram lock.
+    
+    Demonstrates: Bucketing, constant-time updates
+    """
+    
+    def __init__(self, lowest, highest, sub_buckets=SUB_BUCKETS):
+        """
+        Initialize an empty histogram
+        Parameters: lowest (float) - smallest value resolved (> 0),
+                    highest (float) - values from here on share one bucket,
+                    sub_buckets (int) - buckets per power of two
+        """
+        self.lowest = lowest
+        self.sub_buckets = sub_buckets
+        self.powers = max(1, math.ceil(math.log2(highest / lowest)))
+        # Upper bound of every bucket, the last one unbounded
+        self.bounds = [lowest]
+        for power in range(self.powers):
+            for step in range(1, sub_buckets + 1):
+                self.bounds.append(lowest * 2 ** power * (1 + step / sub_buckets))
+        self.bounds.append(math.inf)
+        self.counts = [0] * len(self.bounds)
+        self.total = 0.0
+        self.max = 0.0
+        self._scale = 1.0 / lowest
+        self._last = len(self.bounds) - 1
+        self._lock = threading.Lock()
+    
+    @property
+    def count(self):
+        """Number of values recorded"""
+        return sum(self.counts)
+    
+    def observe(self, value):
+        """
+        Record one value
+        The bucket index is computed outside the lock; the lock only
+        covers the three read-modify-write updates
+        Parameter: value (float)
+        """
+        if value < self.lowest:
+            index = 0
+        else:
+            mantissa, exponent = math.frexp(value * self._scale)
+            index = (exponent - 1) * self.sub_buckets + int((2 * mantissa - 1) * self.sub_buckets) + 1
+            if index > self._last:
+                index = self._last
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+    
+    def _read(self):
+        """
+        Consistent copy of the bucket counts, sum and maximum
+        Returns: tuple (list of int, float, float)
+        """
+        with self._lock:
+            return list(self.counts), self.total, self.max
+    
+    def quantile(self, q, counts=None):
+        """
+        Upper bound of the bucket holding the q-th quantile, capped at
+        the largest value seen
+        Parameters: q (float) - 0 to 1, counts (list, optional) - bucket
+                    counts to use instead of the live ones
+        Returns: float, or 0.0 when empty
+        """
+        if counts is None:
+            counts, _, highest = self._read()
+        else:
+            highest = self.max
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank = max(1, math.ceil(q * total))
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return min(self.bounds[index], highest)
+        return highest
+    
+    def snapshot(self):
+        """
+        Summary of the histogram
+        Returns: dictionary with count, sum, mean, p50, p90, p99 and max
+        """
+        counts, total, highest = self._read()
+        count = sum(counts)
+        return {
+            'count': count,
+            'sum': total,
+            'mean': total / count if count else 0.0,
+            'p50': self.quantile(0.50, counts),
+            'p90': self.quantile(0.90, counts),
+            'p99': self.quantile(0.99, counts),
+            'max': highest,
+        }
+    
+    def cumulative(self, counts=None):
+        """
+        Cumulative bucket counts, as in the Prometheus format
+        Parameter: counts (list, optional) - bucket counts to use instead
+                   of the live ones
+        Returns: list of (upper bound, count of values <= bound) tuples
+        """
+        if counts is None:
+            counts = self._read()[0]
+        result = []
+        seen = 0
+        for bound, count in zip(self.bounds, counts):
+            seen += count
+            result.append((bound, seen))
+        return result
+
+
+def _format_value(value):
+    """Number in Prometheus notation"""
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels):
+    """Label set in Prometheus notation, e.g. {counter="1"}"""
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metrics:
+    """
+    Metrics Class
+    Registry of the queue system's histograms, event counts and gauges
+    
+    Demonstrates: Instrumentation, callbacks
+    """
+    
+    def __init__(self, prefix="canteen"):
+        """
+        Initialize empty metrics
+        Parameter: prefix (str) - name prefix used in Prometheus output
+        """
+        self.prefix = prefix
+        self.operations = {op: Histogram(LATENCY_LOWEST, LATENCY_HIGHEST)
+                           for op in OPERATIONS}
+        self.waits = Histogram(WAIT_LOWEST, WAIT_HIGHEST)
+        self.events = dict.fromkeys(EVENTS, 0)
+        self._events_lock = threading.Lock()
+        self._gauges = {}  # name -> (help text, callback)
+    
+    def count(self, event):
+        """
+        Count one event
+        Parameter: event (str) - one of EVENTS
+        """
+        with self._events_lock:
+            self.events[event] += 1
+    
+    def add_gauge(self, name, help_text, callback):
+        """
+        Register a gauge read at snapshot time
+        Parameters: name (str), help_text (str),
+                    callback - returns a number, or a dictionary mapping
+                    label tuples like (('counter', 1),) to numbers
+        """
+        self._gauges[name] = (help_text, callback)
+    
+    def _gauge_values(self):
+        """Current value(s) of every gauge: name -> {labels: value}"""
+        values = {}
+        for name, (_, callback) in self._gauges.items():
+            value = callback()
+            values[name] = value if isinstance(value, dict) else {(): value}
+        return values
+    
+    def snapshot(self):
+        """
+        Current values of every metric
+        Returns: dictionary with 'operations' (op -> latency summary in
+                 seconds), 'waits' (summary in seconds), 'events' and
+                 'gauges' (name -> value, or {label value: value})
+        """
+        with self._events_lock:
+            events = dict(self.events)
+        gauges = {}
+        for name, values in self._gauge_values().items():
+            if list(values) == [()]:
+                gauges[name] = values[()]
+            else:
+                gauges[name] = {labels[0][1] if len(labels) == 1 else labels: value
+                                for labels, value in values.items()}
+        return {
+            'operations': {op: histogram.snapshot()
+                           for op, histogram in self.operations.items()},
+            'waits': self.waits.snapshot(),
+            'events': events,
+            'gauges': gauges,
+        }
+    
+    def _histogram_lines(self, name, histogram, labels=()):
+        """Prometheus lines of one histogram"""
+        lines = []
+        counts, total, _ = histogram._read()
+        buckets = histogram.cumulative(counts)
+        for bound, seen in buckets:
+            bucket_labels = labels + (('le', _format_value(bound)),)
+            lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {seen}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {buckets[-1][1]}")
+        return lines
+    
+    def prometheus_text(self):
+        """
+        Every metric in the Prometheus text exposition format (0.0.4)
+        Returns: str
+        """
+        prefix = self.prefix
+        lines = []
+        name = f"{prefix}_operation_seconds"
+        lines.append(f"# HELP {name} Latency of queue system operations")
+        lines.append(f"# TYPE {name} histogram")
+        for op, histogram in self.operations.items():
+            lines.extend(self._histogram_lines(name, histogram, (('op', op),)))
+        name = f"{prefix}_wait_seconds"
+        lines.append(f"# HELP {name} Time customers waited before being served")
+        lines.append(f"# TYPE {name} histogram")
+        lines.extend(self._histogram_lines(name, self.waits))
+        name = f"{prefix}_events_total"
+        lines.append(f"# HELP {name} Operations that found nothing to do")
+        lines.append(f"# TYPE {name} counter")
+        with self._events_lock:
+            events = dict(self.events)
+        for event, value in events.items():
+            lines.append(f"{name}{_format_labels((('event', event),))} {value}")
+        values = self._gauge_values()
+        for gauge, (help_text, _) in self._gauges.items():
+            name = f"{prefix}_{gauge}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in values[gauge].items():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
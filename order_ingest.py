@@ -0,0 +1,84 @@
+"""
+Order Ingestion Module
+======================
+Streaming readers for bulk order feeds (kiosks, mobile pre-orders)
+
+Every reader is a generator that yields one order dictionary at a time
+({'name': str, 'items': list of str}), so files of any size can be fed to
+QueueSystem.ingest_orders without loading them into memory.
+
+Concepts Applied:
+- File I/O operations
+- Generators
+- Error handling
+"""
+
+import csv
+import json
+import os
+
+
+# Separator for items inside a single CSV field, e.g. "Burger;Soft Drink"
+CSV_ITEM_SEPARATOR = ';'
+
+
+def read_jsonl_orders(path):
+    """
+    Stream orders from a JSON Lines file
+    Each line is an object like {"name": "Asha", "items": ["Burger"]}
+    
+    Parameter: path (str) - path to the .jsonl file
+    Yields: dict - one order per non-empty line
+    Raises: ValueError if a line is not valid JSON, is not an object, or
+            its "items" is not a list of strings
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                order = json.loads(line)
+            except json.JSONDecodeError as error:
+                raise ValueError(
+                    f"{path}:{line_number}: invalid order ({error})") from error
+            if not isinstance(order, dict):
+                raise ValueError(
+                    f"{path}:{line_number}: order must be a JSON object")
+            items = order.get('items', [])
+            if (not isinstance(items, list)
+                    or not all(isinstance(item, str) for item in items)):
+                raise ValueError(
+                    f"{path}:{line_number}: items must be a list of strings")
+            yield {'name': order.get('name', ''), 'items': items}
+
+
+def read_csv_orders(path):
+    """
+    Stream orders from a CSV file with a header row
+    Columns: name, items (items separated by CSV_ITEM_SEPARATOR)
+    
+    Parameter: path (str) - path to the .csv file
+    Yields: dict - one order per row
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            items = [item.strip()
+                     for item in (row.get('items') or '').split(CSV_ITEM_SEPARATOR)
+                     if item.strip()]
+            yield {'name': (row.get('name') or '').strip(), 'items': items}
+
+
+def read_orders(path):
+    """
+    Stream orders from a file, choosing the reader by file extension
+    Parameter: path (str) - .jsonl or .csv file
+    Yields: dict - one order at a time
+    Raises: ValueError for unsupported file types
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.jsonl', '.ndjson'):
+        return read_jsonl_orders(path)
+    if extension == '.csv':
+        return read_csv_orders(path)
+    raise ValueError(f"Unsupported order file type: {extension}")
@@ -0,0 +1,423 @@
+"""
+Persistence Module
+==================
+Write-ahead journal and snapshots for crash-safe, fast restart
+
+Every add/start/finish/seat event is appended to a journal (JSON lines)
+before control returns to the caller. The file is fsync'ed in batches,
+so at most a few milliseconds of events can be lost in a crash.
+
+A checkpoint writes a compact snapshot of the whole QueueSystem and
+starts a new journal segment; segments fully covered by the snapshot are
+deleted. On restart the latest snapshot is loaded and only the journal
+tail after it is replayed.
+
+Checkpoints do not stop the world. Each counter (and the seat manager)
+is copied under its own lock together with the journal sequence number
+at that moment, and replay skips events the copy already contains.
+
+Directory layout:
+    snapshot.json                  - latest snapshot
+    journal-<first seq>.jsonl      - journal segments
+
+Concepts Applied:
+- File I/O operations (append, fsync, atomic rename)
+- Serialization (JSON)
+- Threads and synchronization
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from priority_lanes import WALK_IN
+from queue_system import Counter, Customer, QueueSystem, SeatManager
+
+
+SNAPSHOT_FILE = "snapshot.json"
+JOURNAL_PREFIX = "journal-"
+JOURNAL_SUFFIX = ".jsonl"
+
+
+def _segment_name(first_seq):
+    """File name of the journal segment starting at a sequence number"""
+    return f"{JOURNAL_PREFIX}{first_seq:012d}{JOURNAL_SUFFIX}"
+
+
+def _list_segments(directory):
+    """
+    Journal segments in a directory, oldest first
+    Returns: list of (first seq, path) tuples
+    """
+    segments = []
+    for name in os.listdir(directory):
+        if name.startswith(JOURNAL_PREFIX) and name.endswith(JOURNAL_SUFFIX):
+            first = int(name[len(JOURNAL_PREFIX):-len(JOURNAL_SUFFIX)])
+            segments.append((first, os.path.join(directory, name)))
+    return sorted(segments)
+
+
+class Journal:
+    """
+    Journal Class
+    Append-only event log with batched fsync
+    
+    Demonstrates: Write-ahead logging, batching
+    """
+    
+    def __init__(self, directory, next_seq=1, fsync_batch=64, fsync_interval=0.05):
+        """
+        Open a new journal segment
+        Parameters: directory (str), next_seq (int) - first sequence number,
+                    fsync_batch (int) - fsync after this many events,
+                    fsync_interval (float) - or once this many seconds passed
+        """
+        self.directory = directory
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.last_seq = next_seq - 1
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(os.path.join(directory, _segment_name(next_seq)),
+                          'a', encoding='utf-8')
+    
+    def record(self, op, counter_id=None, customer=None, count=None, when=None,
+               seats=None):
+        """
+        Append one event
+        Parameters: op (str) - 'add', 'start', 'finish', 'leave', 'move_in',
+                    'occupy' or 'free',
+                    counter_id (int), customer (Customer), count (int),
+                    when (datetime) - time of a 'start' or 'finish',
+                    seats (list of (table, position)) - seats taken or freed
+        Returns: int - sequence number of the event
+        """
+        event = {'op': op}
+        if counter_id is not None:
+            event['counter'] = counter_id
+        if customer is not None:
+            event['id'] = customer.customer_id
+            if op in ('add', 'move_in'):
+                event.update(customer_to_dict(customer))
+        if count is not None:
+            event['count'] = count
+        if when is not None:
+            event['t'] = when.timestamp()
+        if seats is not None:
+            event['seats'] = seats
+        
+        with self._lock:
+            self.last_seq += 1
+            event['seq'] = self.last_seq
+            self._file.write(json.dumps(event, separators=(',', ':')) + "\n")
+            self._pending += 1
+            if (self._pending >= self.fsync_batch
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync_locked()
+            return self.last_seq
+    
+    def _sync_locked(self):
+        """Flush and fsync the current segment (journal lock held)"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+    
+    def sync(self):
+        """Force every recorded event to disk"""
+        with self._lock:
+            self._sync_locked()
+    
+    def rotate(self):
+        """
+        Close the current segment and start a new one
+        Returns: int - last sequence number in the closed segment
+        """
+        with self._lock:
+            self._sync_locked()
+            self._file.close()
+            self._file = open(os.path.join(self.directory,
+                                           _segment_name(self.last_seq + 1)),
+                              'a', encoding='utf-8')
+            return self.last_seq
+    
+    def close(self):
+        """Sync and close the journal"""
+        with self._lock:
+            if not self._file.closed:
+                self._sync_locked()
+                self._file.close()
+
+
+def customer_to_dict(customer):
+    """Serializable fields of a customer"""
+    return {
+        'name': customer.name,
+        'items': customer.items,
+        'entry': customer.entry_time.timestamp(),
+        'complexity': customer.complexity_score,
+        'estimate': customer.serving_estimate,
+        'priority': customer.priority,
+    }
+
+
+def customer_from_dict(customer_id, data):
+    """Rebuild a customer from customer_to_dict output"""
+    return Customer.from_record(customer_id, data['name'], list(data['items']),
+                                datetime.fromtimestamp(data['entry']),
+                                data['complexity'], data.get('estimate'),
+                                data.get('priority', WALK_IN))
+
+
+def take_snapshot(system, journal):
+    """
+    Copy the state of a QueueSystem, one counter at a time
+    Parameters: system (QueueSystem), journal (Journal)
+    Returns: dict - JSON-serializable snapshot
+    """
+    counters = []
+    for counter in system.counters:
+        with counter.lock:
+            serving = None
+            if counter.serving_customer is not None:
+                serving = dict(customer_to_dict(counter.serving_customer),
+                               id=counter.serving_customer.customer_id,
+                               start=counter.serving_start_time.timestamp())
+            counters.append({
+                'counter_id': counter.counter_id,
+                'name': counter.name,
+                'serves': sorted(counter.serves) if counter.serves is not None else None,
+                'seq': journal.last_seq,
+                'queue': [dict(customer_to_dict(c), id=c.customer_id)
+                          for c in counter.queue],
+                'serving': serving,
+            })
+    seat_manager = system.seat_manager
+    with seat_manager.lock:
+        seats = {'total': seat_manager.total_seats,
+                 'occupied': seat_manager.occupied_seats,
+                 'layout': seat_manager.layout,
+                 'taken': list(seat_manager.index.taken),
+                 'seq': journal.last_seq}
+    with system._id_lock:
+        next_customer_id = system.next_customer_id
+    return {'next_customer_id': next_customer_id, 'counters': counters,
+            'seats': seats}
+
+
+def write_snapshot(snapshot, directory):
+    """
+    Write a snapshot atomically (temp file, fsync, rename)
+    Parameters: snapshot (dict), directory (str)
+    """
+    path = os.path.join(directory, SNAPSHOT_FILE)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def restore_snapshot(snapshot, clock=None):
+    """
+    Build a QueueSystem from a snapshot
+    Parameters: snapshot (dict), clock (optional)
+    Returns: tuple (QueueSystem, dict of counter_id -> seq, seat seq)
+    """
+    counters = [Counter(c['counter_id'], c['name'], serves=c.get('serves'))
+                for c in snapshot['counters']]
+    system = QueueSystem(counters, clock=clock)
+    counter_seq = {}
+    for counter, data in zip(counters, snapshot['counters']):
+        counter_seq[counter.counter_id] = data['seq']
+        for queued in data['queue']:
+            counter.add_customer(customer_from_dict(queued['id'], queued), verbose=False)
+        serving = data['serving']
+        if serving is not None:
+            customer = customer_from_dict(serving['id'], serving)
+            counter.add_customer(customer, verbose=False)
+            counter._restore_serving(customer.customer_id,
+                                     datetime.fromtimestamp(serving['start']))
+    seats = snapshot['seats']
+    if 'layout' in seats:
+        system.replace_seat_manager(
+            SeatManager(0, layout=[tuple(t) for t in seats['layout']]))
+        system.seat_manager.index.load(seats['taken'])
+    else:
+        # Snapshot from before seat-level tracking
+        system.replace_seat_manager(SeatManager(seats['total']))
+        system.seat_manager.occupy_seat(seats['occupied'])
+    system.next_customer_id = snapshot['next_customer_id']
+    return system, counter_seq, snapshot['seats']['seq']
+
+
+def recover(directory, clock=None, default_system=None):
+    """
+    Rebuild a QueueSystem from the latest snapshot plus the journal tail
+    
+    Parameters: directory (str), clock (optional) - time source for the
+                recovered system, default_system (QueueSystem, optional) -
+                starting point when there is no snapshot yet
+    Returns: tuple (QueueSystem, int) - the system and the last sequence
+             number found in the journal
+    
+    Demonstrates: Crash recovery by replay
+    """
+    snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            system, counter_seq, seat_seq = restore_snapshot(json.load(f), clock)
+    else:
+        system = default_system if default_system is not None else QueueSystem(clock=clock)
+        counter_seq, seat_seq = {}, 0
+    
+    counters = {counter.counter_id: counter for counter in system.counters}
+    last_seq = max([seat_seq] + list(counter_seq.values()))
+    next_id = system.next_customer_id
+    
+    for _, path in (_list_segments(directory) if os.path.isdir(directory) else []):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    break  # Torn write at the end of the journal after a crash
+                last_seq = max(last_seq, event['seq'])
+                op = event['op']
+                if op in ('occupy', 'free'):
+                    if event['seq'] <= seat_seq:
+                        continue
+                    seats = [tuple(seat) for seat in event.get('seats', ())]
+                    if op == 'occupy' and seats:
+                        system.seat_manager.mark_occupied(seats)
+                    elif op == 'occupy':
+                        system.seat_manager.occupy_seat(event['count'])
+                    elif seats:
+                        system.seat_manager.release_seats(seats)
+                    else:
+                        system.seat_manager.free_seat(event['count'])
+                    continue
+                
+                counter = counters.get(event['counter'])
+                if counter is None or event['seq'] <= counter_seq.get(counter.counter_id, 0):
+                    continue
+                if op == 'add':
+                    counter.add_customer(customer_from_dict(event['id'], event),
+                                         verbose=False)
+                    next_id = max(next_id, event['id'] + 1)
+                elif op == 'move_in':
+                    with counter.lock:
+                        counter._insert_by_entry_locked(customer_from_dict(event['id'], event))
+                    counter._notify_change()
+                elif op == 'leave':
+                    found = system.find_customer(event['id'])
+                    if found is not None and found[1] is counter:
+                        counter.remove_customer(found[0])
+                    else:
+                        # Moved while the snapshot was taken, so another
+                        # counter holds a copy too: remove this one's own
+                        with counter.lock:
+                            customer = next((c for c in counter.queue
+                                             if c.customer_id == event['id']), None)
+                        if customer is not None:
+                            counter.remove_customer(customer)
+                elif op == 'start':
+                    counter._restore_serving(event['id'],
+                                             datetime.fromtimestamp(event['t']))
+                elif op == 'finish':
+                    counter._restore_finish()
+    
+    system.next_customer_id = next_id
+    # Dining schedules are not journaled: give every taken seat a fresh one
+    system.seat_release.adopt_occupied()
+    return system, last_seq
+
+
+class Persistence:
+    """
+    Persistence Class
+    Journals a QueueSystem and checkpoints it periodically
+    
+    Typical use:
+        system, persistence = Persistence.open("data")
+        ... use system normally ...
+        persistence.close()
+    
+    Demonstrates: Composition, background maintenance
+    """
+    
+    def __init__(self, system, directory, next_seq=1, checkpoint_every=2000,
+                 checkpoint_interval=1.0, **journal_options):
+        """
+        Start journaling a system
+        Parameters: system (QueueSystem), directory (str),
+                    next_seq (int) - first journal sequence number,
+                    checkpoint_every (int) - events between checkpoints,
+                    checkpoint_interval (float) - seconds between checks
+                    (None disables background checkpoints),
+                    journal_options - passed to Journal
+        """
+        self.system = system
+        self.directory = directory
+        self.checkpoint_every = checkpoint_every
+        self.journal = Journal(directory, next_seq, **journal_options)
+        self._checkpoint_seq = next_seq - 1
+        self._checkpoint_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        system.attach_journal(self.journal)
+        if checkpoint_interval is not None:
+            self._thread = threading.Thread(target=self._checkpoint_loop,
+                                            args=(checkpoint_interval,),
+                                            name="Checkpointer", daemon=True)
+            self._thread.start()
+    
+    @classmethod
+    def open(cls, directory, clock=None, default_system=None, **options):
+        """
+        Recover a system from a directory (empty or missing is fine) and
+        keep journaling it
+        Parameters: directory (str), clock (optional),
+                    default_system (QueueSystem, optional) - used when the
+                    directory has no snapshot yet, e.g. a custom layout,
+                    options - see __init__
+        Returns: tuple (QueueSystem, Persistence)
+        """
+        system, last_seq = recover(directory, clock, default_system)
+        persistence = cls(system, directory, last_seq + 1, **options)
+        persistence.checkpoint()  # Start from a compact state
+        return system, persistence
+    
+    def checkpoint(self):
+        """
+        Write a snapshot and delete journal segments it fully covers
+        Returns: int - sequence number up to which the journal was compacted
+        """
+        with self._checkpoint_lock:
+            covered = self.journal.rotate()
+            write_snapshot(take_snapshot(self.system, self.journal), self.directory)
+            for first_seq, path in _list_segments(self.directory):
+                if first_seq <= covered:
+                    os.remove(path)
+            self._checkpoint_seq = covered
+            return covered
+    
+    def _checkpoint_loop(self, interval):
+        """Background thread: checkpoint once enough events piled up"""
+        while not self._stop.wait(interval):
+            if self.journal.last_seq - self._checkpoint_seq >= self.checkpoint_every:
+                self.checkpoint()
+    
+    def close(self):
+        """Stop the background thread, checkpoint and close the journal"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.checkpoint()
+        self.journal.close()
+        self.system.attach_journal(None)
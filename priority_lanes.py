@@ -0,0 +1,355 @@
+"""
+Priority Lanes Module
+=====================
+Multi-level queue for a counter: faculty, pre-paid app orders, walk-ins
+
+Every priority class has its own FIFO lane (a CustomerQueue). Lanes share
+the counter by weight instead of strict priority, so walk-ins keep moving
+while faculty and pre-paid orders are busy (stride scheduling):
+
+- each lane has a pass value; the next customer comes from the non-empty
+  lane with the lowest pass (ties go to the higher class), and serving a
+  customer adds serving time / weight to their lane's pass
+- a lane that was empty starts again from the pass of the last customer
+  served, so idle time cannot be saved up
+- aging: a customer at the front of a lane who has waited longer than
+  max_wait is promoted and served first (the longest waiting first)
+
+Choosing the next customer looks at one head per lane, so serve_next
+stays O(1). The same passes give class-aware waits: a customer with w
+seconds of their own lane ahead starts at pass p + w / weight, and from
+every other lane only the work whose pass comes first is served before
+them. New arrivals are not foreseen, so waits are estimates.
+
+Concepts Applied:
+- Multi-level queues with weighted sharing (stride scheduling)
+- Aging to prevent starvation
+- Queueing estimates
+"""
+
+from datetime import timedelta
+
+from customer_queue import CustomerQueue
+
+
+# Priority classes, highest first; customers are walk-ins unless stated
+FACULTY = 'faculty'
+PREPAID = 'prepaid'
+WALK_IN = 'walk_in'
+PRIORITY_CLASSES = (FACULTY, PREPAID, WALK_IN)
+PRIORITY_INDEX = {name: index for index, name in enumerate(PRIORITY_CLASSES)}
+
+# Share of the counter each class gets while several lanes are waiting
+DEFAULT_WEIGHTS = {FACULTY: 4.0, PREPAID: 2.0, WALK_IN: 1.0}
+
+# Seconds after which the customer at the front of a lane is promoted
+DEFAULT_MAX_WAIT = 300.0
+
+
+class PriorityPolicy:
+    """
+    Priority Policy Class
+    Lane weights and aging limit shared by the counters using it
+    
+    Demonstrates: Configuration objects
+    """
+    
+    def __init__(self, weights=None, max_wait=DEFAULT_MAX_WAIT):
+        """
+        Parameters: weights (dict, optional) - class -> weight (> 0),
+                    merged over DEFAULT_WEIGHTS,
+                    max_wait (float or None) - seconds after which the
+                    front customer of a lane is served first; None
+                    disables aging
+        Raises: ValueError for an unknown class or a weight <= 0
+        """
+        merged = dict(DEFAULT_WEIGHTS)
+        for name, weight in (weights or {}).items():
+            if name not in PRIORITY_INDEX:
+                raise ValueError(f"unknown priority class {name!r}")
+            if weight <= 0:
+                raise ValueError("priority weights must be positive")
+            merged[name] = float(weight)
+        self.weights = [merged[name] for name in PRIORITY_CLASSES]  # By lane
+        self.max_wait = max_wait
+        self._max_wait_delta = (timedelta(seconds=max_wait)
+                                if max_wait is not None else None)
+
+
+DEFAULT_POLICY = PriorityPolicy()
+
+
+def check_priority(priority):
+    """
+    Validate a priority class name
+    Parameter: priority (str)
+    Raises: ValueError if it is not one of PRIORITY_CLASSES
+    Returns: str - the priority
+    """
+    if not isinstance(priority, str) or priority not in PRIORITY_INDEX:
+        raise ValueError(f"priority must be one of {', '.join(PRIORITY_CLASSES)}")
+    return priority
+
+
+class LaneQueue:
+    """
+    Lane Queue Class
+    A counter's waiting line, one CustomerQueue lane per priority class
+    
+    Offers the queue operations the counters use (append, popleft, pop,
+    remove, insert_by_entry, indexing, len, iteration in lane order).
+    Not thread-safe; the owning counter's lock guards it.
+    
+    Demonstrates: Multi-level queues, weighted scheduling
+    """
+    
+    def __init__(self, owner=None, policy=None, registry=None):
+        """
+        Create empty lanes
+        Parameters: owner (optional) - the counter this queue belongs to,
+                    policy (PriorityPolicy, optional) - defaults to
+                    DEFAULT_POLICY,
+                    registry (dict, optional) - customer_id -> Customer of
+                    every waiting customer, shared between queues
+        """
+        self.owner = owner
+        self.policy = policy if policy is not None else DEFAULT_POLICY
+        self._lanes = [CustomerQueue(owner=owner, registry=registry)
+                       for _ in PRIORITY_CLASSES]
+        self._pass = [0.0] * len(PRIORITY_CLASSES)
+        self._virtual = 0.0  # Pass of the last customer served
+        self._length = 0
+    
+    @property
+    def registry(self):
+        """Registry of waiting customers shared by the lanes"""
+        return self._lanes[0].registry
+    
+    @registry.setter
+    def registry(self, registry):
+        for lane in self._lanes:
+            lane.registry = registry
+    
+    def lane(self, priority):
+        """
+        The lane of a priority class
+        Parameter: priority (str)
+        Returns: CustomerQueue
+        """
+        return self._lanes[PRIORITY_INDEX[priority]]
+    
+    def _lane_index(self, customer):
+        """Lane index of a customer's class"""
+        return PRIORITY_INDEX[customer.priority]
+    
+    def append(self, customer):
+        """
+        Add a customer at the back of their class's lane (amortised O(1))
+        Parameter: customer (Customer object)
+        """
+        index = self._lane_index(customer)
+        lane = self._lanes[index]
+        if not lane and self._pass[index] < self._virtual:
+            self._pass[index] = self._virtual
+        lane.append(customer)
+        self._length += 1
+    
+    def insert_by_entry(self, customer):
+        """
+        Add a customer to their class's lane in entry time order
+        Parameter: customer (Customer object)
+        """
+        index = self._lane_index(customer)
+        lane = self._lanes[index]
+        if not lane and self._pass[index] < self._virtual:
+            self._pass[index] = self._virtual
+        lane.insert_by_entry(customer)
+        self._length += 1
+    
+    def popleft(self, now=None):
+        """
+        Remove and return the next customer to serve (O(1)): a promoted
+        customer if any has waited past max_wait, otherwise the front of
+        the lane with the lowest pass
+        Parameter: now (datetime, optional) - needed for aging
+        Raises: IndexError if every lane is empty
+        """
+        if not self._length:
+            raise IndexError("pop from an empty queue")
+        lanes = self._lanes
+        passes = self._pass
+        chosen = None
+        contested = False
+        for index, lane in enumerate(lanes):
+            if lane:
+                if chosen is None:
+                    chosen = index
+                else:
+                    contested = True
+                    if passes[index] < passes[chosen]:
+                        chosen = index
+        # Aging only matters while another lane competes for the counter
+        if contested and now is not None and self.policy.max_wait is not None:
+            chosen = self._promoted(now, chosen)
+        customer = lanes[chosen].popleft()
+        self._length -= 1
+        if not self._length:
+            self._pass = [0.0] * len(lanes)  # Idle: start counting afresh
+            self._virtual = 0.0
+        else:
+            if passes[chosen] > self._virtual:
+                self._virtual = passes[chosen]
+            passes[chosen] += (customer.get_estimated_serving_time()
+                               / self.policy.weights[chosen])
+        return customer
+    
+    def _promoted(self, now, chosen):
+        """
+        Lane whose front customer waited longest past max_wait, if any
+        Parameters: now (datetime), chosen (int) - lane picked by weight
+        Returns: int - lane index to serve from
+        """
+        cutoff = now - self.policy._max_wait_delta
+        oldest = None
+        for index, lane in enumerate(self._lanes):
+            head = lane.peek()
+            if head is not None and head.entry_time < cutoff:
+                if oldest is None or head.entry_time < oldest.entry_time:
+                    oldest, chosen = head, index
+        return chosen
+    
+    def pop(self):
+        """
+        Remove and return the customer at the back of the lowest non-empty
+        class (the one rebalancing moves first)
+        Raises: IndexError if every lane is empty
+        """
+        for lane in reversed(self._lanes):
+            if lane:
+                self._length -= 1
+                return lane.pop()
+        raise IndexError("pop from an empty queue")
+    
+    def remove(self, customer):
+        """
+        Remove a customer from their lane (O(log n))
+        Parameter: customer (Customer object)
+        Raises: ValueError if the customer is not in this queue
+        """
+        if customer not in self:
+            raise ValueError(f"customer {customer.customer_id} is not in this queue")
+        customer._queue.remove(customer)
+        self._length -= 1
+    
+    def clear(self):
+        """Remove every customer"""
+        for lane in self._lanes:
+            lane.clear()
+        self._pass = [0.0] * len(self._lanes)
+        self._virtual = 0.0
+        self._length = 0
+    
+    def position(self, customer):
+        """
+        Number of customers of the same class ahead of a customer
+        Parameter: customer (Customer object in this queue)
+        Returns: int
+        """
+        return customer._queue.position(customer)
+    
+    def service_position(self, customer):
+        """
+        Number of customers served before a customer, across all lanes:
+        the lane heads are taken by pass, as popleft would, until it is
+        their turn (O(customers served first)). Like the waits, this does
+        not foresee new arrivals or aging
+        Parameter: customer (Customer object in this queue)
+        Returns: int (0 if they are next)
+        
+        Demonstrates: Simulating a scheduler
+        """
+        weights = self.policy.weights
+        passes = list(self._pass)
+        heads = [lane.peek() for lane in self._lanes]
+        served = 0
+        while True:
+            chosen = None
+            for index, head in enumerate(heads):
+                if head is not None and (chosen is None or passes[index] < passes[chosen]):
+                    chosen = index
+            head = heads[chosen]
+            if head is customer:
+                return served
+            served += 1
+            passes[chosen] += head.get_estimated_serving_time() / weights[chosen]
+            heads[chosen] = head._next
+    
+    def time_ahead(self, customer):
+        """
+        Serving time of the customers of the same class ahead of a customer
+        Parameter: customer (Customer object in this queue)
+        Returns: float (seconds)
+        """
+        return customer._queue.time_ahead(customer)
+    
+    def work_before(self, priority, ahead=None):
+        """
+        Serving time the counter gets through before a customer of a class
+        starts: their own lane ahead of them, plus the work of every other
+        lane whose turn comes first by pass (ties to the higher class)
+        Parameters: priority (str),
+                    ahead (float, optional) - serving time ahead of them in
+                    their own lane; defaults to the whole lane (a customer
+                    joining now)
+        Returns: float (seconds, before any counter speed adjustment)
+        
+        Demonstrates: Class-aware wait estimation
+        """
+        lane_index = PRIORITY_INDEX[priority]
+        lane = self._lanes[lane_index]
+        weights = self.policy.weights
+        if ahead is None:
+            ahead = lane.total_time
+        start = self._pass[lane_index]
+        if not lane and start < self._virtual:
+            start = self._virtual
+        start += ahead / weights[lane_index]
+        total = ahead
+        for index, other in enumerate(self._lanes):
+            if index == lane_index or not other:
+                continue
+            lead = start - self._pass[index]
+            if lead > 0 or (lead == 0 and index < lane_index):
+                # The customer straddling their start is served whole;
+                # count an average one of that lane for it
+                served = lead * weights[index] + other.total_time / len(other)
+                total += min(other.total_time, served)
+        return total
+    
+    def __contains__(self, customer):
+        """Whether a customer is waiting in one of the lanes (O(1))"""
+        queue = getattr(customer, '_queue', None)
+        return queue is not None and self._lanes[PRIORITY_INDEX[customer.priority]] is queue
+    
+    def __getitem__(self, index):
+        """Customer at a position, counting lanes from the highest class"""
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("queue index out of range")
+        for lane in self._lanes:
+            if index < len(lane):
+                return lane[index]
+            index -= len(lane)
+    
+    def __len__(self):
+        return self._length
+    
+    def __bool__(self):
+        return self._length > 0
+    
+    def __iter__(self):
+        """Customers lane by lane, highest class first"""
+        for lane in self._lanes:
+            yield from lane
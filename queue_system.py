@@ -16,60 +16,125 @@ Concepts Applied:
 - Algorithm Implementation
 """
 
-from collections import deque
+import itertools
+import threading
+import time
 from datetime import datetime
 
+from clock import system_clock
+from counter_index import CounterIndex
+from customer_queue import CustomerQueue
+from estimator import ServingTimeEstimator
+from forecast import DEFAULT_STEP, QueueForecast, forecast_queues, mean_order_time
+from group_assign import plan_group
+from menu import ComplexityCatalogue, DEFAULT_MENU_ITEMS, default_catalogue, expand_categories
+from metrics import Metrics
+from priority_lanes import LaneQueue, WALK_IN, check_priority
+from rebalance import Rebalancer
+from routing import CapabilityRouter
+from seat_index import SeatIndex
+from seat_release import SeatReleaseScheduler, estimate_dining_time
+
+
+# Serving time model: base time plus time per complexity point (seconds)
+BASE_SERVING_TIME = 30
+TIME_PER_COMPLEXITY = 10
+
+# Longest time (seconds) a status snapshot is reused when nothing changed;
+# wait times still tick down while a customer is being served
+STATUS_MAX_AGE = 1.0
+
+# Default seating layout: tables of this many seats in one zone
+DEFAULT_TABLE_SIZE = 4
+DEFAULT_ZONE = "Main"
+
 
 class Customer:
     """
     Customer Class
     Represents a customer in the queue with their order details
     
+    Uses __slots__ so each instance has no per-object __dict__
+    
+    The serving time estimate is fixed when the customer is created, so
+    queue totals stay consistent while the estimator keeps learning
+    
     Demonstrates: Class definition, attributes, methods
     """
     
-    def __init__(self, customer_id, name, items):
+    # _queue, _prev, _next, _ticket and _mark belong to the CustomerQueue
+    # the customer is waiting in (see customer_queue.py)
+    __slots__ = ('customer_id', 'name', 'items', 'entry_time', 'complexity_score',
+                 'serving_estimate', 'priority',
+                 '_queue', '_prev', '_next', '_ticket', '_mark')
+    
+    def __init__(self, customer_id, name, items, catalogue=None, entry_time=None,
+                 serving_estimate=None, priority=WALK_IN):
         """
         Initialize a customer
-        Parameters: customer_id (int), name (str), items (list)
+        Parameters: customer_id (int), name (str), items (list),
+                    catalogue (ComplexityCatalogue, optional) - item scores,
+                    defaults to the standard menu catalogue,
+                    entry_time (datetime, optional) - defaults to now,
+                    serving_estimate (float, optional) - learned serving
+                    time in seconds, defaults to the complexity formula,
+                    priority (str) - priority class (see priority_lanes.py)
         """
         self.customer_id = customer_id
         self.name = name
         self.items = items  # List of items ordered
-        self.entry_time = datetime.now()
-        self.complexity_score = self._calculate_complexity()
+        self.entry_time = entry_time if entry_time is not None else datetime.now()
+        self.complexity_score = self._calculate_complexity(catalogue)
+        self.serving_estimate = serving_estimate
+        self.priority = priority
+        self._queue = self._prev = self._next = None
     
-    def _calculate_complexity(self):
+    def _calculate_complexity(self, catalogue=None):
         """
         Calculate complexity score based on number and type of items
         More items = higher complexity = longer serving time
+        Each item is a dictionary lookup in the complexity catalogue
+        (see menu.COMPLEXITY_RULES for the per-item rules)
         
-        Demonstrates: Conditional statements, counting algorithm
+        Demonstrates: Lookup tables, counting algorithm
         """
-        # Base complexity: 1 point per item
-        complexity = len(self.items)
-        
-        # Add extra complexity for certain item types
-        for item in self.items:
-            item_lower = item.lower()
-            if 'combo' in item_lower or 'special' in item_lower:
-                complexity += 2  # Combos take more time
-            elif 'beverage' in item_lower or 'drink' in item_lower:
-                complexity += 0.5  # Drinks are quick
-            elif 'dessert' in item_lower:
-                complexity += 1  # Desserts need packaging
-        
-        return complexity
+        if catalogue is None:
+            catalogue = default_catalogue
+        return catalogue.order_complexity(self.items)
+    
+    @classmethod
+    def from_record(cls, customer_id, name, items, entry_time, complexity_score,
+                    serving_estimate=None, priority=WALK_IN):
+        """
+        Rebuild a customer from stored fields without rescoring the order
+        Parameters: customer_id (int), name (str), items (list),
+                    entry_time (datetime), complexity_score (float),
+                    serving_estimate (float, optional), priority (str)
+        Returns: Customer object
+        """
+        customer = cls.__new__(cls)
+        customer.customer_id = customer_id
+        customer.name = name
+        customer.items = items
+        customer.entry_time = entry_time
+        customer.complexity_score = complexity_score
+        customer.serving_estimate = serving_estimate
+        customer.priority = priority
+        customer._queue = customer._prev = customer._next = None
+        return customer
     
     def get_estimated_serving_time(self):
         """
         Estimate serving time in seconds based on complexity
-        Base time: 30 seconds, +10 seconds per complexity point
+        Base time: 30 seconds, +10 seconds per complexity point,
+        unless a learned estimate was given (see estimator.py)
         
         Demonstrates: Expression evaluation, return statements
         """
-        base_time = 30  # Base serving time in seconds
-        time_per_complexity = 10
+        if self.serving_estimate is not None:
+            return self.serving_estimate
+        base_time = BASE_SERVING_TIME  # Base serving time in seconds
+        time_per_complexity = TIME_PER_COMPLEXITY
         estimated_seconds = base_time + (self.complexity_score * time_per_complexity)
         return estimated_seconds
 
@@ -79,27 +144,197 @@ class Counter:
     Counter Class
     Represents a food counter with its own queue
     
-    Demonstrates: Class definition, queue data structure (deque)
+    Demonstrates: Class definition, queue data structure (linked list)
     """
     
-    def __init__(self, counter_id, name):
+    def __init__(self, counter_id, name, clock=None, serves=None, policy=None):
         """
         Initialize a counter
-        Parameters: counter_id (int), name (str)
+        Parameters: counter_id (int), name (str),
+                    clock (optional) - time source, defaults to system time,
+                    serves (list of str, optional) - menu items and/or
+                    categories (see menu.MENU_CATEGORIES) this counter
+                    serves; defaults to the whole menu,
+                    policy (PriorityPolicy, optional) - lane weights and
+                    aging, defaults to priority_lanes.DEFAULT_POLICY
         """
         self.counter_id = counter_id
         self.name = name
-        self.queue = deque()  # Using deque for efficient queue operations
+        # Items this station serves, or None for every item
+        self.serves = expand_categories(serves) if serves is not None else None
+        self.clock = clock if clock is not None else system_clock
+        # One linked list lane per priority class, shared by weight with
+        # aging (see priority_lanes.py); customers can leave from the
+        # middle of a lane in O(log n) (see customer_queue.py)
+        self.queue = LaneQueue(owner=self, policy=policy)
         self.serving_customer = None
         self.serving_start_time = None
+        # Running total of serving time for everyone waiting in the queue,
+        # kept in sync on every add/remove so wait estimates are O(1)
+        self.queued_serving_time = 0
+        # Optional callback (e.g. a CounterIndex) notified on every change
+        self.on_change = None
+        # Optional write-ahead journal (see persistence.py); events are
+        # recorded while the lock is held so they keep the counter's order
+        self.journal = None
+        # Optional service-history file (see history.py); one record is
+        # appended for every finished service
+        self.history = None
+        # Optional online serving time estimator (see estimator.py), fed
+        # every finished service; speed_factor is this counter's learned
+        # actual / predicted ratio and scales all of its wait estimates
+        self.estimator = None
+        self.speed_factor = 1.0
+        # Optional metrics (see metrics.py): serve/finish latencies and
+        # realized waits
+        self.metrics = None
+        # Per-counter lock, so work on different counters never serializes.
+        # Listeners are always notified after the lock is released.
+        self.lock = threading.RLock()
+    
+    def can_serve(self, items):
+        """
+        Check whether this counter serves every item of an order
+        Parameter: items (list of str)
+        Returns: bool
+        """
+        return self.serves is None or all(item in self.serves for item in items)
     
-    def add_customer(self, customer):
+    def _notify_change(self):
+        """
+        Tell the listener (if any) that this counter's wait has changed
+        Must be called without holding self.lock
+        """
+        if self.on_change is not None:
+            self.on_change(self)
+    
+    def add_customer(self, customer, verbose=True):
         """
         Add customer to this counter's queue
+        Parameters: customer (Customer object),
+                    verbose (bool) - print a confirmation message
+        """
+        with self.lock:
+            self.queue.append(customer)
+            self.queued_serving_time += customer.get_estimated_serving_time()
+            if self.journal is not None:
+                self.journal.record('add', self.counter_id, customer)
+        self._notify_change()
+        if verbose:
+            print(f"✅ {customer.name} added to {self.name} queue")
+    
+    def _release_from_queue(self, customer):
+        """
+        Update the queued serving time total after a customer leaves the queue
+        Must be called by every path that removes a customer from the queue,
+        with self.lock held
+        Parameter: customer (Customer object)
+        """
+        self.queued_serving_time -= customer.get_estimated_serving_time()
+        if not self.queue:
+            self.queued_serving_time = 0  # Reset to avoid drift on empty queue
+    
+    def remove_customer(self, customer):
+        """
+        Remove a waiting customer who left the line (O(log n))
+        Parameter: customer (Customer object)
+        Returns: bool - False if the customer is not waiting here
+        """
+        with self.lock:
+            if customer not in self.queue:
+                return False
+            self.queue.remove(customer)
+            self._release_from_queue(customer)
+            if self.journal is not None:
+                self.journal.record('leave', self.counter_id, customer)
+        self._notify_change()
+        return True
+    
+    def position_of(self, customer):
+        """
+        Number of customers served before a waiting customer, counting
+        every priority lane (O(customers served first))
+        Parameter: customer (Customer object)
+        Returns: int (0 if they are next), or None if not waiting here
+        """
+        with self.lock:
+            if customer not in self.queue:
+                return None
+            return self.queue.service_position(customer)
+    
+    def lane_position_of(self, customer):
+        """
+        Number of customers of the same priority class ahead of a waiting
+        customer (other lanes are not counted)
+        Parameter: customer (Customer object)
+        Returns: int (0 for the front of their lane), or None if not
+                 waiting here
+        """
+        with self.lock:
+            if customer not in self.queue:
+                return None
+            return self.queue.position(customer)
+    
+    def personal_wait(self, customer, now=None):
+        """
+        Estimated wait of a customer already in the line: the rest of the
+        current service, everyone ahead of them in their lane and the share
+        of the other lanes served first (O(log n))
+        Parameters: customer (Customer object),
+                    now (datetime, optional) - time to evaluate the wait at
+        Returns: float (seconds), or None if not waiting here
+        """
+        if now is None:
+            now = self.clock.now()
+        with self.lock:
+            if customer not in self.queue:
+                return None
+            return self._class_wait_locked(
+                self._serving_remaining_locked(now), customer.priority,
+                self.queue.time_ahead(customer),
+                (now - customer.entry_time).total_seconds())
+    
+    def standing_of(self, customer, now=None):
+        """
+        Place in line, place in lane and personal wait of a waiting
+        customer, all read under one hold of the lock so they agree
+        Parameters: customer (Customer object),
+                    now (datetime, optional) - time to evaluate the wait at
+        Returns: tuple (position, lane position, wait), or None if not
+                 waiting here
+        """
+        if now is None:
+            now = self.clock.now()
+        with self.lock:
+            if customer not in self.queue:
+                return None
+            return (self.queue.service_position(customer),
+                    self.queue.position(customer),
+                    self.personal_wait(customer, now))
+    
+    def _take_tail_locked(self):
+        """
+        Remove the customer at the back of the queue (rebalancing)
+        Must be called with self.lock held and a non-empty queue
+        Returns: Customer object
+        """
+        customer = self.queue.pop()
+        self._release_from_queue(customer)
+        if self.journal is not None:
+            self.journal.record('leave', self.counter_id, customer)
+        return customer
+    
+    def _insert_by_entry_locked(self, customer):
+        """
+        Queue a customer moved from another counter, keeping the queue in
+        entry time order (normally at the back, so O(1))
+        Must be called with self.lock held
         Parameter: customer (Customer object)
         """
-        self.queue.append(customer)
-        print(f"✅ {customer.name} added to {self.name} queue")
+        self.queue.insert_by_entry(customer)
+        self.queued_serving_time += customer.get_estimated_serving_time()
+        if self.journal is not None:
+            self.journal.record('move_in', self.counter_id, customer)
     
     def serve_next(self):
         """
@@ -108,24 +343,152 @@ class Counter:
         
         Demonstrates: Conditional statements, return values
         """
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        with self.lock:
+            customer = self._start_next_locked()
+        if customer is not None:
+            self._notify_change()
+        if metrics is not None:
+            self._record_operation(metrics, 'started' if customer is not None else None, start)
+        return customer
+    
+    def _start_next_locked(self):
+        """
+        Move the next customer from the queue to the serving position
+        Must be called with self.lock held
+        Returns: Customer object if available, None otherwise
+        """
         if self.queue:
-            self.serving_customer = self.queue.popleft()
-            self.serving_start_time = datetime.now()
-            return self.serving_customer
+            now = self.clock.now()
+            customer = self.queue.popleft(now)
+            self._release_from_queue(customer)
+            self.serving_start_time = now
+            self.serving_customer = customer
+            if self.journal is not None:
+                self.journal.record('start', self.counter_id, customer,
+                                    when=self.serving_start_time)
+            if self.metrics is not None:
+                self.metrics.waits.observe(
+                    (self.serving_start_time - customer.entry_time).total_seconds())
+            return customer
         return None
     
+    def _restore_serving(self, customer_id, start_time):
+        """
+        Move a specific queued customer to the serving position
+        Used when replaying a journal, where the customer is normally,
+        but not always, near the front of their lane
+        Parameters: customer_id (int), start_time (datetime)
+        Returns: Customer object, or None if the customer is not queued
+        """
+        with self.lock:
+            customer = None
+            for queued in self.queue:
+                if queued.customer_id == customer_id:
+                    customer = queued
+                    self.queue.remove(queued)
+                    break
+            if customer is not None:
+                self._release_from_queue(customer)
+                self.serving_start_time = start_time
+                self.serving_customer = customer
+        if customer is not None:
+            self._notify_change()
+        return customer
+    
+    def _restore_finish(self):
+        """
+        Clear the serving position without learning from it
+        Used when replaying a journal: the service was already recorded in
+        the history and the estimator when it happened, and the replay time
+        says nothing about how long it took
+        Returns: Customer object that was being served, or None
+        """
+        with self.lock:
+            served = self.serving_customer
+            self.serving_customer = None
+            self.serving_start_time = None
+        if served is not None:
+            self._notify_change()
+        return served
+    
     def finish_serving(self):
         """
         Finish serving current customer
         Returns: Customer object that was served
         """
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        with self.lock:
+            served = self._finish_locked()
+        if served is not None:
+            self._notify_change()
+        if metrics is not None and served is not None:
+            self._record_operation(metrics, 'finished', start)
+        return served
+    
+    def _finish_locked(self):
+        """
+        Clear the serving position
+        Must be called with self.lock held
+        Returns: Customer object that was served, or None
+        """
         if self.serving_customer:
             served = self.serving_customer
+            start_time = self.serving_start_time
+            finish_time = self.clock.now()
             self.serving_customer = None
             self.serving_start_time = None
+            if self.journal is not None:
+                self.journal.record('finish', self.counter_id, served, when=finish_time)
+            if self.history is not None:
+                self.history.append(self.counter_id, served, start_time, finish_time)
+            if self.estimator is not None:
+                duration = (finish_time - start_time).total_seconds()
+                self.speed_factor = self.estimator.observe(
+                    self.counter_id, served.items, duration)
             return served
         return None
     
+    def serve_or_finish(self):
+        """
+        Atomically finish the current customer, or start the next one
+        if nobody is being served (what a serving station button does)
+        Returns: tuple (action, Customer) where action is 'finished',
+                 'started' or None when there was nothing to do
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        with self.lock:
+            if self.serving_customer:
+                action, customer = 'finished', self._finish_locked()
+            else:
+                customer = self._start_next_locked()
+                action = 'started' if customer is not None else None
+        if action is not None:
+            self._notify_change()
+        if metrics is not None:
+            self._record_operation(metrics, action, start)
+        return action, customer
+    
+    @staticmethod
+    def _record_operation(metrics, action, start):
+        """
+        Record the latency of a serve button press
+        Parameters: metrics (Metrics), action ('started', 'finished' or
+                    None), start (float) - perf_counter() at the start
+        """
+        if action == 'started':
+            metrics.operations['serve'].observe(time.perf_counter() - start)
+        elif action == 'finished':
+            metrics.operations['finish'].observe(time.perf_counter() - start)
+        else:
+            metrics.count('serve_empty')
+    
     def get_queue_length(self):
         """
         Get current queue length
@@ -135,27 +498,94 @@ class Counter:
         """
         return len(self.queue)
     
-    def get_estimated_wait_time(self):
+    def get_serving_deadline(self):
+        """
+        Get the time the current customer is expected to be finished
+        Returns: float (epoch seconds), or None if nobody is being served
+        """
+        with self.lock:
+            if self.serving_customer is None:
+                return None
+            return (self.serving_start_time.timestamp()
+                    + self.speed_factor * self.serving_customer.get_estimated_serving_time())
+    
+    def get_queued_time(self):
+        """
+        Get the estimated time to serve everyone waiting in the queue
+        Returns: float (seconds), adjusted for this counter's speed
+        """
+        with self.lock:
+            return self.speed_factor * self.queued_serving_time
+    
+    def get_estimated_wait_time(self, now=None, priority=None):
         """
         Calculate estimated waiting time for new customer
         Sum of all customers' serving times ahead in queue
         
-        Demonstrates: Summation algorithm, iteration
+        The queued part comes from the running total (O(1)); only the
+        remainder of the customer currently being served is computed live.
+        With a priority class, only the work served before a new customer
+        of that class counts (see LaneQueue.work_before), capped by aging.
+        
+        Parameters: now (datetime, optional) - time to evaluate the wait at,
+                    priority (str, optional) - priority class of the new
+                    customer; None waits behind everyone in the queue
+        
+        Demonstrates: Summation algorithm, incremental aggregation
         """
         total_time = 0
+        if now is None:
+            now = self.clock.now()
         
-        # Add time for currently serving customer
-        if self.serving_customer:
-            elapsed = (datetime.now() - self.serving_start_time).total_seconds()
-            remaining = self.serving_customer.get_estimated_serving_time() - elapsed
-            if remaining > 0:
-                total_time += remaining
-        
-        # Add time for all customers in queue
-        for customer in self.queue:
-            total_time += customer.get_estimated_serving_time()
+        with self.lock:
+            # Add time for currently serving customer
+            total_time += self._serving_remaining_locked(now)
+            
+            if priority is not None:
+                return self._class_wait_locked(total_time, priority)
+            
+            # Add time for all customers in queue (maintained incrementally)
+            total_time += self.speed_factor * self.queued_serving_time
         
         return total_time
+    
+    def _class_wait_locked(self, remaining, priority, ahead=None, waited=0.0):
+        """
+        Wait of a customer of a priority class: the work served before
+        them, but no longer than aging allows (once promoted, only their
+        own lane ahead of them is left)
+        Must be called with self.lock held
+        Parameters: remaining (float) - seconds left of the current service,
+                    priority (str),
+                    ahead (float, optional) - serving time ahead of them in
+                    their lane; defaults to the whole lane (a new customer),
+                    waited (float) - seconds they have waited already
+        Returns: float (seconds)
+        """
+        queue = self.queue
+        check_priority(priority)
+        wait = remaining + self.speed_factor * queue.work_before(priority, ahead)
+        max_wait = queue.policy.max_wait
+        if max_wait is not None:
+            if ahead is None:
+                ahead = queue.lane(priority).total_time
+            wait = min(wait, max(max_wait - waited, remaining + self.speed_factor * ahead))
+        return wait
+    
+    def _serving_remaining_locked(self, now):
+        """
+        Estimated time left for the customer being served
+        Must be called with self.lock held
+        Parameter: now (datetime)
+        Returns: float (seconds, 0 if nobody is being served)
+        """
+        if not self.serving_customer:
+            return 0
+        elapsed = (now - self.serving_start_time).total_seconds()
+        remaining = (self.speed_factor
+                     * self.serving_customer.get_estimated_serving_time()
+                     - elapsed)
+        return remaining if remaining > 0 else 0
 
 
 class SeatManager:
@@ -163,39 +593,171 @@ class SeatManager:
     Seat Manager Class
     Manages seat availability in the canteen
     
+    Seats are arranged in tables (and optionally zones); a bitmap index
+    knows exactly which seats are free, so groups can sit together.
+    A seat is identified by a (table, position) tuple, both 0-based.
+    
     Demonstrates: Class definition, state management
     """
     
-    def __init__(self, total_seats):
+    def __init__(self, total_seats, table_size=DEFAULT_TABLE_SIZE, layout=None):
         """
         Initialize seat manager
-        Parameter: total_seats (int) - total number of seats available
+        Parameters: total_seats (int) - total number of seats available,
+                    table_size (int) - seats per table (the last table
+                    takes the remainder),
+                    layout (list of (zone, size), optional) - explicit
+                    tables, overrides total_seats and table_size
+        """
+        if layout is None:
+            layout = [(DEFAULT_ZONE, min(table_size, total_seats - first))
+                      for first in range(0, total_seats, table_size)]
+        self.layout = list(layout)
+        self.index = SeatIndex(self.layout)
+        self.total_seats = self.index.total_seats
+        self.lock = threading.Lock()
+        self.journal = None  # Optional write-ahead journal (see persistence.py)
+        self.metrics = None  # Optional metrics (see metrics.py)
+        # Optional listener called with every list of released seats, with
+        # self.lock held (see seat_release.py)
+        self.on_release = None
+    
+    @property
+    def occupied_seats(self):
+        """Number of taken seats"""
+        return self.index.occupied_seats
+    
+    def seat_label(self, seat):
+        """
+        Human-readable name of a seat
+        Parameter: seat (tuple) - (table, position)
+        Returns: str, e.g. "Table 3 seat 2"
+        """
+        table, position = seat
+        zone = self.layout[table][0]
+        prefix = "" if zone == DEFAULT_ZONE else f"{zone} "
+        return f"{prefix}Table {table + 1} seat {position + 1}"
+    
+    def assign_seats(self, count=1, zone=None, together=True, strategy='best'):
+        """
+        Take seats for a group
+        Parameters: count (int) - group size, zone (str, optional),
+                    together (bool) - the seats must be adjacent at one
+                    table; otherwise the group is split over the largest
+                    free blocks, strategy (str) - 'best' or 'first' fit
+        Returns: list of (table, position) seats, or None if the group
+                 cannot be seated
+        
+        Demonstrates: Bitmap search, fallback strategies
+        """
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        with self.lock:
+            spot = self.index.find(count, zone, strategy)
+            if spot is not None:
+                blocks = [(spot[0], spot[1], count)]
+                self.index.occupy(*blocks[0])
+            elif together:
+                blocks = None
+            else:
+                blocks = self._take_split_locked(count, zone, strategy)
+            if blocks is None:
+                seats = None
+            else:
+                seats = [(table, first + i) for table, first, size in blocks
+                         for i in range(size)]
+                if self.journal is not None:
+                    self.journal.record('occupy', count=count, seats=seats)
+        if metrics is not None:
+            metrics.operations['seat_assign'].observe(time.perf_counter() - start)
+            if seats is None:
+                metrics.count('seat_unavailable')
+        return seats
+    
+    def _take_split_locked(self, count, zone, strategy):
+        """
+        Take seats for a group that does not fit at one table, largest
+        free blocks first
+        Must be called with self.lock held
+        Returns: list of (table, first seat, size) blocks, or None
         """
-        self.total_seats = total_seats
-        self.occupied_seats = 0
+        if count > self.total_seats - self.index.occupied_seats:
+            return None
+        blocks = []
+        remaining = count
+        while remaining:
+            size = min(remaining, self.index.max_size)
+            spot = self.index.find(size, zone, strategy)
+            while spot is None and size > 1:
+                size -= 1
+                spot = self.index.find(size, zone, strategy)
+            if spot is None:
+                # Only seats outside the zone are left: undo
+                for block in blocks:
+                    self.index.release(*block)
+                return None
+            blocks.append((spot[0], spot[1], size))
+            self.index.occupy(*blocks[-1])
+            remaining -= size
+        return blocks
+    
+    def release_seats(self, seats):
+        """
+        Free specific seats
+        Parameter: seats (list of (table, position) tuples)
+        """
+        with self.lock:
+            self._release_locked(seats)
+    
+    def _release_locked(self, seats):
+        """
+        Free specific seats and tell the release listener
+        Must be called with self.lock held
+        Parameter: seats (list of (table, position) tuples)
+        """
+        for table, position in seats:
+            self.index.release(table, position)
+        if self.journal is not None:
+            self.journal.record('free', count=len(seats), seats=list(seats))
+        if self.on_release is not None:
+            self.on_release(list(seats))
+    
+    def mark_occupied(self, seats):
+        """
+        Take specific seats (used when replaying a journal)
+        Parameter: seats (list of (table, position) tuples)
+        Raises: ValueError if a seat is already taken
+        """
+        with self.lock:
+            for table, position in seats:
+                self.index.occupy(table, position)
     
     def occupy_seat(self, count=1):
         """
-        Occupy seats
+        Occupy seats, together if possible
         Parameter: count (int) - number of seats to occupy
         Returns: bool - True if successful, False if not enough seats
         
         Demonstrates: Conditional statements, parameter validation
         """
-        if self.occupied_seats + count <= self.total_seats:
-            self.occupied_seats += count
-            return True
-        return False
+        return self.assign_seats(count, together=False) is not None
     
     def free_seat(self, count=1):
         """
-        Free up seats
+        Free up seats (the lowest-numbered taken seats)
         Parameter: count (int) - number of seats to free
         """
-        if self.occupied_seats >= count:
-            self.occupied_seats -= count
-        else:
-            self.occupied_seats = 0
+        with self.lock:
+            seats = []
+            for table, taken in enumerate(self.index.taken):
+                while taken and len(seats) < count:
+                    position = (taken & -taken).bit_length() - 1
+                    seats.append((table, position))
+                    taken &= taken - 1
+                if len(seats) == count:
+                    break
+            self._release_locked(seats)
     
     def get_vacant_seats(self):
         """
@@ -218,6 +780,31 @@ class SeatManager:
         return (self.occupied_seats / self.total_seats) * 100
 
 
+class StatusSnapshot:
+    """
+    Status Snapshot Class
+    Status of every counter at one moment, shared by all readers
+    
+    Statuses are dictionaries with 'counter', 'queue_length', 'wait_time'
+    and 'serving' keys; treat them as read-only.
+    
+    Demonstrates: Immutable shared views, caching
+    """
+    
+    __slots__ = ('version', 'taken_at', 'statuses', 'best')
+    
+    def __init__(self, version, taken_at, statuses):
+        """
+        Parameters: version (int) - mutation version it was built at,
+                    taken_at (datetime), statuses (list of dict)
+        """
+        self.version = version
+        self.taken_at = taken_at
+        self.statuses = statuses
+        # Shortest wait; ties go to the earlier counter, like the scan
+        self.best = min(statuses, key=lambda s: s['wait_time']) if statuses else None
+
+
 class QueueSystem:
     """
     Main Queue System Class
@@ -226,30 +813,81 @@ class QueueSystem:
     Demonstrates: Top-down design, modularization, class composition
     """
     
-    def __init__(self):
+    def __init__(self, counters=None, clock=None):
         """
         Initialize the queue system
         Creates counters and seat manager
+        Parameters: counters (list of Counter, optional) - custom counter
+                    layout; defaults to the three standard counters,
+                    clock (optional) - time source shared with every
+                    counter, defaults to system time
         """
+        self.clock = clock if clock is not None else system_clock
+        
         # Initialize counters (multiple food counters)
-        self.counters = [
-            Counter(1, "Counter 1 - North"),
-            Counter(2, "Counter 2 - South"),
-            Counter(3, "Counter 3 - East")
-        ]
+        if counters is None:
+            counters = [
+                Counter(1, "Counter 1 - North"),
+                Counter(2, "Counter 2 - South"),
+                Counter(3, "Counter 3 - East")
+            ]
+        self.counters = list(counters)
+        # Every waiting customer by id (customer_id -> Customer), kept up to
+        # date by the counters' queues, for cancellation and lookups in O(1)
+        self._queued = {}
+        for counter in self.counters:
+            self._attach_registry(counter)
+            counter.clock = self.clock
+        
+        # Status snapshot for read-only views, rebuilt lazily when the
+        # mutation version moves on or it gets older than status_max_age
+        self.status_max_age = STATUS_MAX_AGE
+        self._status_version = 0
+        self._version_counter = itertools.count(1)
+        self._snapshot = None
+        self._snapshot_lock = threading.Lock()
         
-        # Initialize seat manager (50 total seats)
-        self.seat_manager = SeatManager(50)
+        # Priority index used to find the best counter in O(log n)
+        self._build_counter_index()
         
-        # Customer ID counter (for unique IDs)
+        # Write-ahead journal, if persistence is enabled
+        self.journal = None
+        
+        # Built-in metrics (see metrics.py), off until enable_metrics()
+        self.metrics = None
+        
+        # Initialize seat manager (50 total seats), with seats released
+        # automatically after each customer's estimated dining time
+        self.replace_seat_manager(SeatManager(50))
+        
+        # Customer ID counter (for unique IDs), guarded by its own lock
         self.next_customer_id = 1
+        self._id_lock = threading.Lock()
+        
+        # Guards rebuilding the counter index when counters are added
+        self._index_lock = threading.Lock()
+        
+        # Service-history file, if history recording is enabled
+        self.history = None
+        
+        # Priority lane weights and aging given to every counter, if set
+        self.priority_policy = None
+        
+        # Moves waiting customers to idle or much shorter lines
+        self.rebalancer = Rebalancer(self)
+        self.auto_rebalance = True
         
         # Sample menu items for selection
-        self.menu_items = [
-            "Rice & Curry", "Biryani", "Pasta", "Pizza Slice",
-            "Burger", "Sandwich", "Combo Meal", "Special Thali",
-            "Beverage", "Soft Drink", "Dessert", "Ice Cream"
-        ]
+        self.menu_items = list(DEFAULT_MENU_ITEMS)
+        
+        # Item complexity scores, compiled once for the menu
+        self.catalogue = ComplexityCatalogue(self.menu_items)
+        
+        # Serving times learned from finished services
+        self.estimator = ServingTimeEstimator(BASE_SERVING_TIME, TIME_PER_COMPLEXITY,
+                                              self.catalogue)
+        for counter in self.counters:
+            self._attach_estimator(counter)
     
     def add_customer_to_queue(self):
         """
@@ -289,37 +927,384 @@ class QueueSystem:
         else:
             items = ["Rice & Curry"]  # Default
         
-        # Create customer
-        customer = Customer(self.next_customer_id, name, items)
-        self.next_customer_id += 1
-        
-        # Find best counter (shortest estimated wait time)
-        best_counter = self._find_best_counter()
-        
-        # Add to queue
-        best_counter.add_customer(customer)
+        # Create customer and add to the best counter queue
+        customer, best_counter = self.add_order(name, items, verbose=True)
         
         print(f"\n Customer Details:")
         print(f"   Name: {customer.name}")
         print(f"   Items: {', '.join(customer.items)}")
         print(f"   Complexity Score: {customer.complexity_score:.1f}")
-        print(f"   Estimated Serving Time: {customer.get_estimated_serving_time()} seconds")
+        print(f"   Estimated Serving Time: {customer.get_estimated_serving_time():.0f} seconds")
         print(f"   Assigned to: {best_counter.name}")
         
         input("\nPress Enter to continue...")
     
-    def _find_best_counter(self):
+    def add_order(self, name, items, verbose=False, priority=WALK_IN):
+        """
+        Add one order to the best counter queue without any user input
+        Every class is routed by the counters' total backlog, which keeps
+        the load even; the class only decides the lane
+        Parameters: name (str) - customer name (may be empty),
+                    items (list of str) - items ordered,
+                    verbose (bool) - print a confirmation message,
+                    priority (str) - 'faculty', 'prepaid' or 'walk_in'
+        Raises: ValueError if no single counter serves every item
+                (see place_order), or for an unknown priority class
+        Returns: tuple (Customer, Counter) - the customer and assigned counter
+        
+        Demonstrates: Function reuse, non-interactive API
+        """
+        check_priority(priority)
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        now = self.clock.now()
+        best_counter = self._find_best_counter(now, items)
+        if best_counter is None:
+            raise ValueError(f"no counter serves all of {', '.join(items)}; "
+                             f"use place_order to split the order")
+        customer_id = self._allocate_customer_id()
+        if not name:
+            name = f"Customer {customer_id}"
+        
+        # Create customer and add them to the best counter (shortest
+        # estimated wait time among those serving the order)
+        customer = Customer(customer_id, name, items, self.catalogue, now,
+                            self.estimator.predict(items), priority)
+        best_counter.add_customer(customer, verbose=verbose)
+        if metrics is not None:
+            metrics.operations['add'].observe(time.perf_counter() - start)
+        return customer, best_counter
+    
+    def place_order(self, name, items, priority=WALK_IN):
+        """
+        Add an order, split across stations if no single counter serves
+        every item (each part queues as its own customer, same name)
+        Parameters: name (str), items (list of str), priority (str)
+        Raises: ValueError if no counter serves one of the items, or for
+                an unknown priority class
+        Returns: list of (Customer, Counter) tuples, one per part
+        
+        Demonstrates: Set cover, function reuse
+        """
+        check_priority(priority)
+        parts = [items] if self.router is None else self.router.split(items)
+        return [self.add_order(name, part, priority=priority) for part in parts]
+    
+    def add_group(self, orders, strategy='lpt'):
+        """
+        Add a group arriving together (e.g. a class), spread over the
+        counters so the last of them is served as early as possible
+        Parameters: orders (list of (name, items) tuples),
+                    strategy (str) - 'lpt' (default), 'exact' for small
+                    groups, or 'greedy' (one by one, like add_order)
+        Returns: dictionary with 'assignments' (list of (Customer, Counter)
+                 in input order) and 'makespan' (predicted seconds until
+                 the whole group is served)
+        
+        Demonstrates: Batch scheduling, function reuse
+        """
+        now = self.clock.now()
+        counters = list(self.counters)
+        eligible = None
+        if self.router is not None:
+            eligible = [[position for position, counter in enumerate(counters)
+                         if counter.can_serve(items)] for _, items in orders]
+            for (_, items), positions in zip(orders, eligible):
+                if not positions:
+                    raise ValueError(f"no counter serves all of {', '.join(items)}")
+        customers = []
+        for name, items in orders:
+            customer_id = self._allocate_customer_id()
+            customers.append(Customer(customer_id, name or f"Customer {customer_id}",
+                                      items, self.catalogue, now,
+                                      self.estimator.predict(items)))
+        # Planned against a view of the loads at this moment; orders added
+        # by other kiosks meanwhile only make the prediction optimistic
+        loads = [counter.get_estimated_wait_time(now) for counter in counters]
+        speeds = [counter.speed_factor for counter in counters]
+        times = [customer.get_estimated_serving_time() for customer in customers]
+        assignment, span = plan_group(loads, speeds, times, strategy, eligible)
+        for customer, position in zip(customers, assignment):
+            counters[position].add_customer(customer, verbose=False)
+        return {
+            'assignments': [(customer, counters[position])
+                            for customer, position in zip(customers, assignment)],
+            'makespan': span,
+        }
+    
+    def _allocate_customer_id(self):
+        """
+        Atomically take the next unique customer ID
+        Returns: int
+        """
+        with self._id_lock:
+            customer_id = self.next_customer_id
+            self.next_customer_id += 1
+        return customer_id
+    
+    def iter_ingest(self, orders):
+        """
+        Assign a stream of orders to counters, one at a time
+        Orders are consumed lazily, so any iterable or generator works;
+        like place_order, an order no single station serves is split
+        
+        Parameter: orders (iterable) - each order is a dict with 'name' and
+                   'items' keys, or a (name, items) tuple
+        Yields: tuple (customer_id, counter_id) for each order, or for each
+                part of a split order
+        Raises: ValueError if an order's items is not a list of strings
+        """
+        for number, order in enumerate(orders, 1):
+            if isinstance(order, dict):
+                name = order.get('name', '')
+                items = order.get('items') or ["Rice & Curry"]
+            else:
+                name, items = order
+                items = items or ["Rice & Curry"]
+            if (not isinstance(items, (list, tuple))
+                    or not all(isinstance(item, str) for item in items)):
+                raise ValueError(
+                    f"order {number}: items must be a list of strings")
+            for customer, counter in self.place_order(name, list(items)):
+                yield customer.customer_id, counter.counter_id
+    
+    def ingest_orders(self, orders):
+        """
+        Assign a batch or stream of orders to counters without any I/O
+        
+        Parameter: orders (iterable) - see iter_ingest for the order format
+        Returns: dictionary with 'assignments' (list of (customer_id,
+                 counter_id) tuples), 'count', 'seconds' and
+                 'orders_per_second'
+        
+        Demonstrates: Bulk processing, throughput measurement
+        """
+        start = time.perf_counter()
+        assignments = list(self.iter_ingest(orders))
+        seconds = time.perf_counter() - start
+        count = len(assignments)
+        return {
+            'assignments': assignments,
+            'count': count,
+            'seconds': seconds,
+            'orders_per_second': count / seconds if seconds > 0 else 0.0
+        }
+    
+    def attach_journal(self, journal):
+        """
+        Record every add/serve/finish/seat event in a journal
+        Parameter: journal (persistence.Journal, or None to detach)
+        """
+        self.journal = journal
+        for counter in self.counters:
+            counter.journal = journal
+        self.seat_manager.journal = journal
+    
+    def attach_history(self, history):
+        """
+        Record every finished service in a service-history file
+        Parameter: history (history.ServiceHistory, or None to detach)
+        """
+        self.history = history
+        for counter in self.counters:
+            counter.history = history
+    
+    def replace_seat_manager(self, seat_manager):
+        """
+        Use a different seat manager (e.g. one restored from a snapshot)
+        Pending automatic releases of the old one are dropped
+        Parameter: seat_manager (SeatManager)
+        """
+        seat_manager.journal = self.journal
+        seat_manager.metrics = self.metrics
+        self.seat_manager = seat_manager
+        self.seat_release = SeatReleaseScheduler(seat_manager, self.clock)
+    
+    def enable_metrics(self, metrics=None):
+        """
+        Collect operation latencies, realized waits and gauges
+        Parameter: metrics (Metrics, optional) - defaults to a new one
+        Returns: Metrics
+        """
+        if metrics is None:
+            metrics = Metrics()
+        metrics.add_gauge('queue_length', "Customers waiting per counter",
+                          lambda: {(('counter', c.counter_id),): c.get_queue_length()
+                                   for c in self.counters})
+        metrics.add_gauge('serving', "1 if the counter is serving someone",
+                          lambda: {(('counter', c.counter_id),): int(c.serving_customer is not None)
+                                   for c in self.counters})
+        metrics.add_gauge('estimated_wait_seconds', "Estimated wait per counter",
+                          lambda: {(('counter', c.counter_id),): c.get_estimated_wait_time()
+                                   for c in self.counters})
+        metrics.add_gauge('seats_occupied', "Seats taken",
+                          lambda: self.seat_manager.occupied_seats)
+        metrics.add_gauge('seats_total', "Seats in the canteen",
+                          lambda: self.seat_manager.total_seats)
+        metrics.add_gauge('seat_releases_pending', "Seats waiting for automatic release",
+                          lambda: len(self.seat_release))
+        self._set_metrics(metrics)
+        return metrics
+    
+    def disable_metrics(self):
+        """Stop collecting metrics; hot paths then skip all instrumentation"""
+        self._set_metrics(None)
+    
+    def _set_metrics(self, metrics):
+        """Hand the metrics (or None) to the system, counters and seats"""
+        self.metrics = metrics
+        for counter in self.counters:
+            counter.metrics = metrics
+        self.seat_manager.metrics = metrics
+    
+    def release_due_seats(self):
+        """
+        Free every seat whose customer's dining time is over
+        Cheap when nothing is due; call it regularly
+        Returns: int - number of seats released
+        """
+        return self.seat_release.tick()
+    
+    def _attach_estimator(self, counter):
+        """
+        Let a counter learn from, and use, the system's estimator
+        Parameter: counter (Counter object)
+        """
+        with counter.lock:
+            counter.estimator = self.estimator
+            counter.speed_factor = self.estimator.speed(counter.counter_id)
+    
+    def _attach_registry(self, counter):
+        """
+        Let a counter's queue keep the system's registry of waiting customers
+        Parameter: counter (Counter object)
+        Raises: TypeError if the counter does not queue Customer objects
+                (a StoreCounter is for compact storage and memory
+                benchmarks only)
+        """
+        queue = counter.queue
+        if not isinstance(queue, LaneQueue):
+            raise TypeError(f"{type(counter).__name__} {counter.counter_id} does not "
+                            f"queue Customer objects and cannot join a QueueSystem")
+        with counter.lock:
+            queue.registry = self._queued
+            for customer in queue:
+                self._queued[customer.customer_id] = customer
+    
+    def _build_counter_index(self):
+        """
+        (Re)build the counter index and subscribe it to every counter
+        """
+        self.counter_index = CounterIndex(self.counters)
+        # Capability routing is only needed once some counter is specialised
+        self.router = None
+        if any(counter.serves is not None for counter in self.counters):
+            self.router = CapabilityRouter(self.counters)
+        for counter in self.counters:
+            counter.on_change = self._on_counter_change
+        self._bump_status_version()
+    
+    def _on_counter_change(self, counter):
+        """
+        Listener called by a counter after every change
+        Parameter: counter (Counter object)
+        """
+        self.counter_index.update(counter)
+        router = self.router
+        if router is not None:
+            router.update(counter)
+        self._bump_status_version()
+    
+    def _bump_status_version(self):
+        """
+        Mark the current status snapshot as out of date
+        Lock-free: next() on itertools.count is atomic, so every change
+        gets a version never used before
+        """
+        self._status_version = next(self._version_counter)
+    
+    def set_priority_policy(self, policy):
+        """
+        Use the same lane weights and aging at every counter
+        Parameter: policy (PriorityPolicy)
+        """
+        self.priority_policy = policy
+        for counter in self.counters:
+            self._apply_priority_policy(counter)
+        self._bump_status_version()
+    
+    def _apply_priority_policy(self, counter):
+        """
+        Give a counter the system's priority policy, if one is set
+        Parameter: counter (Counter object)
+        """
+        if self.priority_policy is not None and isinstance(counter.queue, LaneQueue):
+            with counter.lock:
+                counter.queue.policy = self.priority_policy
+    
+    def add_counter(self, counter):
+        """
+        Add a new counter to the system
+        Parameter: counter (Counter object)
+        Raises: TypeError if the counter does not queue Customer objects
+        """
+        self._attach_registry(counter)
+        counter.clock = self.clock
+        self._apply_priority_policy(counter)
+        counter.journal = self.journal
+        counter.history = self.history
+        counter.metrics = self.metrics
+        self._attach_estimator(counter)
+        with self._index_lock:
+            self.counters.append(counter)
+            self.counter_index.add_counter(counter)
+            if self.router is not None:
+                self.router.add_counter(counter)
+            elif counter.serves is not None:
+                self.router = CapabilityRouter(self.counters)
+            counter.on_change = self._on_counter_change
+        self._bump_status_version()
+    
+    def _find_best_counter(self, now=None, items=None):
         """
         Find the counter with shortest estimated wait time
+        Uses the counter index, so this is O(log n) in the number of counters;
+        with specialised counters, only those serving every item are
+        considered (O(log n) per eligible group, see routing.py)
+        Parameters: now (datetime, optional),
+                    items (list of str, optional) - order to be served
+        Returns: Counter object, or None if no counter serves the order
+        
+        Demonstrates: Priority queue lookup
+        """
+        if now is None:
+            now = self.clock.now()
+        if len(self.counter_index) != len(self.counters):
+            # Counters list was changed directly - re-index everything
+            with self._index_lock:
+                if len(self.counter_index) != len(self.counters):
+                    self._build_counter_index()
+        router = self.router
+        if items is None or router is None:
+            return self.counter_index.best(now)
+        return router.best(items, now)
+    
+    def _scan_best_counter(self, now=None):
+        """
+        Find the counter with shortest estimated wait time by linear scan
+        Reference implementation for the counter index
         Returns: Counter object
         
         Demonstrates: Algorithm for finding minimum, iteration
         """
+        if now is None:
+            now = self.clock.now()
         best_counter = self.counters[0]
-        min_wait_time = best_counter.get_estimated_wait_time()
+        min_wait_time = best_counter.get_estimated_wait_time(now)
         
         for counter in self.counters[1:]:
-            wait_time = counter.get_estimated_wait_time()
+            wait_time = counter.get_estimated_wait_time(now)
             if wait_time < min_wait_time:
                 min_wait_time = wait_time
                 best_counter = counter
@@ -349,24 +1334,21 @@ class QueueSystem:
             if 1 <= counter_choice <= len(self.counters):
                 counter = self.counters[counter_choice - 1]
                 
-                # Start serving if not already serving
-                if not counter.serving_customer:
-                    customer = counter.serve_next()
-                    if customer:
-                        print(f"\n Started serving {customer.name}")
-                        print(f"   Items: {', '.join(customer.items)}")
+                # Start serving if not already serving, otherwise finish
+                result = self.serve_at_counter(counter)
+                customer = result['customer']
+                if result['action'] == 'started':
+                    print(f"\n Started serving {customer.name}")
+                    print(f"   Items: {', '.join(customer.items)}")
+                elif result['action'] == 'finished':
+                    print(f"\n Finished serving {customer.name}")
+                    if result['seated']:
+                        print(f"   Seat assigned: {result['seat']}. "
+                              f"Vacant seats: {self.seat_manager.get_vacant_seats()}")
                     else:
-                        print("\n No customers in queue!")
+                        print("    No vacant seats available!")
                 else:
-                    # Finish serving current customer
-                    served = counter.finish_serving()
-                    if served:
-                        print(f"\n Finished serving {served.name}")
-                        # Automatically occupy a seat
-                        if self.seat_manager.occupy_seat(1):
-                            print(f"   Seat occupied. Vacant seats: {self.seat_manager.get_vacant_seats()}")
-                        else:
-                            print("    No vacant seats available!")
+                    print("\n No customers in queue!")
             else:
                 print("\n Invalid counter selection!")
         except ValueError:
@@ -374,29 +1356,220 @@ class QueueSystem:
         
         input("\nPress Enter to continue...")
     
+    def serve_at_counter(self, counter):
+        """
+        Press the serve button of a counter without any user input:
+        start serving the next customer, or finish the current one and
+        give them a seat. Safe to call from several serving stations.
+        
+        Parameter: counter (Counter object)
+        Returns: dictionary with 'action' ('started', 'finished' or None),
+                 'customer' (Customer or None), 'seated' (bool) and
+                 'seat' (label of the assigned seat, or None)
+        """
+        action, customer = counter.serve_or_finish()
+        if action is None and self.auto_rebalance and self.rebalancer.steal_for(counter):
+            action, customer = counter.serve_or_finish()  # Took over customers
+        seat = None
+        if action == 'finished':
+            # Automatically assign a seat, and free it after the meal
+            self.release_due_seats()
+            seats = self.seat_manager.assign_seats(1)
+            if seats is not None:
+                seat = self.seat_manager.seat_label(seats[0])
+                self.seat_release.schedule(seats, estimate_dining_time(customer))
+        if self.auto_rebalance:
+            if action == 'finished' and not counter.queue:
+                self.rebalancer.steal_for(counter)  # Don't sit idle
+            self.rebalancer.maybe_rebalance()
+        return {'action': action, 'customer': customer,
+                'seated': seat is not None, 'seat': seat}
+    
+    def get_status_snapshot(self):
+        """
+        Get the status of every counter, computed at most once per change
+        The snapshot is shared until a counter changes or it is older
+        than status_max_age seconds; concurrent readers of a stale
+        snapshot wait for a single rebuild
+        
+        Returns: StatusSnapshot
+        
+        Demonstrates: Versioned caching, double-checked locking
+        """
+        now = self.clock.now()
+        snapshot = self._snapshot
+        if self._snapshot_is_fresh(snapshot, now):
+            return snapshot
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            if self._snapshot_is_fresh(snapshot, now):
+                return snapshot  # Another reader rebuilt it meanwhile
+            # Read the version first: a change during the rebuild leaves
+            # the new snapshot already out of date, never wrongly current
+            version = self._status_version
+            statuses = []
+            for counter in self.counters:
+                statuses.append({
+                    'counter': counter,
+                    'queue_length': counter.get_queue_length(),
+                    'wait_time': counter.get_estimated_wait_time(now),
+                    'serving': counter.serving_customer is not None
+                })
+            snapshot = StatusSnapshot(version, now, statuses)
+            self._snapshot = snapshot
+            return snapshot
+    
+    def _snapshot_is_fresh(self, snapshot, now):
+        """True if a snapshot can still be served at time now"""
+        return (snapshot is not None
+                and snapshot.version == self._status_version
+                and 0 <= (now - snapshot.taken_at).total_seconds() <= self.status_max_age)
+    
     def get_all_queue_status(self):
         """
-        Get status of all counters
+        Get status of all counters (from the shared status snapshot)
         Returns: list of dictionaries with counter information
         
         Demonstrates: Data aggregation, list comprehension concepts
         """
-        status_list = []
-        for counter in self.counters:
-            status_list.append({
-                'counter': counter,
-                'queue_length': counter.get_queue_length(),
-                'wait_time': counter.get_estimated_wait_time(),
-                'serving': counter.serving_customer is not None
-            })
-        return status_list
+        return list(self.get_status_snapshot().statuses)
+    
+    def forecast(self, arrival_rates, step=DEFAULT_STEP, use_numpy=True):
+        """
+        Forecast every counter's wait and queue length over the next steps
+        (see forecast.py), starting from the current waits
+        Parameters: arrival_rates (list of float) - expected arrivals per
+                    minute for the whole canteen in each future step,
+                    step (float) - seconds per step,
+                    use_numpy (bool) - use NumPy when it is installed
+        Returns: QueueForecast
+        
+        Demonstrates: Function reuse, vectorized computation
+        """
+        now = self.clock.now()
+        counters = list(self.counters)
+        order_time = mean_order_time(self.estimator, self.menu_items)
+        service_times = [counter.speed_factor * order_time for counter in counters]
+        backlog = [counter.get_estimated_wait_time(now) for counter in counters]
+        waits, lengths = forecast_queues(backlog, service_times, arrival_rates,
+                                         step=step, use_numpy=use_numpy)
+        return QueueForecast([counter.counter_id for counter in counters], step,
+                             waits, lengths)
+    
+    def find_customer(self, customer_id):
+        """
+        Look up a waiting customer by id (O(1))
+        Parameter: customer_id (int)
+        Returns: tuple (Customer, Counter), or None if the customer is not
+                 waiting (never queued, already served or cancelled)
+        """
+        customer = self._queued.get(customer_id)
+        if customer is None:
+            return None
+        counter = CustomerQueue.owner_of(customer)
+        if counter is None:
+            return None  # Left the line since the lookup
+        return customer, counter
+    
+    def cancel(self, customer_id):
+        """
+        Take a waiting customer out of their line (O(log n))
+        Parameter: customer_id (int)
+        Returns: Customer object that was removed, or None if not waiting
+        """
+        while True:
+            found = self.find_customer(customer_id)
+            if found is None:
+                return None
+            customer, counter = found
+            if counter.remove_customer(customer):
+                return customer
+            # Served or moved to another line meanwhile: look again
+    
+    def position_of(self, customer_id):
+        """
+        Where a waiting customer stands: how many customers, of any
+        priority class, are served before them
+        Parameter: customer_id (int)
+        Returns: tuple (Counter, customers served first), or None if not
+                 waiting
+        """
+        while True:
+            found = self.find_customer(customer_id)
+            if found is None:
+                return None
+            customer, counter = found
+            position = counter.position_of(customer)
+            if position is not None:
+                return counter, position
+    
+    def lane_position_of(self, customer_id):
+        """
+        Where a waiting customer stands in their priority lane (O(log n))
+        Customers of other classes can still be served first; see
+        position_of for the place in service order
+        Parameter: customer_id (int)
+        Returns: tuple (Counter, customers of the same class ahead), or
+                 None if not waiting
+        """
+        while True:
+            found = self.find_customer(customer_id)
+            if found is None:
+                return None
+            customer, counter = found
+            position = counter.lane_position_of(customer)
+            if position is not None:
+                return counter, position
+    
+    def standing_of(self, customer_id, now=None):
+        """
+        Everything about where a waiting customer stands, from one
+        consistent look at their counter
+        Parameters: customer_id (int), now (datetime, optional)
+        Returns: tuple (Customer, Counter, position, lane position, wait),
+                 or None if not waiting
+        """
+        while True:
+            found = self.find_customer(customer_id)
+            if found is None:
+                return None
+            customer, counter = found
+            standing = counter.standing_of(customer, now)
+            if standing is not None:
+                return (customer, counter) + standing
+            # Served or moved to another line meanwhile: look again
+    
+    def personal_wait(self, customer_id, now=None):
+        """
+        Estimated wait of a customer already in a line (O(log n)); unlike
+        get_estimated_wait_time it only counts the work served before them,
+        given their lane and priority class
+        Parameters: customer_id (int),
+                    now (datetime, optional) - time to evaluate the wait at
+        Returns: float (seconds), or None if not waiting
+        """
+        while True:
+            found = self.find_customer(customer_id)
+            if found is None:
+                return None
+            customer, counter = found
+            wait = counter.personal_wait(customer, now)
+            if wait is not None:
+                return wait
     
     def get_best_line_recommendation(self):
         """
         Recommend the best line (counter) to join
+        Read-only view: answered from the shared status snapshot
         Returns: Counter object with shortest wait time
         
         Demonstrates: Algorithm implementation, comparison
         """
-        return self._find_best_counter()
+        metrics = self.metrics
+        if metrics is None:
+            return self.get_status_snapshot().best['counter']
+        start = time.perf_counter()
+        best = self.get_status_snapshot().best['counter']
+        metrics.operations['recommend'].observe(time.perf_counter() - start)
+        return best
 
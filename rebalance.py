@@ -0,0 +1,165 @@
+"""
+Rebalance Module
+================
+Moves waiting customers between counters once queues drift apart
+
+Customers are assigned to the shortest line when they arrive, but real
+serving times vary, so some lines end up much slower than predicted.
+The rebalancer moves customers from the back of the longest-wait queue
+to a counter that can serve them sooner:
+
+- work stealing: a counter that runs out of customers takes some
+- skew check: when the longest and shortest waits differ by more than
+  a threshold, customers move from the longest to the shortest line
+
+A customer only moves if they start at least min_gain seconds earlier
+on the new counter, so nobody is made worse off and customers do not
+bounce back and forth. Customers leave from the back of the lowest
+priority lane and join the same lane at the new counter, in entry time
+order. Each move is a queue pop + append, O(1) per customer.
+
+Concepts Applied:
+- Load balancing (work stealing)
+- Deadlock avoidance (ordered locking)
+- Data Structures (linked list queues)
+"""
+
+import threading
+
+
+class Rebalancer:
+    """
+    Rebalancer Class
+    Moves customers from long queues to idle or short ones
+    
+    Two counter locks are taken in a fixed order, so concurrent moves
+    in opposite directions cannot deadlock. Counters are notified only
+    after both locks are released. The rebalancer's own bookkeeping
+    (moves and check times) is shared by every serving thread and is
+    guarded by a small lock of its own, never held with a counter lock.
+    
+    Demonstrates: Work stealing, lock ordering
+    """
+    
+    def __init__(self, system, min_gain=10.0, skew_threshold=120.0, check_interval=5.0,
+                 idle_retry=1.0):
+        """
+        Initialize the rebalancer
+        Parameters: system (QueueSystem),
+                    min_gain (float) - seconds a customer must gain to move,
+                    skew_threshold (float) - wait difference (seconds) that
+                    triggers a rebalance,
+                    check_interval (float) - seconds between skew checks,
+                    idle_retry (float) - seconds before an idle counter
+                    that found nothing to steal looks again
+        """
+        self.system = system
+        self.min_gain = min_gain
+        self.skew_threshold = skew_threshold
+        self.check_interval = check_interval
+        self.idle_retry = idle_retry
+        self._lock = threading.Lock()  # Guards the three fields below
+        self.moves = 0
+        self._last_check = None
+        self._last_failed_steal = {}  # id(counter) -> datetime
+    
+    def _move(self, victim, thief, now):
+        """
+        Move customers from the back of victim's queue to thief while
+        each of them starts at least min_gain seconds earlier there
+        Returns: int - number of customers moved
+        """
+        if victim is thief:
+            return 0
+        first, second = sorted((victim, thief), key=id)
+        moved = 0
+        with first.lock, second.lock:
+            while victim.queue:
+                customer = victim.queue[-1]
+                if not thief.can_serve(customer.items):
+                    break  # Specialised station; see routing.py
+                # Both sides in the customer's priority class and lane
+                starts_at_victim = victim.personal_wait(customer, now)
+                starts_at_thief = thief.get_estimated_wait_time(now, customer.priority)
+                if starts_at_thief + self.min_gain > starts_at_victim:
+                    break
+                thief._insert_by_entry_locked(victim._take_tail_locked())
+                moved += 1
+        if moved:
+            with self._lock:
+                self.moves += moved
+            victim._notify_change()
+            thief._notify_change()
+        return moved
+    
+    def _longest_wait(self, now, exclude=None):
+        """Counter with the longest wait (linear scan), and that wait"""
+        best, best_wait = None, None
+        for counter in self.system.counters:
+            if counter is exclude or not counter.queue:
+                continue
+            wait = counter.get_estimated_wait_time(now)
+            if best is None or wait > best_wait:
+                best, best_wait = counter, wait
+        return best, best_wait
+    
+    def steal_for(self, thief, now=None):
+        """
+        Let a counter that ran out of customers take some from the
+        counter with the longest wait
+        Parameters: thief (Counter), now (datetime, optional)
+        Returns: int - number of customers moved
+        """
+        if now is None:
+            now = self.system.clock.now()
+        with self._lock:
+            failed = self._last_failed_steal.get(id(thief))
+        if failed is not None and 0 <= (now - failed).total_seconds() < self.idle_retry:
+            return 0  # Looked a moment ago; don't rescan on every button press
+        victim, _ = self._longest_wait(now, exclude=thief)
+        moved = self._move(victim, thief, now) if victim is not None else 0
+        with self._lock:
+            if moved:
+                self._last_failed_steal.pop(id(thief), None)
+            else:
+                self._last_failed_steal[id(thief)] = now
+        return moved
+    
+    def rebalance(self, now=None):
+        """
+        Move customers from the longest to the shortest wait while the
+        difference is above skew_threshold
+        Parameter: now (datetime, optional)
+        Returns: list of (victim, thief, moved) tuples
+        """
+        if now is None:
+            now = self.system.clock.now()
+        moves = []
+        for _ in range(len(self.system.counters)):
+            victim, longest = self._longest_wait(now)
+            thief = self.system._find_best_counter(now)
+            if victim is None or thief is None or thief is victim:
+                break
+            if longest - thief.get_estimated_wait_time(now) <= self.skew_threshold:
+                break
+            moved = self._move(victim, thief, now)
+            if not moved:
+                break
+            moves.append((victim, thief, moved))
+        return moves
+    
+    def maybe_rebalance(self, now=None):
+        """
+        Run rebalance() at most once per check_interval
+        Parameter: now (datetime, optional)
+        Returns: list of (victim, thief, moved) tuples
+        """
+        if now is None:
+            now = self.system.clock.now()
+        # Check and claim the slot together, so one thread runs per interval
+        with self._lock:
+            if (self._last_check is not None
+                    and 0 <= (now - self._last_check).total_seconds() < self.check_interval):
+                return []
+            self._last_check = now
+        return self.rebalance(now)
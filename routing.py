@@ -0,0 +1,135 @@
+"""
+Routing Module
+==============
+Routes orders to the counters that can actually serve them
+
+Some counters are specialised stations (pizza, thali, beverages) that
+only serve part of the menu. Counters with the same capabilities form a
+group, and every group has its own CounterIndex. An inverted index maps
+each item to the specialised groups serving it, so an order only looks at:
+
+- the groups of counters that serve everything, and
+- the specialised groups serving all of its items (the intersection of
+  the inverted index lists, starting from the shortest)
+
+Finding the best counter then costs O(log n) per eligible group, however
+many other counters there are. An order that no single counter can serve
+is split into parts, one per station (greedy set cover).
+
+Concepts Applied:
+- Inverted indexes
+- Set operations (intersection, cover)
+- Priority queues (one CounterIndex per group)
+"""
+
+from counter_index import CounterIndex
+
+
+class CapabilityRouter:
+    """
+    Capability Router Class
+    Finds the best counter among those able to serve an order
+    
+    Counters must not change what they serve once added.
+    Not thread-safe for add_counter; QueueSystem serializes it.
+    
+    Demonstrates: Inverted index, grouping
+    """
+    
+    def __init__(self, counters):
+        """
+        Build the router
+        Parameter: counters (list of Counter objects)
+        """
+        self._groups = {}    # capabilities (frozenset, or None) -> CounterIndex
+        self._group_of = {}  # id(counter) -> CounterIndex
+        self._order = {}     # id(counter) -> position, for ties
+        self._general = []   # CounterIndex of counters serving everything
+        self._by_item = {}   # item -> list of (capabilities, CounterIndex)
+        for counter in counters:
+            self.add_counter(counter)
+    
+    def add_counter(self, counter):
+        """
+        Add a counter to its capability group
+        Parameter: counter (Counter object)
+        """
+        serves = counter.serves
+        group = self._groups.get(serves)
+        if group is None:
+            group = CounterIndex([counter])
+            self._groups[serves] = group
+            if serves is None:
+                self._general.append(group)
+            else:
+                for item in serves:
+                    self._by_item.setdefault(item, []).append((serves, group))
+        else:
+            group.add_counter(counter)
+        self._group_of[id(counter)] = group
+        self._order[id(counter)] = len(self._order)
+    
+    def update(self, counter):
+        """
+        Re-key a counter in its group after it changed
+        Parameter: counter (Counter object)
+        """
+        group = self._group_of.get(id(counter))
+        if group is not None:
+            group.update(counter)
+    
+    def eligible_groups(self, items):
+        """
+        Groups whose counters can serve every item of an order
+        Parameter: items (list of str)
+        Returns: list of CounterIndex
+        """
+        wanted = set(items)
+        if not wanted:
+            return list(self._groups.values())
+        lists = [self._by_item.get(item, ()) for item in wanted]
+        groups = list(self._general)
+        shortest = min(lists, key=len)
+        groups.extend(group for serves, group in shortest if wanted <= serves)
+        return groups
+    
+    def best(self, items, now):
+        """
+        Counter with the shortest wait among those serving every item
+        Ties go to the counter added first, like the linear scan
+        Parameters: items (list of str), now (datetime)
+        Returns: Counter object, or None if no counter serves the order
+        """
+        best, best_key = None, None
+        for group in self.eligible_groups(items):
+            counter = group.best(now)
+            if counter is None:
+                continue
+            key = (counter.get_estimated_wait_time(now), self._order[id(counter)])
+            if best is None or key < best_key:
+                best, best_key = counter, key
+        return best
+    
+    def split(self, items):
+        """
+        Split an order into parts that single counters can serve, taking
+        the group that covers most of the remaining items each time
+        Parameter: items (list of str)
+        Raises: ValueError if no counter serves one of the items
+        Returns: list of item lists (just [items] if no split is needed)
+        """
+        if self._general or self.eligible_groups(items):
+            return [list(items)]
+        remaining = list(items)
+        parts = []
+        while remaining:
+            covered = {}
+            for item in dict.fromkeys(remaining):  # First come first, for ties
+                for serves, _ in self._by_item.get(item, ()):
+                    covered[serves] = covered.get(serves, 0) + remaining.count(item)
+            if not covered:
+                raise ValueError(f"no counter serves {remaining[0]}")
+            serves = max(covered, key=covered.get)
+            parts.append([item for item in remaining if item in serves])
+            remaining = [item for item in remaining if item not in serves]
+        return parts
@@ -0,0 +1,175 @@
+"""
+Seat Index Module
+=================
+Bitmap index of seats, arranged in tables and zones
+
+Each table is one integer bitmask: bit i is set when seat i is taken.
+A group of k friends needs k adjacent free seats at one table; the
+starting positions of every such block are found with k shifts and ANDs
+on the free-seat mask, so checking a table is a handful of integer ops.
+
+To avoid scanning thousands of tables, every table is filed under the
+length of its longest free run, in one min-heap of table numbers per
+(zone, run length). A group of size k only looks at the heaps for run
+lengths k..max table size, which is a small constant:
+
+- best fit:  smallest run that still fits (keeps big tables for big groups)
+- first fit: lowest-numbered table that fits
+
+Heap entries are invalidated lazily, like the counter index: an entry is
+skipped when its table's longest run no longer matches its heap.
+
+Concepts Applied:
+- Bit manipulation
+- Priority queues with lazy deletion
+- Data Structures (lists, dictionaries)
+"""
+
+import heapq
+
+
+def longest_free_run(free):
+    """
+    Length of the longest run of set bits in a mask
+    Parameter: free (int) - bitmask of free seats
+    Returns: int
+    """
+    run = 0
+    while free:
+        free &= free >> 1
+        run += 1
+    return run
+
+
+def block_starts(free, k):
+    """
+    Bitmask of the positions where k adjacent free seats start
+    Parameters: free (int) - bitmask of free seats, k (int) - group size
+    Returns: int - bit i set if seats i..i+k-1 are all free
+    """
+    starts = free
+    for shift in range(1, k):
+        starts &= free >> shift
+    return starts
+
+
+class SeatIndex:
+    """
+    Seat Index Class
+    Tracks which seats are taken and finds blocks for groups
+    
+    Not thread-safe on its own; SeatManager guards it with its lock.
+    
+    Demonstrates: Bitmaps, bucketed priority queues
+    """
+    
+    def __init__(self, tables):
+        """
+        Build the index with every seat free
+        Parameter: tables (list of (zone, size) tuples) - one per table
+        """
+        self.zones = [zone for zone, _ in tables]
+        self.sizes = [size for _, size in tables]
+        self.full = [(1 << size) - 1 for size in self.sizes]
+        self.taken = [0] * len(tables)
+        self.longest = list(self.sizes)
+        self.max_size = max(self.sizes, default=0)
+        self.total_seats = sum(self.sizes)
+        self.occupied_seats = 0
+        self._rebuild()
+    
+    def _rebuild(self):
+        """Rebuild every heap from the current bitmaps (also compacts them)"""
+        self._heaps = {zone: [[] for _ in range(self.max_size + 1)]
+                       for zone in dict.fromkeys(self.zones)}
+        self._entries = 0
+        for table in range(len(self.sizes)):
+            self._push(table)
+    
+    def _push(self, table):
+        """File a table under its current longest free run"""
+        heapq.heappush(self._heaps[self.zones[table]][self.longest[table]], table)
+        self._entries += 1
+    
+    def _top(self, zone, run):
+        """
+        Lowest-numbered table of a zone whose longest free run is run
+        Returns: int, or None
+        """
+        heap = self._heaps[zone][run]
+        while heap and self.longest[heap[0]] != run:
+            heapq.heappop(heap)  # Stale entry
+            self._entries -= 1
+        return heap[0] if heap else None
+    
+    def _set(self, table, taken):
+        """Store a table's new bitmap and re-file it"""
+        self.taken[table] = taken
+        run = longest_free_run(self.full[table] & ~taken)
+        if run != self.longest[table]:
+            self.longest[table] = run
+            self._push(table)
+            if self._entries > 4 * len(self.sizes) + 64:
+                self._rebuild()
+    
+    def find(self, k, zone=None, strategy='best'):
+        """
+        Find k adjacent free seats at one table
+        Parameters: k (int) - group size, zone (str, optional) - only
+                    this zone, strategy (str) - 'best' or 'first' fit
+        Returns: tuple (table, first seat), or None if no table fits
+        """
+        if k < 1 or k > self.max_size:
+            return None
+        zones = [zone] if zone is not None else list(self._heaps)
+        best = None
+        for name in zones:
+            if name not in self._heaps:
+                raise ValueError(f"unknown zone {name}")
+            for run in range(k, self.max_size + 1):
+                table = self._top(name, run)
+                if table is None:
+                    continue
+                key = (run, table) if strategy == 'best' else (table,)
+                if best is None or key < best[0]:
+                    best = (key, table)
+                if strategy == 'best':
+                    break  # Larger runs in this zone fit worse
+        if best is None:
+            return None
+        table = best[1]
+        starts = block_starts(self.full[table] & ~self.taken[table], k)
+        return table, (starts & -starts).bit_length() - 1
+    
+    def occupy(self, table, first, count=1):
+        """
+        Mark seats first..first+count-1 of a table as taken
+        Raises: ValueError if any of them is taken or does not exist
+        """
+        block = ((1 << count) - 1) << first
+        if block & ~self.full[table] or block & self.taken[table]:
+            raise ValueError(f"seats {first}..{first + count - 1} of table "
+                             f"{table} are not free")
+        self._set(table, self.taken[table] | block)
+        self.occupied_seats += count
+    
+    def release(self, table, first, count=1):
+        """
+        Mark seats first..first+count-1 of a table as free
+        Seats that are already free are ignored
+        """
+        block = (((1 << count) - 1) << first) & self.taken[table]
+        if block:
+            self._set(table, self.taken[table] & ~block)
+            self.occupied_seats -= bin(block).count('1')
+    
+    def load(self, taken):
+        """
+        Replace every bitmap (used when restoring a snapshot)
+        Parameter: taken (list of int) - one bitmap per table
+        """
+        self.taken = [mask & full for mask, full in zip(taken, self.full)]
+        self.longest = [longest_free_run(full & ~mask)
+                        for mask, full in zip(self.taken, self.full)]
+        self.occupied_seats = sum(bin(mask).count('1') for mask in self.taken)
+        self._rebuild()
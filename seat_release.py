@@ -0,0 +1,164 @@
+"""
+Seat Release Module
+===================
+Frees seats automatically once a customer has had time to eat
+
+When a customer is seated, a release is scheduled after an estimated
+dining time derived from the order (bigger orders take longer to eat).
+Pending releases live in a hierarchical timing wheel, so scheduling or
+cancelling one is O(1) even with 100k customers seated, and tick()
+only touches the releases that are actually due.
+
+Every seat with a pending release maps to its timer. When a seat is freed
+any other way (the customer leaves early, free_seat), the seat manager
+tells the scheduler, which drops the seat from its timer, so a later
+tick cannot free the seat after someone else has been given it.
+
+Concepts Applied:
+- Timer scheduling (timing wheels)
+- Time-driven state changes
+- Threads and synchronization
+"""
+
+import threading
+
+from timing_wheel import TimingWheel
+
+
+# Dining time model: base time plus time per complexity point (seconds)
+BASE_DINING_TIME = 15 * 60
+DINING_TIME_PER_COMPLEXITY = 3 * 60
+
+
+def estimate_dining_time(customer):
+    """
+    Estimate how long a customer stays seated
+    Parameter: customer (Customer)
+    Returns: float - seconds
+    """
+    return BASE_DINING_TIME + DINING_TIME_PER_COMPLEXITY * customer.complexity_score
+
+
+class SeatReleaseScheduler:
+    """
+    Seat Release Scheduler Class
+    Releases seats when their estimated dining time is over
+    
+    Lock order: the seat manager's lock, then the scheduler's own lock
+    
+    Demonstrates: Composition, timer wheels, thread safety
+    """
+    
+    def __init__(self, seat_manager, clock, tick=1.0):
+        """
+        Initialize the scheduler
+        Parameters: seat_manager (SeatManager), clock - time source,
+                    tick (float) - wheel resolution in seconds
+        """
+        self.seat_manager = seat_manager
+        self.clock = clock
+        self.wheel = TimingWheel(tick, start=clock.now().timestamp())
+        self._lock = threading.Lock()
+        self._handles = {}  # (table, position) -> Timer of its pending release
+        seat_manager.on_release = self._forget
+    
+    def __len__(self):
+        """Number of pending releases"""
+        return len(self.wheel)
+    
+    def schedule(self, seats, dining_time):
+        """
+        Release seats after a dining time
+        Parameters: seats (list of (table, position)), dining_time (float)
+        Returns: Timer - handle for cancel()
+        """
+        seats = list(seats)  # The timer's own copy, trimmed by _forget
+        with self._lock:
+            self._forget_locked(seats)
+            handle = self.wheel.schedule_at(self.clock.now().timestamp() + dining_time,
+                                            seats)
+            for seat in seats:
+                self._handles[seat] = handle
+            return handle
+    
+    def cancel(self, handle):
+        """
+        Cancel a pending release (the seats stay taken)
+        Parameter: handle (Timer)
+        Returns: bool - False if it was no longer pending
+        """
+        with self._lock:
+            for seat in handle.payload:
+                if self._handles.get(seat) is handle:
+                    del self._handles[seat]
+            return self.wheel.cancel(handle)
+    
+    def release_now(self, handle):
+        """
+        Release seats early, e.g. when the customer leaves
+        Parameter: handle (Timer)
+        Returns: bool - False if they had already been released
+        """
+        with self.seat_manager.lock:
+            with self._lock:
+                pending = self.wheel.cancel(handle)
+            if pending:
+                self.seat_manager._release_locked(handle.payload)
+        return pending
+    
+    def tick(self):
+        """
+        Release every seat whose dining time is over
+        Returns: int - number of seats released
+        """
+        # The seat lock is held throughout, so no seat can change hands
+        # between its timer expiring and it being freed
+        with self.seat_manager.lock:
+            with self._lock:
+                due = self.wheel.advance(self.clock.now().timestamp())
+            released = 0
+            for seats in due:
+                if seats:
+                    released += len(seats)
+                    self.seat_manager._release_locked(seats)
+        return released
+    
+    def _forget(self, seats):
+        """
+        Release listener: drop freed seats from their pending releases
+        Called by the seat manager with its lock held
+        Parameter: seats (list of (table, position))
+        """
+        with self._lock:
+            self._forget_locked(seats)
+    
+    def _forget_locked(self, seats):
+        """
+        Drop seats from their pending releases, cancelling a release once
+        none of its seats are left
+        Must be called with self._lock held
+        Parameter: seats (list of (table, position))
+        """
+        for seat in seats:
+            handle = self._handles.pop(seat, None)
+            if handle is None:
+                continue
+            if seat in handle.payload:
+                handle.payload.remove(seat)
+            if not handle.payload:
+                self.wheel.cancel(handle)
+    
+    def adopt_occupied(self, dining_time=BASE_DINING_TIME):
+        """
+        Schedule a release for every taken seat, e.g. after recovering
+        from a crash, when the original schedule is unknown
+        Parameter: dining_time (float) - seconds from now
+        Returns: int - number of seats scheduled
+        """
+        with self.seat_manager.lock:
+            seats = [(table, position)
+                     for table, taken in enumerate(self.seat_manager.index.taken)
+                     for position in range(taken.bit_length()) if taken >> position & 1]
+        for seat in seats:
+            self.schedule([seat], dining_time)
+        return len(seats)
@@ -0,0 +1,461 @@
+"""
+Network Service Module
+======================
+asyncio HTTP service exposing the queue system to many clients at once
+
+Display boards, kiosks and the student app talk to one QueueSystem over
+plain HTTP/1.1 (keep-alive supported). Boards can subscribe to a
+Server-Sent Events stream instead of polling.
+
+Endpoints:
+    GET  /status               - queue status of every counter
+    GET  /recommendation       - best counter to join
+    GET  /seats                - seat availability
+    GET  /metrics              - metrics in Prometheus text format
+    GET  /metrics.json         - the same metrics as a JSON snapshot
+    POST /orders               - add an order, body {"name": ..., "items": [...],
+                                 "priority": "faculty" | "prepaid" | "walk_in"};
+                                 split across stations when no counter serves it all
+    GET  /orders/<id>          - place in line (overall and in its priority lane)
+                                 and personal wait of a waiting order
+    DELETE /orders/<id>        - cancel a waiting order
+    POST /counters/<id>/serve  - start or finish serving at a counter
+    GET  /subscribe            - event stream, one status message per change
+
+Requests that change the queues run in a worker thread (the loop's
+default executor), so lock waits and journal fsyncs never stall the
+event loop; reads are answered from the shared status snapshot inline.
+
+Run: python service.py [host] [port]
+
+Concepts Applied:
+- Asynchronous I/O (asyncio streams)
+- Publish/subscribe
+- JSON serialization
+- Offloading blocking work to threads
+"""
+
+import asyncio
+import json
+
+from priority_lanes import WALK_IN
+from queue_system import QueueSystem
+
+
+# Longest request body accepted (bytes)
+MAX_BODY_SIZE = 64 * 1024
+
+# Methods whose handlers change state, run off the event loop
+MUTATING_METHODS = ('POST', 'DELETE')
+
+# Shortest gap between two pushed status messages (seconds)
+PUBLISH_INTERVAL = 0.1
+
+# How often seats whose dining time is over are released (seconds)
+SEAT_RELEASE_INTERVAL = 1.0
+
+STATUS_TEXT = {
+    200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large",
+    431: "Request Header Fields Too Large", 503: "Service Unavailable",
+}
+
+
+def status_to_dict(status):
+    """
+    Convert one counter status (see QueueSystem.get_status_snapshot)
+    to a JSON-friendly dictionary
+    Parameter: status (dict)
+    Returns: dict
+    """
+    counter = status['counter']
+    return {
+        'counter_id': counter.counter_id,
+        'name': counter.name,
+        'queue_length': status['queue_length'],
+        'wait_time': round(status['wait_time'], 1),
+        'serving': status['serving'],
+    }
+
+
+class QueueService:
+    """
+    Queue Service Class
+    Serves a QueueSystem over HTTP with asyncio
+    
+    Demonstrates: Event loop programming, non-blocking I/O
+    """
+    
+    def __init__(self, system=None):
+        """
+        Initialize the service
+        Parameter: system (QueueSystem, optional) - defaults to a new one,
+                   with metrics enabled for /metrics
+        """
+        if system is None:
+            system = QueueSystem()
+            system.enable_metrics()
+        self.system = system
+        self.subscribers = set()  # One asyncio.Queue per subscriber
+        self.server = None
+        self._changed = None      # asyncio.Event, created inside the loop
+        self._loop = None
+        self._publisher = None
+        self._seat_releaser = None
+        self._streams = {}        # EOF watcher -> task of each open event stream
+    
+    # ---------- Views ----------
+    
+    def status(self):
+        """Status of every counter as a dictionary"""
+        return {'counters': [status_to_dict(s)
+                             for s in self.system.get_status_snapshot().statuses]}
+    
+    def recommendation(self):
+        """Best counter to join as a dictionary, or None without counters"""
+        best = self.system.get_status_snapshot().best
+        return status_to_dict(best) if best is not None else None
+    
+    def seats(self):
+        """Seat availability as a dictionary"""
+        seat_manager = self.system.seat_manager
+        return {
+            'total': seat_manager.total_seats,
+            'occupied': seat_manager.occupied_seats,
+            'vacant': seat_manager.get_vacant_seats(),
+            'occupancy': round(seat_manager.get_occupancy_percentage(), 1),
+        }
+    
+    def metrics(self, text=True):
+        """
+        Current metrics, or None when they are switched off
+        Parameter: text (bool) - Prometheus text instead of a dictionary
+        Returns: str, dictionary or None
+        """
+        metrics = self.system.metrics
+        if metrics is None:
+            return None
+        return metrics.prometheus_text() if text else metrics.snapshot()
+    
+    def add_order(self, body):
+        """
+        Add an order from a JSON body
+        Returns: tuple (status code, response dict)
+        """
+        items = body.get('items') or ["Rice & Curry"]
+        if not isinstance(items, list) or not all(isinstance(i, str) for i in items):
+            return 400, {'error': "'items' must be a list of strings"}
+        try:
+            parts = self.system.place_order(str(body.get('name', '')), items,
+                                            body.get('priority', WALK_IN))
+        except ValueError as error:
+            return 400, {'error': str(error)}
+        self._notify()
+        customer, counter = parts[0]
+        response = {
+            'customer_id': customer.customer_id,
+            'counter_id': counter.counter_id,
+            'priority': customer.priority,
+            'estimated_serving_time': round(customer.get_estimated_serving_time(), 1),
+        }
+        if len(parts) > 1:
+            # Split across specialised stations: one ticket per part
+            response['parts'] = [{'customer_id': part.customer_id,
+                                  'counter_id': station.counter_id,
+                                  'items': part.items} for part, station in parts]
+        return 201, response
+    
+    def order_status(self, customer_id):
+        """
+        Where a waiting order stands and how long it still has to wait
+        position counts everyone served first, position_in_lane only the
+        customers of the same priority class ahead
+        Returns: tuple (status code, response dict)
+        """
+        standing = self.system.standing_of(customer_id)
+        if standing is None:
+            return 404, {'error': f"order {customer_id} is not waiting"}
+        customer, counter, position, in_lane, wait = standing
+        return 200, {
+            'customer_id': customer_id,
+            'counter_id': counter.counter_id,
+            'priority': customer.priority,
+            'position': position,
+            'position_in_lane': in_lane,
+            'wait_time': round(wait, 1),
+        }
+    
+    def cancel_order(self, customer_id):
+        """
+        Cancel a waiting order
+        Returns: tuple (status code, response dict)
+        """
+        customer = self.system.cancel(customer_id)
+        if customer is None:
+            return 404, {'error': f"order {customer_id} is not waiting"}
+        self._notify()
+        return 200, {'customer_id': customer_id, 'cancelled': True}
+    
+    def serve(self, counter_id):
+        """
+        Start or finish serving at a counter
+        Returns: tuple (status code, response dict)
+        """
+        for counter in self.system.counters:
+            if counter.counter_id == counter_id:
+                result = self.system.serve_at_counter(counter)
+                if result['action'] is not None:
+                    self._notify()
+                customer = result['customer']
+                return 200, {
+                    'action': result['action'],
+                    'customer_id': customer.customer_id if customer else None,
+                    'seated': result['seated'],
+                    'seat': result['seat'],
+                }
+        return 404, {'error': f"no counter {counter_id}"}
+    
+    # ---------- Routing ----------
+    
+    def route(self, method, path, body):
+        """
+        Dispatch a request to its handler
+        Parameters: method (str), path (str), body (bytes)
+        Returns: tuple (status code, response dict)
+        """
+        parts = path.strip('/').split('/')
+        if len(parts) == 2 and parts[0] == 'orders' and method in ('GET', 'DELETE'):
+            try:
+                customer_id = int(parts[1])
+            except ValueError:
+                return 400, {'error': "order id must be a number"}
+            if method == 'GET':
+                return self.order_status(customer_id)
+            return self.cancel_order(customer_id)
+        if method == 'GET':
+            if path == '/status':
+                return 200, self.status()
+            if path == '/recommendation':
+                payload = self.recommendation()
+                if payload is None:
+                    return 503, {'error': "no counters are open"}
+                return 200, payload
+            if path == '/seats':
+                return 200, self.seats()
+            if path in ('/metrics', '/metrics.json'):
+                payload = self.metrics(text=path == '/metrics')
+                if payload is None:
+                    return 404, {'error': "metrics are disabled"}
+                return 200, payload
+        elif method == 'POST':
+            if path == '/orders':
+                try:
+                    data = json.loads(body or b'{}')
+                except ValueError:
+                    return 400, {'error': "invalid JSON"}
+                if not isinstance(data, dict):
+                    return 400, {'error': "body must be a JSON object"}
+                return self.add_order(data)
+            if len(parts) == 3 and parts[0] == 'counters' and parts[2] == 'serve':
+                try:
+                    return self.serve(int(parts[1]))
+                except ValueError:
+                    return 400, {'error': "counter id must be a number"}
+        else:
+            return 405, {'error': f"method {method} not allowed"}
+        return 404, {'error': f"no route for {method} {path}"}
+    
+    # ---------- Publish / subscribe ----------
+    
+    def _notify(self):
+        """
+        Mark the status as changed so subscribers get an update
+        Safe to call from worker threads: the event is set on the loop
+        """
+        if self._changed is not None:
+            self._loop.call_soon_threadsafe(self._changed.set)
+    
+    async def _publish_loop(self):
+        """
+        Push one status message to every subscriber per change, at most
+        once per PUBLISH_INTERVAL, built once and shared by all of them
+        """
+        while True:
+            await self._changed.wait()
+            self._changed.clear()
+            if self.subscribers:
+                message = ("data: " + json.dumps(self.status()) + "\n\n").encode()
+                for queue in self.subscribers:
+                    if queue.full():
+                        queue.get_nowait()  # Slow reader: keep only the latest
+                    queue.put_nowait(message)
+            await asyncio.sleep(PUBLISH_INTERVAL)
+    
+    async def _seat_release_loop(self):
+        """Drive the automatic seat release and announce freed seats"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(SEAT_RELEASE_INTERVAL)
+            if await loop.run_in_executor(None, self.system.release_due_seats):
+                self._notify()
+    
+    async def _stream(self, reader, writer):
+        """
+        Keep a connection open and push status updates to it until the
+        client disconnects or the service stops
+        Parameters: reader (asyncio.StreamReader), writer (asyncio.StreamWriter)
+        """
+        queue = asyncio.Queue(maxsize=1)
+        queue.put_nowait(("data: " + json.dumps(self.status()) + "\n\n").encode())
+        self.subscribers.add(queue)
+        closed = asyncio.ensure_future(reader.read())  # Completes at EOF
+        self._streams[closed] = asyncio.current_task()
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\n"
+                         b"Content-Type: text/event-stream\r\n"
+                         b"Cache-Control: no-cache\r\n"
+                         b"Connection: keep-alive\r\n\r\n")
+            while True:
+                message = asyncio.ensure_future(queue.get())
+                await asyncio.wait({message, closed},
+                                   return_when=asyncio.FIRST_COMPLETED)
+                if closed.done():
+                    message.cancel()
+                    break
+                writer.write(message.result())
+                await writer.drain()
+        finally:
+            closed.cancel()
+            self._streams.pop(closed, None)
+            self.subscribers.discard(queue)
+    
+    # ---------- Connections ----------
+    
+    async def handle_connection(self, reader, writer):
+        """
+        Serve HTTP requests on one connection until it closes
+        Lines longer than the reader's limit (64 KiB by default) get a 400
+        for the request line or a 431 for a header
+        Parameters: reader (asyncio.StreamReader), writer (asyncio.StreamWriter)
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await self._respond(writer, 400, {'error': "request line too long"}, False)
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, 400, {'error': "bad request line"}, False)
+                    break
+                
+                headers = {}
+                try:
+                    while True:
+                        line = await reader.readline()
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        key, _, value = line.decode('latin-1').partition(':')
+                        headers[key.strip().lower()] = value.strip()
+                except (asyncio.LimitOverrunError, ValueError):
+                    await self._respond(writer, 431, {'error': "header line too long"}, False)
+                    break
+                
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, 400, {'error': "invalid Content-Length"}, False)
+                    break
+                if length > MAX_BODY_SIZE:
+                    await self._respond(writer, 413, {'error': "body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                
+                if method == 'GET' and path == '/subscribe':
+                    await self._stream(reader, writer)
+                    break
+                
+                keep_alive = (version == 'HTTP/1.1'
+                              and headers.get('connection', '').lower() != 'close')
+                if method in MUTATING_METHODS:
+                    code, payload = await loop.run_in_executor(
+                        None, self.route, method, path, body)
+                else:
+                    code, payload = self.route(method, path, body)
+                await self._respond(writer, code, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+    
+    async def _respond(self, writer, code, payload, keep_alive):
+        """
+        Write a JSON response, or a plain text one for str payloads
+        Parameters: writer, code (int), payload (dict or str), keep_alive (bool)
+        """
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload).encode(), "application/json"
+        head = (f"HTTP/1.1 {code} {STATUS_TEXT.get(code, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+    
+    async def start(self, host='127.0.0.1', port=8080):
+        """
+        Start listening (returns once the server is accepting connections)
+        Parameters: host (str), port (int) - use 0 for any free port
+        Returns: int - the port actually used
+        """
+        self._loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+        self._publisher = asyncio.ensure_future(self._publish_loop())
+        self._seat_releaser = asyncio.ensure_future(self._seat_release_loop())
+        self.server = await asyncio.start_server(self.handle_connection, host, port,
+                                                 backlog=4096)
+        return self.server.sockets[0].getsockname()[1]
+    
+    async def stop(self):
+        """Stop listening, end open event streams and cancel the publisher"""
+        streams = list(self._streams.items())
+        for closed, _ in streams:
+            closed.cancel()  # Wakes the stream loop, which then exits
+        if streams:
+            await asyncio.wait([task for _, task in streams])
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in (self._publisher, self._seat_releaser):
+            if task is not None:
+                task.cancel()
+
+
+async def serve_forever(host='127.0.0.1', port=8080):
+    """Run the service until interrupted"""
+    service = QueueService()
+    port = await service.start(host, port)
+    print(f"Queue service listening on http://{host}:{port}")
+    await service.server.serve_forever()
+
+
+if __name__ == "__main__":
+    import sys
+    
+    host = sys.argv[1] if len(sys.argv) > 1 else '127.0.0.1'
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8080
+    try:
+        asyncio.run(serve_forever(host, port))
+    except KeyboardInterrupt:
+        print("\nService stopped.")
@@ -0,0 +1,212 @@
+"""
+Simulation Module
+=================
+Discrete-event simulation of a canteen driven through QueueSystem
+
+Events (arrivals, service starts and service completions) are kept in a
+heap ordered by time. The simulator moves a VirtualClock from one event
+to the next, so a whole day of customers can be replayed in seconds while
+QueueSystem itself runs unchanged.
+
+Concepts Applied:
+- Discrete-event simulation
+- Priority queues (heapq)
+- Statistics (percentiles)
+"""
+
+import heapq
+import random
+import time
+from datetime import timedelta
+
+from clock import VirtualClock
+from menu import DEFAULT_MENU_ITEMS
+from queue_system import Counter, QueueSystem
+
+
+# Event types, in the order they are handled when they share a timestamp
+SERVICE_END = 0
+SERVICE_START = 1
+ARRIVAL = 2
+
+
+def poisson_arrivals(rate_per_minute, count, menu_items=DEFAULT_MENU_ITEMS,
+                     max_items=3, seed=None):
+    """
+    Generate random customer arrivals with exponential gaps
+    
+    Parameters: rate_per_minute (float) - average arrivals per minute,
+                count (int) - number of customers,
+                menu_items (list of str), max_items (int),
+                seed (int, optional) - for repeatable runs
+    Yields: tuple (offset_seconds, name, items) in time order
+    """
+    rng = random.Random(seed)
+    rate_per_second = rate_per_minute / 60.0
+    offset = 0.0
+    for i in range(count):
+        offset += rng.expovariate(rate_per_second)
+        items = [rng.choice(menu_items) for _ in range(rng.randint(1, max_items))]
+        yield offset, f"Customer {i + 1}", items
+
+
+def percentile(sorted_values, p):
+    """
+    Nearest-rank percentile of an already sorted list
+    Parameters: sorted_values (list of float), p (float) - 0 to 100
+    Returns: float, or 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(-(-p * len(sorted_values) // 100)))  # ceil(p * n / 100)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_waits(waits):
+    """
+    Summary statistics for a list of wait times
+    Parameter: waits (list of float) - seconds
+    Returns: dictionary with count, mean, p50, p90, p95, p99 and max
+    """
+    ordered = sorted(waits)
+    return {
+        'count': len(ordered),
+        'mean': sum(ordered) / len(ordered) if ordered else 0.0,
+        'p50': percentile(ordered, 50),
+        'p90': percentile(ordered, 90),
+        'p95': percentile(ordered, 95),
+        'p99': percentile(ordered, 99),
+        'max': ordered[-1] if ordered else 0.0,
+    }
+
+
+class Simulator:
+    """
+    Simulator Class
+    Replays arrivals through a QueueSystem on a virtual clock
+    
+    Demonstrates: Event-driven programming, heaps
+    """
+    
+    def __init__(self, system=None, service_time=None, start=None, rebalance=False):
+        """
+        Initialize the simulator
+        Parameters: system (QueueSystem, optional) - system to drive; a
+                    default one is created on a fresh VirtualClock,
+                    service_time (callable, optional) - (customer, counter)
+                    -> actual serving seconds; defaults to the estimate,
+                    start (datetime, optional) - start of the simulated day,
+                    rebalance (bool) - let idle counters steal customers and
+                    move customers off lines that fall behind
+        """
+        if system is None:
+            system = QueueSystem(clock=VirtualClock(start))
+        if not isinstance(system.clock, VirtualClock):
+            raise ValueError("Simulator needs a QueueSystem with a VirtualClock")
+        self.system = system
+        self.clock = system.clock
+        self.start = self.clock.now()
+        self.service_time = service_time or (
+            lambda customer, counter: customer.get_estimated_serving_time())
+        self.rebalance = rebalance
+        self.events = []
+        self._sequence = 0  # Keeps heap order stable for equal timestamps
+        self.waits = {counter.counter_id: [] for counter in system.counters}
+    
+    def _schedule(self, offset, kind, payload):
+        """
+        Add an event to the heap
+        Parameters: offset (float) - seconds since start,
+                    kind (int) - event type, payload - event data
+        """
+        heapq.heappush(self.events, (offset, kind, self._sequence, payload))
+        self._sequence += 1
+    
+    def _start_service(self, offset, counter):
+        """
+        Start serving the next customer at a counter and schedule the end
+        Parameters: offset (float) - current time, counter (Counter)
+        """
+        customer = counter.serve_next()
+        if customer is None:
+            return
+        wait = (counter.serving_start_time - customer.entry_time).total_seconds()
+        self.waits.setdefault(counter.counter_id, []).append(wait)
+        duration = self.service_time(customer, counter)
+        self._schedule(offset + duration, SERVICE_END, counter)
+    
+    def run(self, arrivals):
+        """
+        Run the simulation until every customer has been served
+        
+        Parameter: arrivals (iterable) - (offset_seconds, name, items)
+                   tuples in time order; consumed lazily
+        Returns: dictionary with per-counter and overall wait statistics,
+                 simulated seconds, wall-clock seconds and customer count
+        
+        Demonstrates: Event loop
+        """
+        wall_start = time.perf_counter()
+        arrivals = iter(arrivals)
+        customers = 0
+        
+        next_arrival = next(arrivals, None)
+        if next_arrival is not None:
+            self._schedule(next_arrival[0], ARRIVAL, next_arrival)
+        
+        offset = 0.0
+        while self.events:
+            offset, kind, _, payload = heapq.heappop(self.events)
+            self.clock.set(self.start + timedelta(seconds=offset))
+            
+            if kind == ARRIVAL:
+                _, name, items = payload
+                for _, counter in self.system.place_order(name, items):
+                    if counter.serving_customer is None:
+                        self._schedule(offset, SERVICE_START, counter)
+                customers += 1
+                # Only one pending arrival at a time keeps the heap small
+                next_arrival = next(arrivals, None)
+                if next_arrival is not None:
+                    self._schedule(next_arrival[0], ARRIVAL, next_arrival)
+            
+            elif kind == SERVICE_START:
+                if payload.serving_customer is None:
+                    self._start_service(offset, payload)
+            
+            else:  # SERVICE_END
+                payload.finish_serving()
+                if not payload.queue and self.rebalance:
+                    self.system.rebalancer.steal_for(payload)
+                if payload.queue:
+                    self._start_service(offset, payload)
+            
+            if self.rebalance:
+                for _, thief, _ in self.system.rebalancer.maybe_rebalance():
+                    if thief.serving_customer is None:
+                        self._schedule(offset, SERVICE_START, thief)
+        
+        all_waits = [w for waits in self.waits.values() for w in waits]
+        return {
+            'customers': customers,
+            'simulated_seconds': offset,
+            'wall_seconds': time.perf_counter() - wall_start,
+            'overall': summarize_waits(all_waits),
+            'counters': {counter_id: summarize_waits(waits)
+                         for counter_id, waits in self.waits.items()},
+        }
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+    
+    # Usage: python simulation.py [customers] [counters] [arrivals_per_minute]
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    counter_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rate = float(sys.argv[3]) if len(sys.argv) > 3 else 0.9 * counter_count
+    
+    counters = [Counter(i, f"Counter {i}") for i in range(1, counter_count + 1)]
+    simulator = Simulator(QueueSystem(counters, clock=VirtualClock()))
+    report = simulator.run(poisson_arrivals(rate, count, seed=1))
+    print(json.dumps(report, indent=2))
@@ -18,6 +18,42 @@ def test_customer_creation():
     print("✅ Customer creation test passed!")
 
 
+def test_complexity_catalogue():
+    """Test the compiled complexity catalogue against the item rules"""
+    print("\nTesting Complexity Catalogue...")
+    import threading
+    from menu import ComplexityCatalogue
+    
+    catalogue = ComplexityCatalogue(["Burger", "Combo Meal"], cache_size=2)
+    assert catalogue.score("Burger") == 1
+    assert catalogue.score("Combo Meal") == 3
+    assert catalogue.score("Cold Drink") == 1.5      # Free text, rule based
+    assert catalogue.score("Chef's Special Dessert") == 3  # First rule wins
+    assert catalogue.score("Fruit dessert") == 2
+    assert len(catalogue._cache) == 2                 # Cache stays bounded
+    
+    # Kiosks scoring free text at the same time share the cache safely
+    errors = []
+    
+    def score_many(offset):
+        try:
+            for i in range(2000):
+                assert catalogue.score(f"Item {(i + offset) % 5}") == 1
+        except Exception as error:
+            errors.append(error)
+    kiosks = [threading.Thread(target=score_many, args=(k,)) for k in range(4)]
+    for kiosk in kiosks:
+        kiosk.start()
+    for kiosk in kiosks:
+        kiosk.join()
+    assert not errors and len(catalogue._cache) == 2
+    
+    customer = Customer(1, "Student", ["Combo Meal", "Dessert", "Soft Drink"])
+    assert customer.complexity_score == 3 + 2 + 1.5
+    
+    print("✅ Complexity catalogue test passed!")
+
+
 def test_counter_operations():
     """Test counter queue operations"""
     print("\nTesting Counter Operations...")
@@ -40,6 +76,54 @@ def test_counter_operations():
     print("✅ Counter operations test passed!")
 
 
+def test_customer_store():
+    """Test the columnar customer store and store-backed counter"""
+    print("\nTesting Customer Store...")
+    from customer_store import CustomerStore, StoreCounter
+    
+    store = CustomerStore()
+    counter = StoreCounter(1, "Store Counter", store)
+    row1 = store.append(1, "Student 1", ["Burger", "Soft Drink"])
+    row2 = store.append(2, "Étudiant 2", ["Combo Meal"])
+    counter.add_customer(row1)
+    counter.add_customer(row2)
+    
+    assert counter.get_queue_length() == 2
+    assert store.get_items(row1) == ["Burger", "Soft Drink"]
+    assert store.get_name(row2) == "Étudiant 2"
+    assert counter.get_estimated_wait_time() == 30 + 25 + 30 + 30
+    
+    served = counter.serve_next()
+    assert served.customer_id == 1 and served.name == "Student 1"
+    assert served.get_estimated_serving_time() == 55
+    assert counter.get_queue_length() == 1
+    assert counter.queued_serving_time == 60
+    
+    # The rest of the Counter API takes rows; there is a single FIFO line
+    rows = [store.append(3 + i, f"Student {3 + i}", ["Burger"]) for i in range(3)]
+    for row in rows:
+        counter.add_customer(row, verbose=True)
+    burger = store.get_serving_time(rows[0])
+    counter.finish_serving()
+    assert counter.position_of(rows[1]) == 2
+    assert counter.personal_wait(rows[1]) == 60 + burger
+    assert counter.get_estimated_wait_time(priority='faculty') == 60 + 3 * burger
+    assert counter.remove_customer(rows[1]) and not counter.remove_customer(rows[1])
+    assert counter.position_of(rows[1]) is None
+    with counter.lock:
+        assert counter._take_tail_locked() == rows[2]
+        counter._insert_by_entry_locked(rows[2])
+    assert list(counter.queue) == [row2, rows[0], rows[2]]
+    assert counter.queued_serving_time == 60 + 2 * burger
+    try:
+        QueueSystem([counter])
+        assert False, "a StoreCounter cannot join a QueueSystem"
+    except TypeError:
+        pass
+    
+    print("✅ Customer store test passed!")
+
+
 def test_seat_manager():
     """Test seat management"""
     print("\nTesting Seat Manager...")
@@ -57,6 +141,136 @@ def test_seat_manager():
     print("✅ Seat manager test passed!")
 
 
+def test_group_seating():
+    """Test seat-level allocation of groups with the bitmap index"""
+    print("\nTesting Group Seating...")
+    from seat_index import SeatIndex, block_starts, longest_free_run
+    
+    assert longest_free_run(0b1110111) == 3
+    assert block_starts(0b0111100, 3) == 0b0001100
+    
+    # Tables: 0 (4 seats), 1 (6 seats), 2 (2 seats), 3 (4 seats, Patio)
+    seats = SeatManager(0, layout=[("Main", 4), ("Main", 6), ("Main", 2), ("Patio", 4)])
+    assert seats.total_seats == 16
+    
+    # Best fit puts a pair at the two-seat table, first fit at table 0
+    assert seats.assign_seats(2) == [(2, 0), (2, 1)]
+    assert seats.assign_seats(2, strategy='first') == [(0, 0), (0, 1)]
+    assert seats.assign_seats(3, zone="Patio") == [(3, 0), (3, 1), (3, 2)]
+    assert seats.seat_label((3, 0)) == "Patio Table 4 seat 1"
+    assert seats.seat_label((1, 2)) == "Table 2 seat 3"
+    
+    # A group of five only fits at the six-seat table
+    assert seats.assign_seats(5) == [(1, i) for i in range(5)]
+    assert seats.assign_seats(4) is None
+    assert seats.occupied_seats == 12
+    
+    # Released seats become a block again
+    seats.release_seats([(1, 1), (1, 2), (1, 3)])
+    assert seats.assign_seats(3) == [(1, 1), (1, 2), (1, 3)]
+    
+    # Without 'together' a group is split over the free blocks
+    seats.release_seats([(0, 0), (0, 1)])
+    assert seats.assign_seats(5) is None
+    assert seats.assign_seats(7, together=False) is None  # Only 6 vacant
+    split = seats.assign_seats(5, together=False)
+    assert split == [(0, 0), (0, 1), (0, 2), (0, 3), (1, 5)]
+    assert seats.get_vacant_seats() == 1
+    
+    # The index stays near-constant time with thousands of seats
+    hall = SeatIndex([("Main", 8)] * 1000)
+    for table in range(999):
+        hall.occupy(table, 0, 7)
+    assert hall.find(3) == (999, 0)
+    assert hall.find(1) == (0, 7)
+    
+    # Finishing a customer assigns a concrete seat
+    system = QueueSystem()
+    counter = system.counters[0]
+    system.add_order("Alice", ["Burger"])
+    system.serve_at_counter(counter)
+    result = system.serve_at_counter(counter)
+    # Best fit: the small last table (50 = 12 x 4 + 2 seats) fills first
+    assert result['seated'] and result['seat'] == "Table 13 seat 1"
+    assert system.seat_manager.index.taken[12] == 0b1
+    
+    print("✅ Group seating test passed!")
+
+
+def test_timing_wheel_seat_release():
+    """Test timer expiry across wheel levels and automatic seat release"""
+    print("\nTesting Timing Wheel Seat Release...")
+    import random
+    from clock import VirtualClock
+    from timing_wheel import TimingWheel
+    
+    # Every timer fires on its own tick, across all wheel levels
+    wheel = TimingWheel(tick=1.0, wheel_sizes=(8, 4, 4))
+    rng = random.Random(7)
+    delays = [rng.randint(0, 300) for _ in range(500)] + [0, 7, 8, 31, 32, 127, 128, 129]
+    timers = [wheel.schedule(delay, (i, delay)) for i, delay in enumerate(delays)]
+    cancelled = {timer.payload for timer in timers[::5]}
+    for timer in timers[::5]:
+        assert wheel.cancel(timer)
+    assert not wheel.cancel(timers[0])
+    assert len(wheel) == len(delays) - len(cancelled)
+    for now in range(0, 301, 3):
+        for _, delay in wheel.advance(now):
+            assert now - 3 < delay <= now
+    assert len(wheel) == 0 and not any(t.active for t in timers)
+    
+    # Seats are freed after the estimated dining time
+    clock = VirtualClock()
+    system = QueueSystem(clock=clock)
+    counter = system.counters[0]
+    customer, _ = system.add_order("Alice", ["Burger"])
+    system.serve_at_counter(counter)
+    system.serve_at_counter(counter)
+    assert system.seat_manager.occupied_seats == 1
+    assert len(system.seat_release) == 1
+    dining = 15 * 60 + 3 * 60 * customer.complexity_score
+    clock.advance(dining - 1)
+    assert system.release_due_seats() == 0
+    clock.advance(1)
+    assert system.release_due_seats() == 1
+    assert system.seat_manager.occupied_seats == 0
+    
+    # Early release cancels the pending timer
+    seats = system.seat_manager.assign_seats(2)
+    handle = system.seat_release.schedule(seats, 600)
+    assert system.seat_release.release_now(handle)
+    assert not system.seat_release.release_now(handle)
+    assert system.seat_manager.occupied_seats == 0
+    
+    # A seat freed by hand and given to someone else is not freed by the
+    # first customer's timer
+    seat_manager, scheduler = system.seat_manager, system.seat_release
+    first = seat_manager.assign_seats(1)
+    scheduler.schedule(first, 600)
+    seat_manager.free_seat(1)
+    assert len(scheduler) == 0
+    second = seat_manager.assign_seats(1)
+    assert second == first
+    scheduler.schedule(second, 1200)
+    clock.advance(900)
+    assert scheduler.tick() == 0
+    assert seat_manager.occupied_seats == 1 and len(scheduler) == 1
+    clock.advance(300)
+    assert scheduler.tick() == 1
+    assert seat_manager.occupied_seats == 0
+    
+    # Part of a group leaving early only shortens that group's release
+    group = seat_manager.assign_seats(3)
+    handle = scheduler.schedule(group, 600)
+    seat_manager.release_seats(group[:1])
+    assert handle.payload == group[1:] and len(scheduler) == 1
+    clock.advance(600)
+    assert scheduler.tick() == 2
+    assert seat_manager.occupied_seats == 0
+    
+    print("✅ Timing wheel seat release test passed!")
+
+
 def test_wait_time_calculation():
     """Test waiting time estimation"""
     print("\nTesting Wait Time Calculation...")
@@ -74,6 +288,28 @@ def test_wait_time_calculation():
     print(f"✅ Wait time calculation test passed! (Wait time: {wait_time:.1f} seconds)")
 
 
+def test_wait_time_aggregate():
+    """Test that the running queued serving time matches a full recount"""
+    print("\nTesting Wait Time Aggregate...")
+    counter = Counter(1, "Test Counter")
+    
+    for i, items in enumerate([["Burger"], ["Combo Meal", "Dessert"], ["Beverage"]]):
+        counter.add_customer(Customer(i + 1, f"Student {i + 1}", items))
+    
+    expected = sum(c.get_estimated_serving_time() for c in counter.queue)
+    assert counter.queued_serving_time == expected
+    
+    counter.serve_next()
+    expected = sum(c.get_estimated_serving_time() for c in counter.queue)
+    assert counter.queued_serving_time == expected
+    
+    counter.serve_next()
+    counter.serve_next()
+    assert counter.queued_serving_time == 0
+    
+    print("✅ Wait time aggregate test passed!")
+
+
 def test_queue_system():
     """Test main queue system"""
     print("\nTesting Queue System...")
@@ -86,6 +322,1192 @@ def test_queue_system():
     print("✅ Queue system initialization test passed!")
 
 
+def test_counter_index_matches_scan():
+    """Test that indexed best-counter selection matches the linear scan"""
+    print("\nTesting Counter Index...")
+    import random
+    import threading
+    from datetime import datetime, timedelta
+    
+    rng = random.Random(7)
+    counters = [Counter(i + 1, f"Counter {i + 1}") for i in range(40)]
+    system = QueueSystem(counters)
+    menu = system.menu_items
+    now = datetime.now()
+    
+    for step in range(400):
+        counter = rng.choice(system.counters)
+        action = rng.random()
+        if action < 0.6:
+            items = rng.sample(menu, rng.randint(1, 3))
+            counter.add_customer(Customer(step, f"Student {step}", items))
+        elif action < 0.8:
+            counter.finish_serving()
+            counter.serve_next()
+            if counter.serving_start_time:
+                counter.serving_start_time = now - timedelta(seconds=rng.randint(0, 90))
+                system.counter_index.update(counter)
+        else:
+            counter.finish_serving()
+        now += timedelta(seconds=rng.randint(0, 5))
+        assert system._find_best_counter(now) is system._scan_best_counter(now)
+    
+    # Counter changes do not wait for the index lock; queries pick them up
+    index = system.counter_index
+    with index._lock:
+        adder = threading.Thread(target=system.counters[5].add_customer,
+                                 args=(Customer(999, "Student", ["Burger"] * 3),))
+        adder.start()
+        adder.join(timeout=5)
+        assert not adder.is_alive()
+    assert system._find_best_counter(now) is system._scan_best_counter(now)
+    
+    # Ties go to the lower counter index
+    tied = QueueSystem([Counter(i + 1, f"Counter {i + 1}") for i in range(5)])
+    assert tied._find_best_counter() is tied.counters[0]
+    
+    print("✅ Counter index test passed!")
+
+
+def test_bulk_order_ingestion():
+    """Test non-interactive bulk ingestion from generators and files"""
+    print("\nTesting Bulk Order Ingestion...")
+    import os
+    import tempfile
+    from order_ingest import read_orders
+    
+    system = QueueSystem()
+    orders = ({'name': f"Kiosk {i}", 'items': ["Burger"]} for i in range(6))
+    result = system.ingest_orders(orders)
+    assert result['count'] == 6
+    assert [cid for cid, _ in result['assignments']] == [1, 2, 3, 4, 5, 6]
+    # Equal orders spread evenly over the three counters
+    assert sorted(c.get_queue_length() for c in system.counters) == [2, 2, 2]
+    assert result['orders_per_second'] > 0
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path = os.path.join(tmp, "orders.jsonl")
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            f.write('{"name": "App 1", "items": ["Pizza Slice"]}\n\n')
+            f.write('{"name": "App 2", "items": []}\n')
+        csv_path = os.path.join(tmp, "orders.csv")
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write("name,items\nKiosk A,Burger;Soft Drink\n")
+        
+        result = system.ingest_orders(read_orders(jsonl_path))
+        assert result['count'] == 2
+        result = system.ingest_orders(read_orders(csv_path))
+        customer_id, counter_id = result['assignments'][0]
+        customer = system.counters[counter_id - 1].queue[-1]
+        assert customer.customer_id == customer_id == 9
+        assert customer.items == ["Burger", "Soft Drink"]
+        
+        # Well-formed JSON that is not an order is rejected with its line
+        for bad_line in ('[1, 2]', '"x"', '{"name": "A", "items": "Burger"}',
+                         '{"name": "A", "items": [1]}'):
+            with open(jsonl_path, 'w', encoding='utf-8') as f:
+                f.write('{"name": "Ok", "items": []}\n' + bad_line + '\n')
+            try:
+                list(read_orders(jsonl_path))
+                assert False, f"{bad_line} should be rejected"
+            except ValueError as e:
+                assert ":2:" in str(e)
+    
+    # A bare string is not split into one item per character
+    waiting = sum(c.get_queue_length() for c in system.counters)
+    try:
+        system.ingest_orders([{'name': "Kiosk", 'items': "Burger"}])
+        assert False, "string items should be rejected"
+    except ValueError as e:
+        assert "order 1" in str(e)
+    assert sum(c.get_queue_length() for c in system.counters) == waiting
+    
+    print("✅ Bulk order ingestion test passed!")
+
+
+def test_simulation_with_virtual_clock():
+    """Test the discrete-event simulator on a virtual clock"""
+    print("\nTesting Simulation...")
+    from clock import VirtualClock
+    from simulation import Simulator, poisson_arrivals
+    
+    clock = VirtualClock()
+    start = clock.now()
+    system = QueueSystem(clock=clock)
+    arrivals = [(0.0, f"Student {i}", ["Burger"]) for i in range(4)]
+    report = Simulator(system).run(arrivals)
+    
+    # Three customers start at once, the fourth waits for one Burger (40 s)
+    assert report['customers'] == 4
+    assert report['overall']['max'] == 40
+    assert report['counters'][1]['count'] == 2
+    assert report['simulated_seconds'] == 80
+    assert (clock.now() - start).total_seconds() == 80
+    
+    report = Simulator().run(poisson_arrivals(2.0, 500, seed=3))
+    assert report['overall']['count'] == 500
+    
+    print("✅ Simulation test passed!")
+
+
+def test_benchmark_suite_smoke():
+    """Test that the hot path benchmark suite runs and reports every operation"""
+    print("\nTesting Benchmark Suite...")
+    from benchmarks.bench_hot_paths import BENCHMARKS, run_suite
+    
+    report = run_suite([(3, 200)])
+    operations = {result['operation'] for result in report['results']}
+    assert operations == {name for name, _, _ in BENCHMARKS}
+    for result in report['results']:
+        assert result['ops'] > 0 and result['peak_memory_bytes'] >= 0
+    
+    print("✅ Benchmark suite smoke test passed!")
+
+
+def test_buffered_logger():
+    """Test buffered logging, flush on close and size-based rotation"""
+    print("\nTesting Buffered Logger...")
+    import os
+    import tempfile
+    import threading
+    from logger import Logger
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        log_file = os.path.join(tmp, "logs", "system.log")
+        logger = Logger(log_file, buffered=True, flush_interval=60, max_buffer=10000)
+        for i in range(50):
+            logger.info(f"event {i}")
+        assert not os.path.exists(log_file)  # Still buffered in memory
+        logger.close()
+        with open(log_file, encoding='utf-8') as f:
+            lines = f.readlines()
+        assert len(lines) == 50 and lines[-1].endswith("[INFO] event 49\n")
+        
+        rotating = Logger(os.path.join(tmp, "rotating.log"), max_bytes=200, backup_count=2)
+        for i in range(20):
+            rotating.warning(f"entry {i}")
+        assert os.path.exists(rotating.log_file + ".1")
+        assert os.path.exists(rotating.log_file + ".2")
+        assert not os.path.exists(rotating.log_file + ".3")
+        assert os.path.getsize(rotating.log_file) <= 200
+        
+        # A buffered batch is split across rotations, and flushes racing
+        # each other still write the entries in order
+        batched = Logger(os.path.join(tmp, "batched.log"), buffered=True,
+                         flush_interval=60, max_buffer=10000,
+                         max_bytes=400, backup_count=50)
+        flushers = []
+        for i in range(200):
+            batched.info(f"entry {i:03d}")
+            if i % 10 == 9:
+                flushers.append(threading.Thread(target=batched.flush))
+                flushers[-1].start()
+        for thread in flushers:
+            thread.join()
+        batched.close()
+        paths = [batched.log_file + f".{i}" for i in range(50, 0, -1)]
+        paths = [path for path in paths if os.path.exists(path)] + [batched.log_file]
+        entries = []
+        for path in paths:
+            assert os.path.getsize(path) <= 400
+            with open(path, encoding='utf-8') as f:
+                entries.extend(line.rsplit(" ", 1)[1] for line in f)
+        assert entries == [f"{i:03d}\n" for i in range(200)]
+    
+    print("✅ Buffered logger test passed!")
+
+
+def test_concurrent_kiosks_and_stations():
+    """Test that concurrent adds and serves never lose or duplicate customers"""
+    print("\nTesting Concurrent Access...")
+    from benchmarks.bench_concurrency import run_stress
+    
+    report = run_stress(producers=4, consumers=3, orders_each=500, counter_count=5)
+    assert report['added'] == report['served'] == 2000
+    assert report['unique_ids']
+    assert report['duplicates'] == 0 and report['lost'] == 0
+    
+    print("✅ Concurrent access test passed!")
+
+
+def test_network_service():
+    """Test the asyncio HTTP service end to end on localhost"""
+    print("\nTesting Network Service...")
+    import asyncio
+    from service import QueueService
+    from benchmarks.bench_service import read_response, run_load
+    
+    service = QueueService()
+    code, body = service.route('POST', '/orders', b'{"name": "App", "items": ["Pasta"]}')
+    assert code == 201 and body['customer_id'] == 1 and body['counter_id'] == 1
+    assert service.route('POST', '/counters/1/serve', b'')[1]['action'] == 'started'
+    assert service.route('POST', '/counters/9/serve', b'')[0] == 404
+    assert service.route('POST', '/orders', b'[1]')[0] == 400
+    assert service.route('GET', '/seats', b'')[1]['vacant'] == 50
+    assert QueueService(QueueSystem([])).route('GET', '/recommendation', b'')[0] == 503
+    
+    report = asyncio.run(run_load(connections=20, requests_each=4, subscribers=2))
+    assert report['successful'] == 80
+    assert report['min_messages_per_subscriber'] >= 1
+    
+    # A malformed Content-Length or an oversized line gets an error
+    # response and the connection is closed
+    long_path = b"/" + b"x" * 70000
+    bad_requests = [
+        b"POST /orders HTTP/1.1\r\nContent-Length: abc\r\n\r\n",
+        b"POST /orders HTTP/1.1\r\nContent-Length: -5\r\n\r\n",
+        b"GET " + long_path + b" HTTP/1.1\r\n\r\n",
+        b"GET /status HTTP/1.1\r\nCookie: " + b"x" * 70000 + b"\r\n\r\n",
+    ]
+    
+    async def send_bad_requests():
+        service = QueueService()
+        port = await service.start('127.0.0.1', 0)
+        codes = []
+        for request in bad_requests:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(request)
+            codes.append((await read_response(reader))[0])
+            codes.append(await reader.read())  # Closed by the server
+            writer.close()
+        await service.stop()
+        return codes
+    
+    assert asyncio.run(send_bad_requests()) == [400, b"", 400, b"", 400, b"", 431, b""]
+    
+    print("✅ Network service test passed!")
+
+
+def test_live_dashboard_rendering():
+    """Test that the live dashboard repaints only changed lines"""
+    print("\nTesting Live Dashboard...")
+    import io
+    from display import DisplayManager, LiveRenderer
+    
+    stream = io.StringIO()
+    renderer = LiveRenderer(stream)
+    assert renderer.render(["a", "b", "c"]) == 3
+    assert renderer.render(["a", "B", "c"]) == 1
+    assert "\033[2;1HB" in stream.getvalue()
+    assert renderer.render(["a", "B", "c"]) == 0
+    
+    system = QueueSystem()
+    display = DisplayManager()
+    lines = display.build_dashboard_lines(system)
+    assert any("Best line: Counter 1" in line for line in lines)
+    
+    output = io.StringIO()
+    frames = display.show_live_dashboard(system, refresh_rate=50, duration=0.1,
+                                         stream=output)
+    assert frames >= 2
+    # After the first frame nothing changed, so no full-screen clears again
+    assert output.getvalue().count("\033[2J") == 1
+    
+    print("✅ Live dashboard test passed!")
+
+
+def test_journal_and_snapshot_recovery():
+    """Test that a crashed system is rebuilt from snapshot plus journal tail"""
+    print("\nTesting Journal Recovery...")
+    import tempfile
+    import types
+    from clock import VirtualClock
+    from persistence import Persistence, recover, take_snapshot, write_snapshot
+    
+    def state(system):
+        return ([([c.customer_id for c in counter.queue],
+                  counter.serving_customer.customer_id if counter.serving_customer else None,
+                  counter.queued_serving_time)
+                 for counter in system.counters],
+                system.seat_manager.occupied_seats, system.next_customer_id)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        system, persistence = Persistence.open(directory, checkpoint_interval=None)
+        for i in range(12):
+            system.add_order(f"Student {i}", ["Burger", "Dessert"])
+        for counter in system.counters:
+            system.serve_at_counter(counter)      # start
+            system.serve_at_counter(counter)      # finish + seat
+        persistence.checkpoint()
+        system.add_order("After checkpoint", ["Pasta"])
+        system.serve_at_counter(system.counters[1])
+        system.seat_manager.free_seat(1)
+        persistence.journal.sync()                # Crash: no clean close
+        
+        recovered, last_seq = recover(directory)
+        assert last_seq == persistence.journal.last_seq
+        assert state(recovered) == state(system)
+        started = recovered.counters[1].serving_customer
+        assert started.entry_time == system.counters[1].serving_customer.entry_time
+        persistence.close()
+        
+        # Reopening keeps numbering going and compacts the journal
+        reopened, persistence = Persistence.open(directory, checkpoint_interval=None)
+        assert state(reopened) == state(system)
+        customer, _ = reopened.add_order("Next", ["Burger"])
+        assert customer.customer_id == 14
+        persistence.close()
+    
+    # Replaying a finish does not teach the estimator a made-up duration
+    with tempfile.TemporaryDirectory() as directory:
+        clock = VirtualClock()
+        system, persistence = Persistence.open(directory, clock=clock,
+                                               checkpoint_interval=None)
+        persistence.checkpoint()
+        customer, counter = system.add_order("Student", ["Pizza Slice"])
+        counter.serve_next()
+        clock.advance(40)
+        counter.finish_serving()
+        persistence.journal.sync()
+        clock.advance(2 * 3600)                   # Restarted two hours later
+        recovered, _ = recover(directory, clock)
+        estimator = recovered.estimator
+        assert estimator.observations == 0 and estimator.base_time == 30
+        assert all(c.speed_factor == 1.0 and c.serving_customer is None
+                   for c in recovered.counters)
+        persistence.close()
+    
+    # A customer moved between counters while a checkpoint is being taken
+    # is recovered once, at the counter they moved to
+    with tempfile.TemporaryDirectory() as directory:
+        system, persistence = Persistence.open(directory, checkpoint_interval=None)
+        system.auto_rebalance = False
+        first, last = system.counters[0], system.counters[2]
+        for i in range(3):
+            first.add_customer(Customer(100 + i, f"Student {i}", ["Burger"]), verbose=False)
+        
+        def counters_moving_midway():
+            yield first                  # Snapshotted before the move
+            system.rebalancer._move(first, last, system.clock.now())
+            yield from system.counters[1:]
+        
+        moving = types.SimpleNamespace(counters=counters_moving_midway(),
+                                       seat_manager=system.seat_manager,
+                                       _id_lock=system._id_lock,
+                                       next_customer_id=system.next_customer_id)
+        write_snapshot(take_snapshot(moving, persistence.journal), directory)
+        persistence.journal.sync()
+        assert last.queue
+        
+        recovered, _ = recover(directory)
+        assert state(recovered)[0] == state(system)[0]
+        moved = last.queue[0].customer_id
+        assert recovered.find_customer(moved)[1] is recovered.counters[2]
+        persistence.close()
+    
+    print("✅ Journal recovery test passed!")
+
+
+def test_service_history():
+    """Test that finished services are recorded and read back"""
+    print("\nTesting Service History...")
+    import os
+    import tempfile
+    from clock import VirtualClock
+    from history import HistoryReader, ServiceHistory, OTHER_ITEM_CODE
+    
+    clock = VirtualClock()
+    system = QueueSystem(clock=clock)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.bin")
+        history = ServiceHistory(path, system.menu_items)
+        system.attach_history(history)
+        customer, counter = system.add_order("Alice", ["Burger", "Mystery Dish"])
+        clock.advance(20)
+        counter.serve_next()
+        clock.advance(45)
+        counter.finish_serving()
+        system.add_order("Bob", ["Pizza"])
+        history.close()
+        
+        reader = HistoryReader(path)
+        assert len(reader) == 1
+        record = next(reader.iter_records())
+        assert record[0] == customer.customer_id
+        assert record[1] == counter.counter_id
+        assert record[3] - record[2] == 20 and record[4] - record[3] == 45
+        assert record[6] == 2
+        assert record[7] == system.menu_items.index("Burger") + 1
+        assert record[8] == OTHER_ITEM_CODE and record[9] == 0
+        stats = reader.counter_stats(use_numpy=False)
+        assert stats == {counter.counter_id: {
+            'count': 1, 'mean_service': 45.0, 'mean_wait': 20.0,
+            'max_wait': 20.0, 'mean_complexity': customer.complexity_score}}
+        reader.close()
+        
+        # Reopening appends after the existing records
+        history = ServiceHistory(path)
+        assert history.count == 1
+        assert history.menu_items == system.menu_items
+        history.close()
+        
+        # The item code table is stored, so a different menu is refused
+        try:
+            ServiceHistory(path, ["Tea"] + system.menu_items)
+            assert False, "expected ValueError"
+        except ValueError as e:
+            assert "different menu" in str(e)
+        reader = HistoryReader(path)
+        assert reader.menu_items == system.menu_items
+        reader.close()
+        
+        # An empty file is rejected by the reader and initialised by the writer
+        empty = os.path.join(directory, "empty.bin")
+        open(empty, 'wb').close()
+        try:
+            HistoryReader(empty)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+        history = ServiceHistory(empty, ["Tea"])
+        assert history.count == 0 and history.item_codes == {"Tea": 1}
+        history.close()
+        reader = HistoryReader(empty)
+        assert len(reader) == 0 and reader.menu_items == ["Tea"]
+        reader.close()
+    
+    print("✅ Service history test passed!")
+
+
+def test_online_serving_time_estimator():
+    """Test that observed durations update counter and item estimates"""
+    print("\nTesting Serving Time Estimator...")
+    from clock import VirtualClock
+    
+    clock = VirtualClock()
+    system = QueueSystem(clock=clock)
+    estimator = system.estimator
+    slow, fast = system.counters[0], system.counters[1]
+    
+    def serve(counter, items, seconds):
+        counter.add_customer(Customer(0, "Student", items,
+                                      serving_estimate=estimator.predict(items)),
+                             verbose=False)
+        counter.serve_next()
+        clock.advance(seconds)
+        counter.finish_serving()
+    
+    # Before any observation the estimate is the fixed formula
+    customer, counter = system.add_order("Alice", ["Pizza Slice"])
+    assert customer.get_estimated_serving_time() == 40
+    assert counter.get_estimated_wait_time() == 40
+    counter.queue.clear()
+    counter.queued_serving_time = 0
+    
+    # The first counter's team takes twice as long as predicted
+    for _ in range(30):
+        serve(slow, ["Pizza Slice"], 2 * estimator.predict(["Pizza Slice"]))
+    assert 1.8 < slow.speed_factor < 2.1
+    assert fast.speed_factor == 1.0
+    assert estimator.observations == 30
+    
+    # Wait estimates and the index follow the learned speed
+    slow.add_customer(Customer(1, "Bob", ["Burger"]), verbose=False)
+    fast.add_customer(Customer(2, "Cara", ["Burger"]), verbose=False)
+    assert slow.get_estimated_wait_time() > 1.8 * fast.get_estimated_wait_time()
+    assert system._find_best_counter() is system._scan_best_counter()
+    assert system._find_best_counter() is not slow
+    fast.serve_next()
+    fast.finish_serving()  # Zero duration: ignored
+    
+    # A slow item gets a larger share of the prediction
+    before = estimator.item_time("Biryani")
+    for _ in range(20):
+        serve(fast, ["Biryani"], 1.5 * estimator.predict(["Biryani"]))
+    assert estimator.item_time("Biryani") > before
+    assert estimator.item_time("Soft Drink") == 15  # Never observed
+    
+    # Outliers (a forgotten finish button) are clipped
+    speed = fast.speed_factor
+    serve(fast, ["Soft Drink"], 3600)
+    assert fast.speed_factor <= speed + 0.1 * (4 - speed) + 1e-9
+    
+    print("✅ Serving time estimator test passed!")
+
+
+def test_campus_sharding():
+    """Test routing and scatter-gather across canteen worker processes"""
+    print("\nTesting Campus Sharding...")
+    import threading
+    from campus import CampusCoordinator
+    
+    with CampusCoordinator(["North", "South", "East"], processes=2,
+                           counters_per_canteen=2) as campus:
+        assert campus.owner == {"North": 0, "South": 1, "East": 0}
+        assert campus.add_order("North", "Alice", ["Combo Meal"]) == (1, 1)
+        assert campus.add_order("North", "Bob", ["Combo Meal"]) == (2, 2)
+        assert campus.add_order("South", "Cara", ["Burger"]) == (1, 1)
+        added = campus.add_orders({"South": [("Dan", ["Pizza Slice"])],
+                                   "East": [("Eve", ["Dessert"]), ("Fay", ["Burger"])]})
+        assert added == {"South": [(2, 2)], "East": [(1, 1), (2, 2)]}
+        
+        best = campus.shortest_wait()
+        assert best == {'canteen': "South", 'counter_id': 1,
+                        'counter': "Counter 1", 'wait_time': 40}
+        
+        assert campus.serve("North", 1)['action'] == 'started'
+        assert campus.serve("North", 1) == {'action': 'finished',
+                                            'customer_id': 1, 'seated': True,
+                                            'seat': "Table 13 seat 1"}
+        assert campus.total_free_seats() == 3 * 50 - 1
+        assert campus.serve_until_empty() == {"North": 1, "South": 2, "East": 2}
+        assert campus.total_free_seats() == 3 * 50 - 6
+        assert all(s['queue_length'] == 0
+                   for counters in campus.status().values() for s in counters)
+        
+        try:
+            campus.serve("North", 9)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+        try:
+            campus.add_order("Library", "Gus", ["Burger"])
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+        
+        # A request that cannot be sent to the second worker must not leave
+        # the first worker's reply behind for the next call
+        try:
+            campus._scatter({0: ('seats', None, ()),
+                             1: ('seats', None, (threading.Lock(),))})
+            assert False, "expected a pickling error"
+        except TypeError:
+            pass
+        assert campus.add_order("North", "Hal", ["Burger"]) == (3, 1)
+    
+    # An exception that cannot be pickled is still reported, and the
+    # worker keeps answering
+    import multiprocessing
+    import campus as campus_module
+    
+    class LockedError(Exception):
+        def __init__(self):
+            super().__init__("holds a lock")
+            self.lock = threading.Lock()
+    
+    def failing_handle(systems, op, canteen, args):
+        if op == 'fail':
+            raise LockedError()
+        return real_handle(systems, op, canteen, args)
+    
+    real_handle = campus_module._handle
+    campus_module._handle = failing_handle
+    try:
+        parent, child = multiprocessing.Pipe()
+        worker = threading.Thread(target=campus_module._worker_main,
+                                  args=(child, ["North"], 1))
+        worker.start()
+        parent.send(('fail', None, ()))
+        assert parent.recv() == ('error', ('LockedError', "holds a lock"))
+        parent.send(('seats', None, ()))
+        assert parent.recv() == ('ok', {"North": 50})
+        parent.send(None)
+        worker.join(timeout=5)
+        assert not worker.is_alive()
+    finally:
+        campus_module._handle = real_handle
+    try:
+        CampusCoordinator._unwrap(('error', ('LockedError', "holds a lock")))
+        assert False, "expected RuntimeError"
+    except RuntimeError as e:
+        assert str(e) == "LockedError: holds a lock"
+    
+    print("✅ Campus sharding test passed!")
+
+
+def test_status_snapshot_cache():
+    """Test that read views share one status computation per version"""
+    print("\nTesting Status Snapshot Cache...")
+    from clock import VirtualClock
+    
+    clock = VirtualClock()
+    system = QueueSystem(clock=clock)
+    system.add_order("Alice", ["Burger"])
+    system.add_order("Bob", ["Combo Meal"])
+    system.serve_at_counter(system.counters[0])
+    
+    # Repeated reads share one snapshot
+    snapshot = system.get_status_snapshot()
+    assert system.get_status_snapshot() is snapshot
+    assert system.get_all_queue_status() == snapshot.statuses
+    assert system.get_best_line_recommendation() is system._scan_best_counter()
+    assert system.get_status_snapshot() is snapshot
+    
+    # A change to any counter invalidates it
+    system.add_order("Cara", ["Pizza Slice"])
+    changed = system.get_status_snapshot()
+    assert changed is not snapshot and changed.version > snapshot.version
+    assert [s['queue_length'] for s in changed.statuses] == [0, 1, 1]
+    
+    # Time alone makes it stale after status_max_age (waits tick down)
+    clock.advance(system.status_max_age / 2)
+    assert system.get_status_snapshot() is changed
+    clock.advance(system.status_max_age)
+    aged = system.get_status_snapshot()
+    assert aged is not changed and aged.version == changed.version
+    assert aged.statuses[0]['wait_time'] < changed.statuses[0]['wait_time']
+    
+    # Adding a counter invalidates it too
+    system.add_counter(Counter(4, "Counter 4 - West"))
+    assert len(system.get_all_queue_status()) == 4
+    assert system.get_best_line_recommendation().counter_id == 4
+    
+    print("✅ Status snapshot cache test passed!")
+
+
+def test_group_assignment():
+    """Test makespan-minimising assignment of a group arriving together"""
+    print("\nTesting Group Assignment...")
+    from group_assign import exact_assign, greedy_assign, lpt_assign, makespan
+    
+    # Greedy in arrival order leaves the long order for last
+    loads, speeds, times = [0, 0], [1.0, 1.0], [30, 30, 60]
+    assert makespan(loads, speeds, times, greedy_assign(loads, speeds, times)) == 90
+    assert makespan(loads, speeds, times, lpt_assign(loads, speeds, times)) == 60
+    
+    # LPT is not always optimal; the exact solver is
+    times = [3, 3, 2, 2, 2]
+    assert makespan(loads, speeds, times, lpt_assign(loads, speeds, times)) == 7
+    assert makespan(loads, speeds, times, exact_assign(loads, speeds, times)) == 6
+    
+    # Existing queues and counter speeds count
+    assignment = exact_assign([100, 0], [1.0, 2.0], [40, 40])
+    assert makespan([100, 0], [1.0, 2.0], [40, 40], assignment) == 140
+    
+    # A class is spread over the counters of a real system
+    system = QueueSystem()
+    group = [(f"Student {i}", ["Combo Meal"] if i % 3 == 0 else ["Soft Drink"])
+             for i in range(9)]
+    result = system.add_group(group)
+    assert [c.name for c, _ in result['assignments']] == [name for name, _ in group]
+    assert len({c.customer_id for c, _ in result['assignments']}) == 9
+    assert sum(counter.get_queue_length() for counter in system.counters) == 9
+    assert result['makespan'] == max(c.get_estimated_wait_time() for c in system.counters)
+    greedy = QueueSystem().add_group(group, strategy='greedy')
+    assert result['makespan'] <= greedy['makespan']
+    
+    print("✅ Group assignment test passed!")
+
+
+def test_queue_rebalancing():
+    """Test work stealing and skew rebalancing between counters"""
+    print("\nTesting Queue Rebalancing...")
+    import sys
+    import tempfile
+    import threading
+    from clock import VirtualClock
+    from persistence import Persistence, recover
+    from simulation import Simulator, poisson_arrivals
+    
+    def fill(system, counter, count, first_id=1):
+        for i in range(first_id, first_id + count):
+            counter.add_customer(Customer(i, f"Student {i}", ["Burger"],
+                                          entry_time=system.clock.now()), verbose=False)
+            system.clock.advance(1)
+    
+    # An idle counter takes customers from the back of a long line,
+    # only while each of them starts at least min_gain seconds sooner
+    clock = VirtualClock()
+    system = QueueSystem(clock=clock)
+    first, second, third = system.counters
+    fill(system, first, 4)                                # 4 x 40 s
+    result = system.serve_at_counter(second)
+    assert result['action'] == 'started'
+    assert result['customer'].customer_id == 3            # Entry order kept
+    assert [c.customer_id for c in first.queue] == [1, 2]
+    assert [c.customer_id for c in second.queue] == [4]
+    assert first.queued_serving_time == 80
+    assert system.rebalancer.moves == 2
+    assert third.get_queue_length() == 0
+    
+    # Moved customers join the new line in entry time order
+    fill(system, third, 1, first_id=5)
+    with first.lock, third.lock:
+        third._insert_by_entry_locked(first._take_tail_locked())
+    assert [c.customer_id for c in third.queue] == [2, 5]
+    
+    # A skewed line is split once the difference passes the threshold
+    system = QueueSystem(clock=VirtualClock())
+    system.auto_rebalance = False
+    fill(system, system.counters[0], 6)                   # 240 s wait
+    moves = system.rebalancer.rebalance()
+    assert [(v.counter_id, moved) for v, _, moved in moves] == [(1, 3)]
+    assert system.counters[0].get_estimated_wait_time() == 120
+    assert moves[0][1].get_estimated_wait_time() == 120
+    assert system.rebalancer.rebalance() == []            # Now within threshold
+    assert system.get_best_line_recommendation().get_estimated_wait_time() == 0
+    
+    # Moves made from many serving threads at once are all counted
+    clock = VirtualClock()
+    system = QueueSystem([Counter(i, f"Counter {i}") for i in range(1, 9)],
+                         clock=clock)
+    rebalancer = system.rebalancer
+    moved_by_thread = [0] * 4
+    
+    def shuffle(index):
+        victim, thief = system.counters[2 * index], system.counters[2 * index + 1]
+        for round_number in range(200):
+            fill(system, victim, 4, first_id=1000 * index + 4 * round_number)
+            moved_by_thread[index] += rebalancer._move(victim, thief, clock.now())
+            with victim.lock, thief.lock:
+                while victim.queue:
+                    victim._take_tail_locked()
+                while thief.queue:
+                    thief._take_tail_locked()
+    
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=shuffle, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert sum(moved_by_thread) > 0
+    assert rebalancer.moves == sum(moved_by_thread)
+    
+    # Moves are journaled and replayed after a crash
+    with tempfile.TemporaryDirectory() as directory:
+        system, persistence = Persistence.open(directory, VirtualClock(),
+                                               checkpoint_interval=None)
+        system.auto_rebalance = False
+        fill(system, system.counters[0], 6)
+        system.rebalancer.rebalance()
+        persistence.journal.sync()
+        recovered, _ = recover(directory)
+        assert ([[c.customer_id for c in counter.queue] for counter in recovered.counters]
+                == [[c.customer_id for c in counter.queue] for counter in system.counters])
+        assert ([counter.queued_serving_time for counter in recovered.counters]
+                == [counter.queued_serving_time for counter in system.counters])
+        persistence.close()
+    
+    # The simulator can rebalance too; everyone is still served once
+    def slow_first_counter(customer, counter):
+        factor = 3 if counter.counter_id == 1 else 1
+        return factor * customer.get_estimated_serving_time()
+    simulator = Simulator(service_time=slow_first_counter, rebalance=True)
+    report = simulator.run(poisson_arrivals(3.5, 500, seed=3))
+    assert report['overall']['count'] == 500
+    assert simulator.system.rebalancer.moves > 0
+    
+    print("✅ Queue rebalancing test passed!")
+
+
+def test_metrics_instrumentation():
+    """Test operation latencies, realized waits, gauges and Prometheus output"""
+    print("\nTesting Metrics...")
+    import threading
+    from clock import VirtualClock
+    from metrics import Histogram
+    from service import QueueService
+    
+    # Log-linear buckets: 4 per power of two, below-range and overflow buckets
+    histogram = Histogram(1.0, 8.0)
+    assert histogram.bounds[:6] == [1.0, 1.25, 1.5, 1.75, 2.0, 2.5]
+    for value in (0.5, 1.0, 1.3, 2.2, 7.9, 1000.0):
+        histogram.observe(value)
+    assert histogram.counts[0] == 1 and histogram.counts[1] == 1
+    assert histogram.counts[2] == 1 and histogram.counts[5] == 1
+    assert histogram.counts[-1] == 1 and histogram.count == 6
+    assert histogram.quantile(0.5) == 1.5
+    assert histogram.quantile(1.0) == 1000.0
+    
+    # Kiosks observing at the same time lose no counts
+    shared = Histogram(1.0, 8.0)
+    kiosks = [threading.Thread(target=lambda: [shared.observe(2.0) for _ in range(5000)])
+              for _ in range(4)]
+    for kiosk in kiosks:
+        kiosk.start()
+    for kiosk in kiosks:
+        kiosk.join()
+    assert shared.count == 20000 and shared.snapshot()['sum'] == 40000.0
+    
+    clock = VirtualClock()
+    system = QueueSystem(clock=clock)
+    assert system.metrics is None                         # Opt-in
+    system.enable_metrics()
+    system.auto_rebalance = False
+    for i in range(4):
+        system.add_order(f"Student {i}", ["Burger"])      # 40 s each
+    first = system.counters[0]
+    system.serve_at_counter(first)                        # No wait
+    clock.advance(40)
+    system.serve_at_counter(first)                        # Finish + seat
+    system.serve_at_counter(first)                        # Student 3 waited 40 s
+    system.serve_at_counter(system.counters[1])
+    system.serve_at_counter(system.counters[1])
+    system.serve_at_counter(system.counters[1])           # Nothing left
+    system.get_best_line_recommendation()
+    
+    snapshot = system.metrics.snapshot()
+    operations = snapshot['operations']
+    assert operations['add']['count'] == 4
+    assert operations['serve']['count'] == 3
+    assert operations['finish']['count'] == 2
+    assert operations['seat_assign']['count'] == 2
+    assert operations['recommend']['count'] == 1
+    assert snapshot['events'] == {'serve_empty': 1, 'seat_unavailable': 0}
+    assert snapshot['waits']['count'] == 3 and snapshot['waits']['max'] == 40
+    assert snapshot['gauges']['queue_length'] == {1: 0, 2: 0, 3: 1}
+    assert snapshot['gauges']['seats_occupied'] == 2
+    assert snapshot['gauges']['seat_releases_pending'] == 2
+    
+    text = system.metrics.prometheus_text()
+    assert "# TYPE canteen_operation_seconds histogram" in text
+    assert 'canteen_operation_seconds_count{op="add"} 4' in text
+    assert 'canteen_wait_seconds_bucket{le="+Inf"} 3' in text
+    assert 'canteen_events_total{event="serve_empty"} 1' in text
+    assert 'canteen_queue_length{counter="3"} 1' in text
+    assert "canteen_seats_total 50" in text
+    
+    service = QueueService(system)
+    assert service.route('GET', '/metrics', b'') == (200, text)
+    assert service.route('GET', '/metrics.json', b'')[1]['events']['serve_empty'] == 1
+    
+    # Switched off: nothing is recorded any more, anywhere
+    metrics = system.metrics
+    system.disable_metrics()
+    assert system.metrics is None and system.seat_manager.metrics is None
+    assert all(counter.metrics is None for counter in system.counters)
+    system.add_order("Late", ["Pasta"])
+    system.serve_at_counter(system.counters[1])
+    assert metrics.snapshot()['operations']['add']['count'] == 4
+    assert service.route('GET', '/metrics', b'')[0] == 404
+    
+    print("✅ Metrics test passed!")
+
+
+def test_capability_routing():
+    """Test routing orders to specialised stations, and splitting them"""
+    print("\nTesting Capability Routing...")
+    import tempfile
+    from group_assign import plan_group
+    from persistence import Persistence, recover
+    from service import QueueService
+    
+    def stations():
+        return [Counter(1, "Pizza Station", serves=["Pizza & Pasta"]),
+                Counter(2, "Thali Station", serves=["Meals"]),
+                Counter(3, "Drinks", serves=["Beverages"]),
+                Counter(4, "Drinks & Desserts", serves=["Beverages", "Desserts"])]
+    
+    system = QueueSystem(stations())
+    system.auto_rebalance = False
+    assert system.counters[3].can_serve(["Soft Drink", "Ice Cream"])
+    assert not system.counters[2].can_serve(["Soft Drink", "Ice Cream"])
+    assert len(system.router.eligible_groups(["Soft Drink"])) == 2
+    assert len(system.router.eligible_groups(["Soft Drink", "Dessert"])) == 1
+    
+    assert system.add_order("A", ["Pizza Slice"])[1].counter_id == 1
+    assert system.add_order("B", ["Soft Drink"])[1].counter_id == 3
+    assert system.add_order("C", ["Beverage"])[1].counter_id == 4    # 3 is busier
+    assert system.add_order("D", ["Ice Cream"])[1].counter_id == 4   # Only one
+    try:
+        system.add_order("E", ["Pizza Slice", "Soft Drink"])
+        assert False, "no station serves pizza and drinks"
+    except ValueError:
+        pass
+    
+    # An order no station serves whole is split, one ticket per station
+    parts = system.place_order("F", ["Pizza Slice", "Soft Drink", "Pasta"])
+    assert [(c.items, counter.counter_id) for c, counter in parts] == [
+        (["Pizza Slice", "Pasta"], 1), (["Soft Drink"], 3)]
+    assert parts[0][0].name == parts[1][0].name == "F"
+    try:
+        system.place_order("G", ["Mystery Stew"])
+        assert False, "nobody serves unknown items"
+    except ValueError:
+        pass
+    code, body = QueueService(system).route(
+        'POST', '/orders', b'{"name": "App", "items": ["Biryani", "Dessert"]}')
+    assert code == 201 and [p['counter_id'] for p in body['parts']] == [2, 4]
+    
+    # Rebalancing and group planning respect what each station serves
+    assert system.rebalancer.steal_for(system.counters[1]) == 0
+    result = system.add_group([("H", ["Biryani"]), ("I", ["Pasta"]), ("J", ["Dessert"])])
+    assert [counter.counter_id for _, counter in result['assignments']] == [2, 1, 4]
+    # Equally loaded counters serving different orders are not interchangeable
+    assert plan_group([0, 0], [1, 1], [10, 5], 'exact', [[0, 1], [0]]) == ([1, 0], 10)
+    
+    # A general counter takes anything, including combined orders
+    system.add_counter(Counter(5, "Main Counter"))
+    assert system.add_order("K", ["Pizza Slice", "Soft Drink"])[1].counter_id == 5
+    assert len(system.place_order("L", ["Pasta", "Beverage"])) == 1
+    
+    # Stations keep their capabilities across a restart
+    with tempfile.TemporaryDirectory() as directory:
+        _, persistence = Persistence.open(directory, default_system=QueueSystem(stations()),
+                                          checkpoint_interval=None)
+        persistence.close()
+        recovered, _ = recover(directory)
+        assert [c.serves for c in recovered.counters] == [c.serves for c in stations()]
+        assert recovered.add_order("M", ["Special Thali"])[1].counter_id == 2
+        # Bulk ingestion splits orders across stations like the service does
+        result = recovered.ingest_orders([("N", ["Pizza Slice", "Soft Drink"]),
+                                          {'name': "O", 'items': ["Pasta"]}])
+        assert [counter_id for _, counter_id in result['assignments']] == [1, 3, 1]
+    
+    print("✅ Capability routing test passed!")
+
+
+def test_queue_forecast():
+    """Test the short-horizon queue forecast, with and without NumPy"""
+    print("\nTesting Queue Forecast...")
+    from forecast import forecast_queues, np
+    
+    # No arrivals: the backlog drains one step (15 s) at a time, down to 0
+    waits, lengths = forecast_queues([100], [50], [0] * 8, use_numpy=False)
+    assert waits == [[85, 70, 55, 40, 25, 10, 0, 0]]
+    assert lengths[0][:2] == [1.7, 1.4]
+    
+    # 4 orders/min on two 60 s counters: twice their capacity, +15 s per step
+    waits, _ = forecast_queues([0, 30], [60, 60], [4] * 4, use_numpy=False)
+    assert waits == [[15, 30, 45, 60], [45, 60, 75, 90]]
+    waits, _ = forecast_queues([0, 0], [60, 60], [2] * 2, shares=[1, 0], use_numpy=False)
+    assert waits == [[15, 30], [0, 0]]
+    try:
+        forecast_queues([0, 0], [60], [1])
+        assert False, "one service time per counter"
+    except ValueError:
+        pass
+    
+    # The vectorized version gives the same numbers
+    if np is not None:
+        case = ([0, 30, 500], [60, 45, 80], [1, 9, 3, 0, 12, 2])
+        fast = forecast_queues(*case, use_numpy=True)
+        slow = forecast_queues(*case, use_numpy=False)
+        for fast_rows, slow_rows in zip(fast, slow):
+            assert abs(fast_rows - np.array(slow_rows)).max() < 1e-9
+    
+    # Forecast for a live system, from its current waits
+    system = QueueSystem()
+    for i in range(6):
+        system.add_order(f"Student {i}", ["Burger"])     # 80 s per counter
+    for use_numpy in (True, False):
+        forecast = system.forecast([6] * 8, use_numpy=use_numpy)
+        assert forecast.counter_ids == [1, 2, 3]
+        assert list(forecast.waits[2][:3]) == [95, 110, 125]
+        assert forecast.peak() == (1, 120.0, 200.0)
+    
+    print("✅ Queue forecast test passed!")
+
+
+def test_customer_cancellation():
+    """Test cancelling, locating and per-customer waits of queued customers"""
+    print("\nTesting Customer Cancellation...")
+    import random
+    import tempfile
+    from customer_queue import CustomerQueue
+    from persistence import Persistence, recover
+    
+    # The linked list queue matches a plain list under random operations
+    rng = random.Random(7)
+    queue, expected = CustomerQueue(), []
+    for i in range(3000):
+        op = rng.random()
+        if op < 0.5 or not expected:
+            customer = Customer(i, "S", [], serving_estimate=float(rng.randint(20, 90)))
+            queue.append(customer)
+            expected.append(customer)
+        elif op < 0.7:
+            assert queue.popleft() is expected.pop(0)
+        elif op < 0.8:
+            assert queue.pop() is expected.pop()
+        elif op < 0.95:
+            customer = rng.choice(expected)
+            queue.remove(customer)
+            expected.remove(customer)
+        else:
+            customer = Customer(i, "S", [], serving_estimate=30.0)
+            index = rng.randint(0, len(expected))
+            queue.insert(index, customer)
+            expected.insert(index, customer)
+        assert len(queue) == len(expected)
+        if expected:
+            probe = rng.randrange(len(expected))
+            customer = expected[probe]
+            assert queue.position(customer) == probe
+            ahead = sum(c.serving_estimate for c in expected[:probe])
+            assert abs(queue.time_ahead(customer) - ahead) < 1e-6
+    assert list(queue) == expected
+    try:
+        queue.remove(Customer(-1, "Not queued", []))
+        assert False, "removing a customer who is not queued"
+    except ValueError:
+        pass
+    
+    # Cancel, locate and personal waits through the system
+    system = QueueSystem()
+    system.auto_rebalance = False
+    counter = system.counters[0]
+    ids = [system.add_order(f"Student {i}", ["Pizza Slice"])[0].customer_id
+           for i in range(9)]                       # 40 s each, 3 per counter
+    mine = [i for i in ids if system.find_customer(i)[1] is counter]
+    assert system.position_of(mine[2]) == (counter, 2)
+    assert system.personal_wait(mine[2]) == 80
+    assert counter.get_estimated_wait_time() == 120
+    
+    assert system.cancel(mine[1]).customer_id == mine[1]
+    assert system.cancel(mine[1]) is None           # Already gone
+    assert system.position_of(mine[2]) == (counter, 1)
+    assert system.personal_wait(mine[2]) == 40
+    assert counter.get_estimated_wait_time() == 80  # Aggregate kept in sync
+    
+    counter.serve_next()
+    assert system.position_of(mine[0]) is None      # Being served
+    assert system.position_of(mine[2]) == (counter, 0)
+    now = system.clock.now()
+    assert abs(system.personal_wait(mine[2], now)
+               - counter.get_estimated_wait_time(now) + 40) < 1e-9
+    assert system.position_of(999) is None and system.personal_wait(999) is None
+    
+    # The service answers and cancels orders by id
+    from service import QueueService
+    service = QueueService(system)
+    code, body = service.route('GET', f'/orders/{mine[2]}', b'')
+    assert code == 200 and body['position'] == 0 and body['counter_id'] == 1
+    assert body['position_in_lane'] == 0
+    standing = system.standing_of(mine[2], now)
+    assert standing[:4] == (system.find_customer(mine[2])[0], counter, 0, 0)
+    assert standing[4] == system.personal_wait(mine[2], now)
+    assert body['priority'] == 'walk_in'
+    assert service.route('DELETE', f'/orders/{mine[2]}', b'')[0] == 200
+    assert service.route('DELETE', f'/orders/{mine[2]}', b'')[0] == 404
+    assert service.route('GET', '/orders/x', b'')[0] == 400
+    assert counter.get_queue_length() == 0
+    
+    # Cancellations are journaled and replayed
+    with tempfile.TemporaryDirectory() as directory:
+        system, persistence = Persistence.open(directory, checkpoint_interval=None)
+        for i in range(6):
+            system.add_order(f"Student {i}", ["Burger"])
+        assert system.cancel(2) is not None
+        persistence.journal.sync()
+        recovered, _ = recover(directory)
+        assert recovered.find_customer(2) is None
+        assert ([[c.customer_id for c in counter.queue] for counter in recovered.counters]
+                == [[c.customer_id for c in counter.queue] for counter in system.counters])
+        assert recovered.personal_wait(5) == system.personal_wait(5)
+        persistence.close()
+    
+    print("✅ Customer cancellation test passed!")
+
+
+def test_priority_lanes():
+    """Test weighted priority lanes, aging and class-aware wait estimates"""
+    print("\nTesting Priority Lanes...")
+    from datetime import timedelta
+    from clock import VirtualClock
+    from persistence import customer_from_dict, customer_to_dict
+    from priority_lanes import PriorityPolicy
+    from service import QueueService
+    
+    clock = VirtualClock()
+    no_aging = PriorityPolicy(max_wait=None)
+    
+    def make_counter(policy, lanes):
+        counter = Counter(1, "Test Counter", clock=clock, policy=policy)
+        next_id = 0
+        for priority, count in lanes:
+            for _ in range(count):
+                next_id += 1
+                counter.add_customer(Customer(next_id, priority, ["Pizza Slice"],
+                                              entry_time=clock.now(), priority=priority),
+                                     verbose=False)
+        return counter
+    
+    def serve_all(counter):
+        served = []
+        while counter.serve_next() is not None:
+            served.append(counter.serving_customer.priority)
+            counter.finish_serving()
+        return served
+    
+    # Faculty get four turns for every walk-in, but walk-ins keep moving
+    counter = make_counter(no_aging, [('walk_in', 3), ('faculty', 9)])
+    order = serve_all(counter)
+    assert order[:7] == ['faculty', 'walk_in'] + ['faculty'] * 4 + ['walk_in']
+    assert counter.get_queue_length() == 0 and counter.queued_serving_time == 0
+    
+    # Aging: a walk-in waiting past max_wait is served before faculty
+    for policy, first in ((PriorityPolicy(weights={'faculty': 1000}, max_wait=60), 'walk_in'),
+                          (PriorityPolicy(weights={'faculty': 1000}, max_wait=None), 'faculty')):
+        counter = make_counter(policy, [('faculty', 3)])
+        counter.add_customer(Customer(99, "Early", ["Pizza Slice"], priority='walk_in',
+                                      entry_time=clock.now() - timedelta(seconds=120)),
+                             verbose=False)
+        assert serve_all(counter)[0] == first
+    
+    # Class-aware waits match the order the counter really serves in
+    lanes = [('faculty', 5), ('prepaid', 2), ('walk_in', 3)]
+    for priority in ('faculty', 'prepaid', 'walk_in'):
+        counter = make_counter(no_aging, lanes)
+        estimate = counter.get_estimated_wait_time(priority=priority)
+        counter.add_customer(Customer(0, "New", ["Pizza Slice"], priority=priority),
+                             verbose=False)
+        actual = 0
+        while counter.serve_next().customer_id != 0:
+            actual += 40
+            counter.finish_serving()
+        assert abs(estimate - actual) <= 40, (priority, estimate, actual)
+    # Positions count every lane, in the order the counter serves
+    counter = make_counter(no_aging, lanes)
+    waiting = list(counter.queue)
+    positions = {c.customer_id: counter.position_of(c) for c in waiting}
+    in_lane = {c.customer_id: counter.lane_position_of(c) for c in waiting}
+    served = []
+    while counter.serve_next() is not None:
+        served.append(counter.serving_customer.customer_id)
+        counter.finish_serving()
+    assert [positions[i] for i in served] == list(range(len(served)))
+    assert in_lane[served[-1]] < positions[served[-1]]
+    
+    counter = make_counter(no_aging, lanes)
+    assert counter.get_estimated_wait_time() == 400     # Behind everyone
+    assert counter.get_estimated_wait_time(priority='faculty') < 400
+    
+    # Everyone a walk-in: the same FIFO answers as before
+    counter = make_counter(PriorityPolicy(), [('walk_in', 4)])
+    assert counter.get_estimated_wait_time(priority='walk_in') == 160
+    last = counter.queue[-1]
+    assert counter.personal_wait(last) == 120
+    
+    # Aging caps the wait of a low class behind a long faculty line
+    lanes = [('faculty', 40), ('walk_in', 4)]
+    counter = make_counter(PriorityPolicy(max_wait=200), lanes)
+    assert counter.get_estimated_wait_time(priority='walk_in') == 200
+    assert make_counter(no_aging, lanes).get_estimated_wait_time(priority='walk_in') == 840
+    
+    # The class is validated, kept through persistence and in the service
+    system = QueueSystem()
+    system.auto_rebalance = False
+    customer, _ = system.add_order("Prof", ["Burger"], priority='faculty')
+    assert customer_from_dict(1, customer_to_dict(customer)).priority == 'faculty'
+    try:
+        system.place_order("Guest", ["Burger"], priority='vip')
+        assert False, "unknown priority class"
+    except ValueError:
+        pass
+    service = QueueService(system)
+    code, body = service.route('POST', '/orders',
+                               b'{"name": "App", "items": ["Pasta"], "priority": "prepaid"}')
+    assert code == 201 and body['priority'] == 'prepaid'
+    assert service.route('POST', '/orders', b'{"items": ["Pasta"], "priority": [1]}')[0] == 400
+    
+    system.set_priority_policy(PriorityPolicy(weights={'prepaid': 3}))
+    assert all(c.queue.policy is system.priority_policy for c in system.counters)
+    try:
+        PriorityPolicy(weights={'walk_in': 0})
+        assert False, "weights must be positive"
+    except ValueError:
+        pass
+    
+    print("✅ Priority lanes test passed!")
+
+
 def run_all_tests():
     """Run all validation tests"""
     print("=" * 60)
@@ -94,10 +1516,35 @@ def run_all_tests():
     
     try:
         test_customer_creation()
+        test_complexity_catalogue()
         test_counter_operations()
+        test_customer_store()
         test_seat_manager()
+        test_group_seating()
+        test_timing_wheel_seat_release()
         test_wait_time_calculation()
+        test_wait_time_aggregate()
         test_queue_system()
+        test_counter_index_matches_scan()
+        test_bulk_order_ingestion()
+        test_simulation_with_virtual_clock()
+        test_benchmark_suite_smoke()
+        test_buffered_logger()
+        test_concurrent_kiosks_and_stations()
+        test_network_service()
+        test_live_dashboard_rendering()
+        test_journal_and_snapshot_recovery()
+        test_service_history()
+        test_online_serving_time_estimator()
+        test_campus_sharding()
+        test_status_snapshot_cache()
+        test_group_assignment()
+        test_queue_rebalancing()
+        test_metrics_instrumentation()
+        test_capability_routing()
+        test_queue_forecast()
+        test_customer_cancellation()
+        test_priority_lanes()
         
         print("\n" + "=" * 60)
         print(" ✅ ALL TESTS PASSED!")
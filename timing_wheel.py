@@ -0,0 +1,183 @@
+"""
+Timing Wheel Module
+===================
+Hierarchical timing wheel for large numbers of pending timers
+
+Time is cut into ticks. The lowest wheel has one slot per tick; each
+higher wheel has one slot per full turn of the wheel below it. A timer
+goes into the lowest wheel whose range covers its delay, and every time
+a wheel completes a turn, the next slot of the wheel above is emptied
+("cascaded") into the wheels below it.
+
+- schedule: O(1) - pick the wheel and slot, insert into a dict
+- cancel:   O(1) - delete from the slot's dict
+- tick:     O(1) amortised - only the timers that expire or cascade
+            are touched, never all pending timers
+
+With the default wheels (256, 64, 64, 64) and one-second ticks, timers
+up to about 2 years ahead are placed directly; longer ones wait in the
+last slot of the top wheel and are re-placed when it cascades.
+
+Concepts Applied:
+- Hashed and hierarchical timing wheels
+- Dictionaries for constant-time insert/delete
+- Amortised analysis
+"""
+
+import itertools
+
+
+DEFAULT_WHEEL_SIZES = (256, 64, 64, 64)
+
+
+class Timer:
+    """
+    Timer Class
+    Handle of one scheduled timer, returned by TimingWheel.schedule
+    
+    Demonstrates: __slots__, handles for O(1) cancellation
+    """
+    
+    __slots__ = ('timer_id', 'expires', 'payload', 'bucket')
+    
+    def __init__(self, timer_id, expires, payload):
+        """
+        Parameters: timer_id (int), expires (int) - tick it is due at,
+                    payload (any) - value returned when it expires
+        """
+        self.timer_id = timer_id
+        self.expires = expires
+        self.payload = payload
+        self.bucket = None  # Slot dict currently holding the timer
+    
+    @property
+    def active(self):
+        """True while the timer is pending"""
+        return self.bucket is not None
+
+
+class TimingWheel:
+    """
+    Timing Wheel Class
+    Schedules payloads to expire after a delay, driven by advance()
+    
+    Not thread-safe on its own; callers serialize access.
+    
+    Demonstrates: Hierarchical bucketing, lazy cascading
+    """
+    
+    def __init__(self, tick=1.0, start=0.0, wheel_sizes=DEFAULT_WHEEL_SIZES):
+        """
+        Initialize an empty wheel
+        Parameters: tick (float) - seconds per tick,
+                    start (float) - time (seconds) of tick 0,
+                    wheel_sizes (tuple of int) - slots per wheel, lowest first
+        """
+        self.tick = tick
+        self.start = start
+        self.sizes = tuple(wheel_sizes)
+        # Ticks covered by one slot of each wheel: 1, 256, 256*64, ...
+        self.spans = [1]
+        for size in self.sizes[:-1]:
+            self.spans.append(self.spans[-1] * size)
+        self.wheels = [[{} for _ in range(size)] for size in self.sizes]
+        self.current = 0  # Next tick to be processed
+        self.pending = 0
+        self._ids = itertools.count()
+    
+    def __len__(self):
+        """Number of pending timers"""
+        return self.pending
+    
+    def _tick_of(self, when):
+        """Tick number of a time in seconds"""
+        return int((when - self.start) // self.tick)
+    
+    def _place(self, timer):
+        """Put a timer into the slot matching its remaining delay"""
+        delta = max(timer.expires - self.current, 0)
+        expires = self.current + delta
+        for level, size in enumerate(self.sizes):
+            span = self.spans[level]
+            if delta < span * size:
+                break
+        else:
+            # Beyond the top wheel: park in its furthest slot for now
+            level = len(self.sizes) - 1
+            span = self.spans[level]
+            expires = self.current + span * (self.sizes[level] - 1)
+        bucket = self.wheels[level][(expires // span) % self.sizes[level]]
+        bucket[timer.timer_id] = timer
+        timer.bucket = bucket
+    
+    def schedule(self, delay, payload):
+        """
+        Schedule a payload to expire after a delay
+        Parameters: delay (float) - seconds from the wheel's current tick,
+                    payload (any)
+        Returns: Timer - handle for cancel()
+        """
+        timer = Timer(next(self._ids), self.current + max(int(delay // self.tick), 0),
+                      payload)
+        self._place(timer)
+        self.pending += 1
+        return timer
+    
+    def schedule_at(self, when, payload):
+        """
+        Schedule a payload to expire at a time
+        Parameters: when (float) - seconds, on the same scale as start
+        Returns: Timer
+        """
+        return self.schedule((self._tick_of(when) - self.current) * self.tick, payload)
+    
+    def cancel(self, timer):
+        """
+        Cancel a pending timer
+        Parameter: timer (Timer)
+        Returns: bool - False if it had already expired or been cancelled
+        """
+        if timer.bucket is None:
+            return False
+        del timer.bucket[timer.timer_id]
+        timer.bucket = None
+        self.pending -= 1
+        return True
+    
+    def _cascade(self, level):
+        """Re-place the timers of the current slot of a wheel"""
+        size = self.sizes[level]
+        index = (self.current // self.spans[level]) % size
+        bucket = self.wheels[level][index]
+        if bucket:
+            self.wheels[level][index] = {}
+            for timer in bucket.values():
+                self._place(timer)
+    
+    def advance(self, now):
+        """
+        Process every tick up to a time
+        Parameter: now (float) - current time in seconds
+        Returns: list - payloads of the timers that expired, in order
+        """
+        target = self._tick_of(now)
+        expired = []
+        while self.current <= target:
+            if not self.pending:
+                self.current = target + 1  # Nothing to expire: jump ahead
+                break
+            # When a wheel completes a turn, pull down the next slot above
+            for level in range(1, len(self.sizes)):
+                if self.current % self.spans[level]:
+                    break
+                self._cascade(level)
+            slot = self.current % self.sizes[0]
+            bucket = self.wheels[0][slot]
+            if bucket:
+                self.wheels[0][slot] = {}
+                for timer in bucket.values():
+                    timer.bucket = None
+                    expired.append(timer.payload)
+                self.pending -= len(bucket)
+            self.current += 1
+        return expired
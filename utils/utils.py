@@ -17,13 +17,16 @@ def clear_screen():
     """
     Clear the terminal screen
     Works on both Windows and Unix-based systems
+    On Linux/Mac an ANSI escape sequence is written instead of starting
+    a 'clear' subprocess every time
     
     Demonstrates: Conditional statements, OS interaction
     """
     if sys.platform == 'win32':
         os.system('cls')  # Windows
     else:
-        os.system('clear')  # Linux/Mac
+        sys.stdout.write("\033[2J\033[H")  # Linux/Mac: clear and move home
+        sys.stdout.flush()
 
 
 def print_header(title):